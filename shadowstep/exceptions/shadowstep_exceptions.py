@@ -1051,6 +1051,30 @@ class ShadowstepInvalidScrollDirectionError(ShadowstepImageException):
         return f"Invalid scroll direction: '{direction}'. Valid directions: {', '.join(valid_directions)}"
 
 
+class ShadowstepFrameSourceError(ShadowstepImageException):
+    """Raised when a frame source cannot provide a frame."""
+
+    default_message = "ShadowstepFrameSourceError occurred"
+
+    def _construct_message_from_context(self, **context_kwargs: Any) -> str:
+        """Construct message from context kwargs."""
+        source = context_kwargs.get("source", "unknown")
+        timeout = context_kwargs.get("timeout", "unknown")
+        return f"No frame from {source} within {timeout}s"
+
+
+class ShadowstepUnsupportedMatcherError(ShadowstepImageException):
+    """Raised when a feature detector is unknown or missing from the OpenCV build."""
+
+    default_message = "ShadowstepUnsupportedMatcherError occurred"
+
+    def _construct_message_from_context(self, **context_kwargs: Any) -> str:
+        """Construct message from context kwargs."""
+        detector = context_kwargs.get("detector", "unknown")
+        available = context_kwargs.get("available", [])
+        return f"Feature detector '{detector}' is not available. Available: {', '.join(available)}"
+
+
 class ShadowstepImageNotImplementedError(ShadowstepImageException):
     """Raised when functionality is not yet implemented."""
 
@@ -0,0 +1,102 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+"""Change detection between consecutive frames of a visual wait.
+
+A wait loop polls the same screen many times, and most polls see exactly the
+picture the previous one matched. ChangeGate compares each frame with the
+last changed one on a grid of cell averages (a downsampled difference, a few
+milliseconds for a full HD screen) and reports the pixel rect that changed, so
+the caller can skip matching an unchanged frame and match only the changed part
+of a changed one. Averaging over a cell hides JPEG and scaling noise.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from typing import Any
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Side, in pixels, of the square cells compared between frames
+CHANGE_CELL_SIZE = 16
+# Mean gray level difference of a cell above which it counts as changed
+CHANGE_TOLERANCE = 4.0
+
+
+class ChangeGate:
+    """Remembers the previous frame of a wait loop and the result matched on it."""
+
+    def __init__(self, cell_size: int = CHANGE_CELL_SIZE, tolerance: float = CHANGE_TOLERANCE) -> None:
+        """Initialize the ChangeGate.
+
+        Args:
+            cell_size: Side of the compared cells in pixels.
+            tolerance: Mean gray level difference of a changed cell.
+
+        """
+        self.cell_size = cell_size
+        self.tolerance = tolerance
+        # Result matched on the last frame that was matched
+        self.coords: tuple[int, int, int, int] | None = None
+        self.skipped = 0
+        self.matched = 0
+        self._image: np.ndarray[Any, Any] | None = None
+        self._cells: np.ndarray[Any, Any] | None = None
+
+    def changed_rect(self, image: np.ndarray[Any, Any]) -> tuple[int, int, int, int] | None:
+        """Compare a grayscale frame with the last changed one.
+
+        A changed frame becomes the reference the next frames are compared with.
+
+        Args:
+            image: Grayscale frame.
+
+        Returns:
+            tuple[int, int, int, int] | None: (x1, y1, x2, y2) bounding the changed
+                cells, the whole frame for the first frame or a new size, or None
+                if nothing changed.
+
+        """
+        if image is self._image:
+            return None
+        height, width = image.shape[:2]
+        size = (-(-width // self.cell_size), -(-height // self.cell_size))
+        cells = cv2.resize(image, size, interpolation=cv2.INTER_AREA).astype(np.float32)
+        previous = self._cells
+        if previous is None or previous.shape != cells.shape:
+            self._image, self._cells = image, cells
+            return 0, 0, width, height
+
+        rows, cols = np.nonzero(cv2.absdiff(cells, previous) > self.tolerance)
+        if rows.size == 0:
+            return None
+        # Unchanged frames keep the reference, so slow changes add up until they count
+        self._image, self._cells = image, cells
+        # Cells cover width / columns pixels each when the size is not a multiple of the cell
+        cell_width, cell_height = width / size[0], height / size[1]
+        return (
+            int(int(cols.min()) * cell_width),
+            int(int(rows.min()) * cell_height),
+            min(width, math.ceil((int(cols.max()) + 1) * cell_width)),
+            min(height, math.ceil((int(rows.max()) + 1) * cell_height)),
+        )
+
+    def record(self, coords: tuple[int, int, int, int] | None, *, matched: bool) -> None:
+        """Remember the result for the last frame and count whether it was matched or reused."""
+        self.coords = coords
+        if matched:
+            self.matched += 1
+        else:
+            self.skipped += 1
+
+    def reset(self) -> None:
+        """Forget the previous frame and result."""
+        self.coords = None
+        self._image = None
+        self._cells = None
@@ -0,0 +1,199 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+"""Perceptual screen fingerprints and a nearest-neighbour index of known screens.
+
+A fingerprint is a 256-bit difference hash of the screen: the screen is shrunk
+to 17x16 pixels and every bit tells whether a pixel is brighter than its right
+neighbour. Screens that look alike differ in a few bits, so the Hamming distance
+between fingerprints tells whether two screenshots show the same page or the
+same scroll position without parsing the hierarchy. The status bar (clock,
+battery, notifications) and any configured areas are masked out first.
+
+Encoded screenshots are decoded straight to 1/8 of their size, which is enough
+for a 17x16 hash. FingerprintIndex keeps fingerprints as rows of 64-bit words
+and compares a query with all of them at once; a lookup over thousands of
+stored screens takes well under a millisecond.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Generic, TypeVar, Union, cast
+
+import cv2
+import numpy as np
+
+from shadowstep.image.frame_cache import frame_cache
+from shadowstep.image.reduced_decode import decode_reduced_gray
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+logger = logging.getLogger(__name__)
+
+# Masked screen area: pixel rect (x1, y1, x2, y2) or the same in screen fractions
+FingerprintMask = Union[tuple[int, int, int, int], tuple[float, float, float, float]]
+
+# Android status bar, as a fraction of the screen height
+STATUS_BAR_MASK: FingerprintMask = (0.0, 0.0, 1.0, 0.04)
+# Side of the hash grid; fingerprints have HASH_SIZE**2 bits
+HASH_SIZE = 16
+# 64-bit words per fingerprint
+FINGERPRINT_WORDS = HASH_SIZE * HASH_SIZE // 64
+# Encoded screenshots are decoded at 1/FINGERPRINT_REDUCTION of their size
+FINGERPRINT_REDUCTION = 8
+# Differing bits up to which two fingerprints are taken for the same screen
+DEFAULT_MAX_DISTANCE = 24
+# Rows allocated when an index first grows
+INITIAL_CAPACITY = 256
+
+_default_masks: tuple[FingerprintMask, ...] = (STATUS_BAR_MASK,)
+
+T = TypeVar("T")
+
+
+def set_fingerprint_masks(masks: Sequence[FingerprintMask]) -> None:
+    """Configure the screen areas every fingerprint ignores by default.
+
+    Args:
+        masks: Pixel or fractional rects. Pass (STATUS_BAR_MASK, ...) to keep
+            ignoring the status bar.
+
+    """
+    global _default_masks  # noqa: PLW0603
+    _default_masks = tuple(masks)
+    logger.info("Fingerprint masks set to %s", _default_masks)
+
+
+def get_fingerprint_masks() -> tuple[FingerprintMask, ...]:
+    """Return the screen areas fingerprints ignore by default."""
+    return _default_masks
+
+
+def fingerprint(
+    screen: bytes | np.ndarray[Any, Any],
+    masks: Sequence[FingerprintMask] | None = None,
+) -> np.ndarray[Any, Any]:
+    """Compute the perceptual fingerprint of a screen.
+
+    Args:
+        screen: Encoded screenshot, or a grayscale or BGR image.
+        masks: Areas to ignore; None uses the configured defaults. Pixel rects
+            refer to the full-size screen.
+
+    Returns:
+        np.ndarray: FINGERPRINT_WORDS uint64 words.
+
+    """
+    if isinstance(screen, bytes):
+        frame = frame_cache.find(screen)
+        image = frame.reduced_gray(FINGERPRINT_REDUCTION) if frame else decode_reduced_gray(screen, FINGERPRINT_REDUCTION)
+        scale = 1 / FINGERPRINT_REDUCTION
+    else:
+        image = screen if screen.ndim == 2 else cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)  # noqa: PLR2004
+        scale = 1.0
+    image = blank_masked(image, masks, scale)
+    small = cv2.resize(image, (HASH_SIZE + 1, HASH_SIZE), interpolation=cv2.INTER_AREA).astype(np.int16)
+    bits = small[:, 1:] > small[:, :-1]
+    return np.packbits(bits.ravel()).view(np.uint64).copy()
+
+
+def distance(first: np.ndarray[Any, Any], second: np.ndarray[Any, Any]) -> int:
+    """Return the number of bits two fingerprints differ in."""
+    return int(np.bitwise_count(np.bitwise_xor(first, second)).sum())
+
+
+def blank_masked(
+    image: np.ndarray[Any, Any],
+    masks: Sequence[FingerprintMask] | None = None,
+    scale: float = 1.0,
+) -> np.ndarray[Any, Any]:
+    """Return a copy of a grayscale image with the masked areas set to black.
+
+    Args:
+        image: Grayscale image.
+        masks: Areas to blank; None uses the configured defaults.
+        scale: Image size relative to the device screen, for pixel rects.
+
+    Returns:
+        np.ndarray: Blanked copy.
+
+    """
+    image = np.array(image, dtype=np.uint8)
+    height, width = image.shape[:2]
+    for mask in _default_masks if masks is None else masks:
+        x1, y1, x2, y2 = _mask_rect(mask, width, height, scale)
+        image[y1:y2, x1:x2] = 0
+    return image
+
+
+def _mask_rect(mask: FingerprintMask, width: int, height: int, scale: float) -> tuple[int, int, int, int]:
+    """Turn a mask into a pixel rect of an image scale times the screen size."""
+    if any(isinstance(value, float) for value in mask):
+        x1, y1, x2, y2 = mask
+        return round(x1 * width), round(y1 * height), round(x2 * width), round(y2 * height)
+    x1, y1, x2, y2 = (round(value * scale) for value in cast("tuple[int, int, int, int]", mask))
+    return x1, y1, x2, y2
+
+
+class FingerprintIndex(Generic[T]):
+    """Known screens searchable by fingerprint distance."""
+
+    def __init__(self, max_distance: int = DEFAULT_MAX_DISTANCE) -> None:
+        """Initialize the FingerprintIndex.
+
+        Args:
+            max_distance: Differing bits up to which nearest() reports a match.
+
+        """
+        self.max_distance = max_distance
+        self._rows = np.zeros((0, FINGERPRINT_WORDS), dtype=np.uint64)
+        self._labels: list[T] = []
+        self._lock = threading.Lock()
+
+    def add(self, value: np.ndarray[Any, Any], label: T) -> None:
+        """Store the fingerprint of a screen under a label, e.g. a page name."""
+        with self._lock:
+            count = len(self._labels)
+            if count == len(self._rows):
+                grown = np.zeros((max(INITIAL_CAPACITY, count * 2), FINGERPRINT_WORDS), dtype=np.uint64)
+                grown[:count] = self._rows[:count]
+                self._rows = grown
+            self._rows[count] = value
+            self._labels.append(label)
+
+    def nearest(self, value: np.ndarray[Any, Any], max_distance: int | None = None) -> tuple[T, int] | None:
+        """Find the stored screen closest to a fingerprint.
+
+        Args:
+            value: Fingerprint to look up.
+            max_distance: Overrides the index max_distance.
+
+        Returns:
+            tuple[T, int] | None: Label and distance of the closest screen, or
+                None if none is within max_distance.
+
+        """
+        limit = self.max_distance if max_distance is None else max_distance
+        with self._lock:
+            count = len(self._labels)
+            if not count:
+                return None
+            distances = np.bitwise_count(np.bitwise_xor(self._rows[:count], value)).sum(axis=1, dtype=np.int32)
+            best = int(distances.argmin())
+            if distances[best] > limit:
+                return None
+            return self._labels[best], int(distances[best])
+
+    def clear(self) -> None:
+        """Forget all stored screens."""
+        with self._lock:
+            self._rows = np.zeros((0, FINGERPRINT_WORDS), dtype=np.uint64)
+            self._labels.clear()
+
+    def __len__(self) -> int:
+        """Return the number of stored screens."""
+        return len(self._labels)
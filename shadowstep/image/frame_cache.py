@@ -0,0 +1,206 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+"""Short-lived cache of the last captured screenshot.
+
+Public screenshot calls always capture a new frame, since taps, key presses
+and W3C actions sent straight to the driver do not bump the screen
+generation. The frame they capture is kept, so everything that reads the same
+bytes (to_ndarray, fingerprints, the match result cache) shares its decoded
+arrays. Only the steps of one operation (ensure_visible followed by
+draw_rectangle or is_contains) and polling loops that ask for frames newer
+than their own start reuse a frame, while it is younger than the TTL, comes
+from the same driver, and no action that may change the screen has bumped the
+screen generation since it was captured.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from functools import cached_property
+from typing import TYPE_CHECKING, Any
+
+import cv2
+import numpy as np
+
+from shadowstep.exceptions.shadowstep_exceptions import ShadowstepImageLoadError
+from shadowstep.image.reduced_decode import decode_reduced_gray
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+# Seconds a captured frame may be reused for
+DEFAULT_FRAME_TTL = 0.25
+
+
+class Frame:
+    """Captured screenshot with lazily decoded arrays."""
+
+    def __init__(self, data: bytes, source: object, generation: int) -> None:
+        """Initialize the Frame.
+
+        Args:
+            data: Encoded screenshot (PNG).
+            source: Driver the screenshot was taken with.
+            generation: Screen generation at capture time.
+
+        """
+        self.data = data
+        self.source = source
+        self.generation = generation
+        self.captured_at = time.monotonic()
+        self._reduced: dict[int, np.ndarray[Any, Any]] = {}
+
+    @cached_property
+    def bgr(self) -> np.ndarray[Any, Any]:
+        """Decoded BGR image, read-only."""
+        image = cv2.imdecode(np.frombuffer(self.data, np.uint8), cv2.IMREAD_COLOR)
+        if image is None:  # type: ignore[reportUnnecessaryComparison]
+            raise ShadowstepImageLoadError(path="<screenshot>")
+        image.setflags(write=False)
+        return image
+
+    @cached_property
+    def gray(self) -> np.ndarray[Any, Any]:
+        """Grayscale image, converted from bgr, read-only."""
+        image = cv2.convertScaleAbs(cv2.cvtColor(self.bgr, cv2.COLOR_BGR2GRAY))
+        image.setflags(write=False)
+        return image
+
+    def reduced_gray(self, factor: int) -> np.ndarray[Any, Any]:
+        """Grayscale image with both sides divided by factor, decoded once per factor, read-only."""
+        if factor == 1:
+            return self.gray
+        image = self._reduced.get(factor)
+        if image is None:
+            image = decode_reduced_gray(self.data, factor)
+            image.setflags(write=False)
+            self._reduced[factor] = image
+        return image
+
+    @cached_property
+    def digest(self) -> str:
+        """Content hash of the encoded screenshot."""
+        return hashlib.blake2b(self.data, digest_size=16).hexdigest()
+
+
+class FrameCache:
+    """Holds the latest frame and the screen generation counter."""
+
+    def __init__(self, ttl: float = DEFAULT_FRAME_TTL) -> None:
+        """Initialize the FrameCache.
+
+        Args:
+            ttl: Seconds a frame may be reused for; 0 disables reuse.
+
+        """
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._generation = 0
+        self._frame: Frame | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every action that may change the screen."""
+        return self._generation
+
+    def get(self, source: object, capture: Callable[[], bytes]) -> Frame:
+        """Return the cached frame if it is still valid, otherwise capture a new one.
+
+        Args:
+            source: Driver the screenshot is taken with.
+            capture: Returns a new encoded screenshot.
+
+        Returns:
+            Frame: Current frame.
+
+        """
+        with self._lock:
+            frame = self._frame
+            generation = self._generation
+            if (
+                frame is not None
+                and frame.source is source
+                and frame.generation == generation
+                and time.monotonic() - frame.captured_at <= self.ttl
+            ):
+                self.hits += 1
+                return frame
+            self.misses += 1
+        frame = Frame(capture(), source, generation)
+        with self._lock:
+            self._frame = frame
+        return frame
+
+    def capture(self, source: object, capture: Callable[[], bytes]) -> Frame:
+        """Capture a new frame and keep it as the latest one.
+
+        Args:
+            source: Driver the screenshot is taken with.
+            capture: Returns a new encoded screenshot.
+
+        Returns:
+            Frame: New frame.
+
+        """
+        with self._lock:
+            self.misses += 1
+            generation = self._generation
+        frame = Frame(capture(), source, generation)
+        with self._lock:
+            self._frame = frame
+        return frame
+
+    def latest(self, source: object, *, newer_than: float | None = None) -> Frame | None:
+        """Return the kept frame without capturing, if it still shows the screen.
+
+        Args:
+            source: Driver the screenshot must come from.
+            newer_than: time.monotonic() value the frame must be captured after;
+                None accepts any frame younger than the TTL.
+
+        Returns:
+            Frame | None: Kept frame, or None if there is no valid one.
+
+        """
+        with self._lock:
+            frame = self._frame
+            if frame is None or frame.source is not source or frame.generation != self._generation:
+                return None
+            if newer_than is None:
+                if time.monotonic() - frame.captured_at > self.ttl:
+                    return None
+            elif frame.captured_at <= newer_than:
+                return None
+            self.hits += 1
+            return frame
+
+    def find(self, data: bytes) -> Frame | None:
+        """Return the cached frame holding exactly this bytes object, if any."""
+        frame = self._frame
+        if frame is not None and frame.data is data:
+            return frame
+        return None
+
+    def invalidate(self) -> None:
+        """Mark the screen as changed so the next capture is fresh."""
+        with self._lock:
+            self._generation += 1
+
+    def clear(self) -> None:
+        """Drop the cached frame and reset statistics."""
+        with self._lock:
+            self._frame = None
+            self.hits = 0
+            self.misses = 0
+
+
+frame_cache = FrameCache()
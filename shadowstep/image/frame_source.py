@@ -0,0 +1,205 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+"""Sources of screen frames for visual waits.
+
+ShadowstepImage.wait, wait_not and scroll_to only need to know whether an image
+is on screen, so they can read frames from any source. ScreenshotFrameSource
+polls the driver for PNG screenshots. MjpegFrameSource reads the MJPEG stream
+started by Shadowstep.start_screen_streaming on a background thread and keeps
+only the latest frame, so a wait sees a new frame at stream frame rate instead
+of paying a full screenshot round trip per poll.
+"""
+
+from __future__ import annotations
+
+import base64
+import logging
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any
+
+from shadowstep.exceptions.shadowstep_exceptions import ShadowstepFrameSourceError
+from shadowstep.image.frame_cache import Frame, frame_cache
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from typing_extensions import Self
+
+logger = logging.getLogger(__name__)
+
+# JPEG start and end of image markers
+JPEG_SOI = b"\xff\xd8"
+JPEG_EOI = b"\xff\xd9"
+# Bytes read from the stream per call
+STREAM_CHUNK_SIZE = 64 * 1024
+# Drop buffered bytes beyond this size when no complete frame is found in them
+MAX_STREAM_BUFFER = 16 * 1024 * 1024
+# Seconds to wait before reconnecting to a dropped stream
+RECONNECT_DELAY = 0.5
+
+
+class FrameSource(ABC):
+    """Provides the current screen as encoded frames."""
+
+    # Seconds between visibility checks of a wait loop reading from this source
+    poll_interval: float = 0.5
+
+    @abstractmethod
+    def read(self, *, newer_than: float | None = None, timeout: float = 5.0) -> Frame:
+        """Return the latest frame.
+
+        Args:
+            newer_than: time.monotonic() timestamp the frame must be captured after.
+            timeout: Seconds to wait for a suitable frame.
+
+        Returns:
+            Frame: Latest frame.
+
+        Raises:
+            ShadowstepFrameSourceError: If no suitable frame arrives within timeout.
+
+        """
+
+    def close(self) -> None:  # noqa: B027
+        """Release resources held by the source."""
+
+    def __enter__(self) -> Self:
+        """Use the source as a context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the source."""
+        self.close()
+
+
+class ScreenshotFrameSource(FrameSource):
+    """Frames taken with driver screenshots, shared through the frame cache."""
+
+    poll_interval = 0.5
+
+    def __init__(self, driver: Any) -> None:
+        """Initialize the ScreenshotFrameSource.
+
+        Args:
+            driver: WebDriver used to take screenshots.
+
+        """
+        self.driver = driver
+
+    def read(self, *, newer_than: float | None = None, timeout: float = 5.0) -> Frame:  # noqa: ARG002
+        """Return the cached screenshot, or a new one if it is stale or older than newer_than."""
+        frame = frame_cache.get(self.driver, self._capture)
+        if newer_than is not None and frame.captured_at < newer_than:
+            frame_cache.invalidate()
+            frame = frame_cache.get(self.driver, self._capture)
+        return frame
+
+    def _capture(self) -> bytes:
+        """Take a PNG screenshot."""
+        return base64.b64decode(self.driver.get_screenshot_as_base64().encode("utf-8"))
+
+
+class MjpegFrameSource(FrameSource):
+    """Latest frame of an MJPEG HTTP stream, read on a background thread."""
+
+    poll_interval = 0.05
+
+    def __init__(self, url: str, *, connect_timeout: float = 5.0) -> None:
+        """Initialize the MjpegFrameSource and start reading the stream.
+
+        Args:
+            url: Stream URL, e.g. http://127.0.0.1:8093/ for the default port of
+                Shadowstep.start_screen_streaming.
+            connect_timeout: Seconds to wait for the connection and for each read.
+
+        """
+        self.url = url
+        self.connect_timeout = connect_timeout
+        self.frames_received = 0
+        self._latest: Frame | None = None
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="shadowstep-mjpeg", daemon=True)
+        self._thread.start()
+
+    def read(self, *, newer_than: float | None = None, timeout: float = 5.0) -> Frame:
+        """Return the latest stream frame, waiting for one captured after newer_than."""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                frame = self._latest
+                if frame is not None and (newer_than is None or frame.captured_at >= newer_than):
+                    return frame
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stopped.is_set():
+                    raise ShadowstepFrameSourceError(source=self.url, timeout=timeout)
+                self._condition.wait(remaining)
+
+    def close(self) -> None:
+        """Stop the reader thread."""
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify_all()
+        self._thread.join(timeout=self.connect_timeout + 1)
+
+    def _run(self) -> None:
+        """Read the stream until closed, reconnecting when it drops."""
+        while not self._stopped.is_set():
+            try:
+                with urllib.request.urlopen(self.url, timeout=self.connect_timeout) as response:  # noqa: S310
+                    self._consume(response)
+            except Exception as error:  # noqa: BLE001
+                if self._stopped.is_set():
+                    break
+                logger.warning("MJPEG stream %s dropped: %s", self.url, error)
+            self._stopped.wait(RECONNECT_DELAY)
+
+    def _consume(self, response: Any) -> None:
+        """Split the byte stream into JPEG images and publish the latest one."""
+        buffer = b""
+        while not self._stopped.is_set():
+            chunk: bytes = response.read1(STREAM_CHUNK_SIZE)
+            if not chunk:
+                return
+            buffer += chunk
+            jpeg = None
+            # Keep only the last complete image of the chunk
+            while (start := buffer.find(JPEG_SOI)) != -1 and (end := buffer.find(JPEG_EOI, start + 2)) != -1:
+                jpeg = buffer[start:end + 2]
+                buffer = buffer[end + 2:]
+            if len(buffer) > MAX_STREAM_BUFFER:
+                buffer = b""
+            if jpeg is not None:
+                self._publish(jpeg)
+
+    def _publish(self, jpeg: bytes) -> None:
+        """Make jpeg the latest frame and wake up readers."""
+        frame = Frame(jpeg, self, self.frames_received)
+        with self._condition:
+            self._latest = frame
+            self.frames_received += 1
+            self._condition.notify_all()
+
+
+_default_source: FrameSource | None = None
+
+
+def set_default_frame_source(source: FrameSource | None) -> None:
+    """Make source the frame source of images created without one; None restores screenshots."""
+    global _default_source  # noqa: PLW0603
+    _default_source = source
+
+
+def get_default_frame_source() -> FrameSource | None:
+    """Return the frame source set by set_default_frame_source, if any."""
+    return _default_source
@@ -16,9 +16,12 @@ architecture patterns and type safety.
 from __future__ import annotations
 
 import base64
+import copy
 import logging
 import time
-from typing import TYPE_CHECKING, Any, cast
+from functools import cached_property, partial
+from operator import methodcaller
+from typing import TYPE_CHECKING, Any, Literal, Union, cast
 
 import cv2
 import numpy as np
@@ -32,17 +35,62 @@ from selenium.webdriver.support.wait import WebDriverWait
 
 from shadowstep.decorators.decorators import log_image
 from shadowstep.decorators.image_decorators import fail_safe_image
+from shadowstep.element.element import Element
 from shadowstep.exceptions.shadowstep_exceptions import (
+    ShadowstepFrameSourceError,
     ShadowstepImageLoadError,
     ShadowstepImageNotFoundError,
     ShadowstepInvalidScrollDirectionError,
     ShadowstepUnsupportedImageTypeError,
 )
+from shadowstep.image.change_gate import ChangeGate
+from shadowstep.image.frame_cache import frame_cache
+from shadowstep.image.frame_source import FrameSource, get_default_frame_source
+from shadowstep.image.match_cache import match_cache
+from shadowstep.image.matching_pool import get_matching_pool, get_matching_workers
+from shadowstep.image.ocr import DEFAULT_OCR_LANG
+from shadowstep.image.reduced_decode import decode_reduced_gray, get_match_reduction
+from shadowstep.image.scale_prior import scale_prior
+from shadowstep.image.scroll_tracker import ScrollTracker
+from shadowstep.image.template_cache import template_cache
 from shadowstep.ui_automator.mobile_commands import MobileCommands
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Iterator, Sequence
+
+    from shadowstep.image.matchers import ImageMatcher
     from shadowstep.shadowstep import Shadowstep
 
+# Search region of ShadowstepImage: pixel rect, screen fractions, element bounds or LAST_LOCATION
+SearchRegion = Union[
+    tuple[int, int, int, int],
+    tuple[float, float, float, float],
+    Element,
+    Literal["last"],
+]
+# Region value selecting the last location the image was found at
+LAST_LOCATION = "last"
+# Pixels added around the last known location when it is searched first
+LAST_LOCATION_MARGIN = 48
+
+# Seconds between checks of wait()/wait_not() polling driver screenshots
+WAIT_POLL_FREQUENCY = 0.5
+
+# Template scales tried by multi-scale matching: shrinking (1.0-0.2) first, then expanding (1.1-2.0)
+MATCH_SCALES = np.concatenate([np.linspace(0.2, 1.0, 10)[::-1], np.linspace(1.1, 2.0, 10)])
+# Screen downsampling factors used for the coarse pass, coarsest first
+COARSE_FACTORS = (0.25, 0.5)
+# Smallest template side, in pixels, still matched on a downsampled screen
+MIN_COARSE_TEMPLATE_SIDE = 12
+# Screens with a shorter side are always matched at full resolution
+MIN_COARSE_IMAGE_SIDE = 320
+# Number of best coarse candidates refined at full resolution
+REFINE_CANDIDATES = 3
+# Intersection over union above which find_all drops the weaker of two matches
+DEFAULT_OVERLAP_THRESHOLD = 0.3
+# Fewest result rows per tile when a full-screen match is split across the matching pool
+MIN_TILE_ROWS = 128
+
 
 class ShadowstepImage:
     """Image-based interactions with lazy evaluation and method chaining support.
@@ -69,11 +117,14 @@ class ShadowstepImage:
 
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         image: bytes | np.ndarray[Any, Any] | PILImage.Image | str,
         threshold: float = 0.7,
         timeout: float = 5.0,
+        region: SearchRegion | None = None,
+        frame_source: FrameSource | None = None,
+        matcher: ImageMatcher | None = None,
     ) -> None:
         """Initialize the ShadowstepImage.
 
@@ -87,6 +138,17 @@ class ShadowstepImage:
             threshold: Matching threshold for image recognition (0.0 to 1.0).
                 Higher values require better match. Default: 0.7 (70% match).
             timeout: Timeout in seconds for visibility/wait operations. Default: 5.0.
+            region: Part of the screen searched first; the whole screen is searched
+                only if the image is not found there:
+                - (x1, y1, x2, y2) ints: pixel rect
+                - (x1, y1, x2, y2) floats: fractions of the screen size
+                - Element: bounds of the element
+                - "last": where this image was last found
+            frame_source: Frames read by wait(), wait_not() and scroll_to(), e.g. an
+                MjpegFrameSource. Defaults to the source set with
+                set_default_frame_source(), or driver screenshots.
+            matcher: Matching engine, e.g. FeatureMatcher("orb") for rotated or
+                partly covered icons. None uses multi-scale template matching.
 
         """
         from shadowstep.shadowstep import Shadowstep  # noqa: PLC0415
@@ -96,6 +158,10 @@ class ShadowstepImage:
         self._image = image
         self.threshold = threshold
         self.timeout = timeout
+        self.region = region
+        self.frame_source = frame_source
+        self.matcher = matcher
+        self._reduced_views: dict[int, ShadowstepImage] = {}
 
         # Cached values (lazy evaluation)
         self._coords: tuple[int, int, int, int] = cast("tuple[int, int, int, int]", None)
@@ -134,6 +200,7 @@ class ShadowstepImage:
         self.ensure_visible()
         x, y = self._center  # type: ignore[misc]
         self.shadowstep.driver.tap(positions=[(x, y)], duration=duration)
+        frame_cache.invalidate()
         self.logger.info("Tapped at (%s, %s) with duration=%s", x, y, duration)
         return self
 
@@ -182,6 +249,7 @@ class ShadowstepImage:
         actions.w3c_actions.pointer_action.move_to_location(end_x, end_y)  # type: ignore[reportUnknownMemberType]
         actions.w3c_actions.pointer_action.pointer_up()  # type: ignore[reportUnknownMemberType]
         actions.perform()
+        frame_cache.invalidate()
 
         self.logger.info("Dragged from (%s, %s) to (%s, %s)", start_x, start_y, end_x, end_y)
         return self
@@ -299,13 +367,14 @@ class ShadowstepImage:
 
         """
         start_time = time.time()
+        probe, poll_frequency = self._visibility_probe()
 
         def image_visible(_driver: Any) -> bool:
             """Check if image is visible (for WebDriverWait)."""
-            return self._get_image_coordinates() is not None
+            return probe() is not None
 
         try:
-            WebDriverWait(self.shadowstep.driver, self.timeout, poll_frequency=0.5).until(
+            WebDriverWait(self.shadowstep.driver, self.timeout, poll_frequency=poll_frequency).until(
                 image_visible,
             )
             self.ensure_visible()  # Cache coordinates
@@ -333,13 +402,14 @@ class ShadowstepImage:
 
         """
         start_time = time.time()
+        probe, poll_frequency = self._visibility_probe()
 
         def image_not_visible(_driver: Any) -> bool:
             """Check if image is not visible (for WebDriverWait)."""
-            return self._get_image_coordinates() is None
+            return probe() is None
 
         try:
-            WebDriverWait(self.shadowstep.driver, self.timeout, poll_frequency=0.5).until(
+            WebDriverWait(self.shadowstep.driver, self.timeout, poll_frequency=poll_frequency).until(
                 image_not_visible,
             )
             # Clear cache since image is no longer visible
@@ -443,7 +513,7 @@ class ShadowstepImage:
             image.scroll_down().tap()  # Scroll down until visible, then tap
 
         Raises:
-            ShadowstepImageNotFoundError: If image not found after max_attempts.
+            ShadowstepImageNotFoundError: If image not found after max_attempts or at the end of the content.
 
         """
         return self._scroll_to_image(
@@ -473,7 +543,7 @@ class ShadowstepImage:
             image.scroll_up().tap()
 
         Raises:
-            ShadowstepImageNotFoundError: If image not found after max_attempts.
+            ShadowstepImageNotFoundError: If image not found after max_attempts or at the end of the content.
 
         """
         return self._scroll_to_image(
@@ -498,7 +568,7 @@ class ShadowstepImage:
             ShadowstepImage: Self for method chaining.
 
         Raises:
-            ShadowstepImageNotFoundError: If image not found after max_attempts.
+            ShadowstepImageNotFoundError: If image not found after max_attempts or at the end of the content.
 
         """
         return self._scroll_to_image(
@@ -523,7 +593,7 @@ class ShadowstepImage:
             ShadowstepImage: Self for method chaining.
 
         Raises:
-            ShadowstepImageNotFoundError: If image not found after max_attempts.
+            ShadowstepImageNotFoundError: If image not found after max_attempts or at the end of the content.
 
         """
         return self._scroll_to_image(
@@ -551,7 +621,7 @@ class ShadowstepImage:
             image.scroll_to().tap()  # Smart scroll then tap
 
         Raises:
-            ShadowstepImageNotFoundError: If image not found after max_attempts.
+            ShadowstepImageNotFoundError: If image not found after max_attempts or at the end of the content.
 
         Note:
             This method tries scrolling down first, then up if not found.
@@ -591,26 +661,16 @@ class ShadowstepImage:
         """
         self.ensure_visible()
 
-        # Get screenshot and crop to this image's bounds
-        screenshot = self._get_screenshot_as_bytes()
+        # Search the target only within this image's bounds, on the frame ensure_visible matched
+        screenshot = self._get_screenshot_as_bytes(reuse=True)
         full_image_array = self.to_ndarray(screenshot, grayscale=True)
+        target = ShadowstepImage(image, threshold=self.threshold, region=self._coords)
+        coords = target.locate_in(full_image_array, widen=False)
 
-        x1, y1, x2, y2 = self._coords  # type: ignore[misc]
-        cropped_region = full_image_array[y1:y2, x1:x2]
-
-        # Convert target image to ndarray
-        target_array = self.to_ndarray(image, grayscale=True)
-
-        # Perform template matching in cropped region
-        max_val, _ = self.multi_scale_matching(
-            full_image=cropped_region,
-            template_image=target_array,
-        )
-
-        result = max_val >= self.threshold
+        result = coords is not None
         self.logger.info(
-            "is_contains: max_val=%.3f, threshold=%.3f, result=%s",
-            max_val,
+            "is_contains: target=%s, threshold=%.3f, result=%s",
+            coords,
             self.threshold,
             result,
         )
@@ -661,7 +721,10 @@ class ShadowstepImage:
         """
         result: np.ndarray[Any, Any]
 
-        # Handle bytes
+        # Handle bytes; a cached screenshot is decoded only once
+        frame = frame_cache.find(image) if isinstance(image, bytes) else None
+        if frame is not None:
+            return np.array(frame.gray if grayscale else frame.bgr)
         if isinstance(image, bytes):
             result = cv2.imdecode(np.frombuffer(image, np.uint8), cv2.IMREAD_COLOR)  # type: ignore[reportAssignmentType]
             if result is None:  # type: ignore[reportUnnecessaryComparison]
@@ -698,12 +761,20 @@ class ShadowstepImage:
         self,
         full_image: np.ndarray[Any, Any],
         template_image: np.ndarray[Any, Any],
+        *,
+        template_key: str | None = None,
+        device_key: str | None = None,
     ) -> tuple[float, tuple[int, int]]:
         """Perform multi-scale template matching.
 
         Args:
             full_image: The full image to search in (grayscale).
             template_image: The template image to search for (grayscale).
+            template_key: Template cache key; when given, resized templates are
+                reused from the process-wide template cache.
+            device_key: Device the screen comes from, for the learned template
+                scale. Derived from full_image when omitted; pass it when
+                full_image is a crop of the screen.
 
         Returns:
             tuple[float, tuple[int, int]]:
@@ -717,71 +788,297 @@ class ShadowstepImage:
 
         Note:
             This method tries multiple scales (0.2x to 2.0x) to handle
-            different screen densities and resolutions. Adapted from
-            legacy _multi_scale_matching implementation.
+            different screen densities and resolutions. Scales are searched
+            coarse-to-fine: on a downsampled screen first, then refined at
+            full resolution around the best candidates only. When template_key
+            is given, the scale the template last matched at on this device is
+            tried first and the full search runs only if it misses.
 
         """
-        origin_width, origin_height = template_image.shape[::-1]
-
-        best_val = 0.0
-        best_loc = (0, 0)
+        best_val, best_loc, _ = self._match_with_prior(full_image, template_image, template_key, device_key)
+        self.logger.info("Multi-scale matching: best_val=%.3f at %s", best_val, best_loc)
+        return best_val, best_loc
 
-        # Try both shrinking (0.2-1.0) and expanding (1.1-2.0) scales
-        scales = np.concatenate(
-            [
-                np.linspace(0.2, 1.0, 10)[::-1],  # Shrink template
-                np.linspace(1.1, 2.0, 10),  # Expand template
-            ],
+    def _match_with_prior(
+        self,
+        full_image: np.ndarray[Any, Any],
+        template_image: np.ndarray[Any, Any],
+        template_key: str | None,
+        device_key: str | None = None,
+    ) -> tuple[float, tuple[int, int], float]:
+        """Try the learned scale of the template first, fall back to the full search."""
+        if template_key is None:
+            return self._match_best_scale(full_image, template_image, template_key)
+
+        device = device_key or self._device_key(full_image)
+        scale = scale_prior.get(device, template_key)
+        if scale is not None:
+            match = self._match_at_scale(full_image, template_image, template_key, scale)
+            scale_prior.record_outcome(hit=match[0] >= self.threshold)
+            if match[0] >= self.threshold:
+                return match
+
+        match = self._match_best_scale(full_image, template_image, template_key)
+        if match[0] >= self.threshold:
+            scale_prior.record(device, template_key, match[2])
+        return match
+
+    def _match_at_scale(
+        self,
+        full_image: np.ndarray[Any, Any],
+        template_image: np.ndarray[Any, Any],
+        template_key: str | None,
+        scale: float,
+    ) -> tuple[float, tuple[int, int], float]:
+        """Match the template at a single scale over the full-resolution screen."""
+        origin_height, origin_width = template_image.shape[:2]
+        new_width = int(origin_width * scale)
+        new_height = int(origin_height * scale)
+        if not 0 < new_height <= full_image.shape[0] or not 0 < new_width <= full_image.shape[1]:
+            return 0.0, (0, 0), scale
+        match = self._match_region(
+            full_image,
+            self._resize_template(template_image, (new_width, new_height), template_key),
+            (0, 0),
+            tiled=True,
         )
+        if match is None:
+            return 0.0, (0, 0), scale
+        return match[0], match[1], scale
+
+    def _device_key(self, full_image: np.ndarray[Any, Any]) -> str:
+        """Identify the device a screenshot comes from for the scale prior."""
+        capabilities = getattr(self.shadowstep, "capabilities", None)
+        device = ""
+        if isinstance(capabilities, dict):
+            capabilities = cast("dict[str, Any]", capabilities)
+            device = str(
+                capabilities.get("appium:udid")
+                or capabilities.get("udid")
+                or capabilities.get("appium:deviceName")
+                or "",
+            )
+        height, width = full_image.shape[:2]
+        return f"{device}@{width}x{height}"
 
-        for scale in scales:
-            # Resize template to current scale
-            new_width = int(origin_width * scale)
-            new_height = int(origin_height * scale)
+    def _match_best_scale(
+        self,
+        full_image: np.ndarray[Any, Any],
+        template_image: np.ndarray[Any, Any],
+        template_key: str | None = None,
+    ) -> tuple[float, tuple[int, int], float]:
+        """Coarse-to-fine search for the best template scale and location.
 
-            # Skip if resized template is larger than full image
-            if new_height > full_image.shape[0] or new_width > full_image.shape[1]:
+        Each scale is first matched on the most downsampled copy of the screen
+        where the scaled template still has MIN_COARSE_TEMPLATE_SIDE pixels; scales
+        too small for that are matched at full resolution directly. The best coarse
+        candidates are then refined at full resolution in a small window around
+        their location.
+
+        Returns:
+            tuple[float, tuple[int, int], float]: confidence, (x, y) top-left corner
+                of the best match and the template scale it was found at.
+
+        """
+        origin_height, origin_width = template_image.shape[:2]
+        image_height, image_width = full_image.shape[:2]
+        # Skip scales where the resized template is empty or larger than full image
+        scales = [
+            float(scale)
+            for scale in MATCH_SCALES
+            if 1 <= int(origin_width * scale) <= image_width and 1 <= int(origin_height * scale) <= image_height
+        ]
+        candidates: list[tuple[float, float, tuple[int, int], float]] = []
+        best: tuple[float, tuple[int, int], float] = (0.0, (0, 0), 1.0)
+
+        for candidate in self._scale_candidates(full_image, template_image, template_key, scales):
+            if candidate is None:
+                continue
+            if candidate[3] < 1.0 and candidate[0] <= self.MIN_SUFFICIENT_MATCH:
+                candidates.append(candidate)
                 continue
+            match = self._refine_candidate(full_image, template_image, template_key, candidate)
+            best = max(best, match, key=lambda item: item[0])
+            if match[0] > self.MIN_SUFFICIENT_MATCH:
+                return best
+
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+        for candidate in candidates[:REFINE_CANDIDATES]:
+            match = self._refine_candidate(full_image, template_image, template_key, candidate)
+            best = max(best, match, key=lambda item: item[0])
+        return best
+
+    def _scale_candidates(
+        self,
+        full_image: np.ndarray[Any, Any],
+        template_image: np.ndarray[Any, Any],
+        template_key: str | None,
+        scales: list[float],
+    ) -> Iterator[tuple[float, float, tuple[int, int], float] | None]:
+        """Yield the coarse candidate of every scale, in scale order.
+
+        With the matching pool enabled all scales are matched concurrently;
+        otherwise each scale is matched when the caller asks for it, so an early
+        exit skips the remaining ones.
+        """
+        levels: dict[float, np.ndarray[Any, Any]] = {}
+        pool = get_matching_pool()
+        if pool is None:
+            return (
+                self._scale_candidate(full_image, template_image, template_key, scale, levels)
+                for scale in scales
+            )
+        # Build shared screen levels up front so workers only read them
+        origin_height, origin_width = template_image.shape[:2]
+        for scale in scales:
+            factor = self._coarse_factor(
+                min(int(origin_width * scale), int(origin_height * scale)), full_image,
+            )
+            if factor != 1.0 and factor not in levels:
+                levels[factor] = cv2.resize(
+                    full_image, None, fx=factor, fy=factor, interpolation=cv2.INTER_AREA,
+                )
+        return pool.map(
+            partial(self._scale_candidate, full_image, template_image, template_key, levels=levels),
+            scales,
+        )
 
-            resized_template = cv2.resize(template_image, (new_width, new_height))
+    def _scale_candidate(
+        self,
+        full_image: np.ndarray[Any, Any],
+        template_image: np.ndarray[Any, Any],
+        template_key: str | None,
+        scale: float,
+        levels: dict[float, np.ndarray[Any, Any]],
+    ) -> tuple[float, float, tuple[int, int], float] | None:
+        """Match one template scale on the coarsest usable screen level.
 
-            # Perform template matching
-            try:
-                result = cv2.matchTemplate(full_image, resized_template, cv2.TM_CCOEFF_NORMED)
-                _, max_val, _, max_loc = cv2.minMaxLoc(result)
-                max_loc = (int(max_loc[0]), int(max_loc[1]))
+        Returns:
+            tuple | None: (confidence, scale, full-resolution (x, y), level factor),
+                or None if matching failed. A factor of 1.0 means the match is exact.
 
-                # Update best match if this is better
-                if max_val > best_val:
-                    best_val = max_val
-                    best_loc = max_loc
+        """
+        origin_height, origin_width = template_image.shape[:2]
+        new_width = int(origin_width * scale)
+        new_height = int(origin_height * scale)
+        factor = self._coarse_factor(min(new_width, new_height), full_image)
+        if factor == 1.0:
+            level = full_image
+            size = (new_width, new_height)
+        else:
+            if factor not in levels:
+                levels[factor] = cv2.resize(
+                    full_image, None, fx=factor, fy=factor, interpolation=cv2.INTER_AREA,
+                )
+            level = levels[factor]
+            size = (max(1, round(new_width * factor)), max(1, round(new_height * factor)))
+        match = self._match_region(level, self._resize_template(template_image, size, template_key), (0, 0))
+        if match is None:
+            return None
+        confidence, (x, y) = match
+        return confidence, scale, (int(x / factor), int(y / factor)), factor
 
-                # Early exit if we found a very good match
-                if max_val > self.MIN_SUFFICIENT_MATCH:
-                    break
+    @staticmethod
+    def _coarse_factor(template_side: int, full_image: np.ndarray[Any, Any]) -> float:
+        """Pick the coarsest downsampling factor that keeps the template matchable."""
+        if min(full_image.shape[:2]) < MIN_COARSE_IMAGE_SIDE:
+            return 1.0
+        for factor in COARSE_FACTORS:
+            if template_side * factor >= MIN_COARSE_TEMPLATE_SIDE:
+                return factor
+        return 1.0
+
+    def _refine_candidate(
+        self,
+        full_image: np.ndarray[Any, Any],
+        template_image: np.ndarray[Any, Any],
+        template_key: str | None,
+        candidate: tuple[float, float, tuple[int, int], float],
+    ) -> tuple[float, tuple[int, int], float]:
+        """Rematch a coarse candidate at full resolution around its location."""
+        confidence, scale, (x, y), factor = candidate
+        if factor == 1.0:
+            return confidence, (x, y), scale
+        origin_height, origin_width = template_image.shape[:2]
+        width = int(origin_width * scale)
+        height = int(origin_height * scale)
+        margin = 2 * int(np.ceil(1 / factor))
+        x0 = max(0, x - margin)
+        y0 = max(0, y - margin)
+        x1 = min(full_image.shape[1], x + width + margin)
+        y1 = min(full_image.shape[0], y + height + margin)
+        if x1 - x0 < width or y1 - y0 < height:
+            return 0.0, (0, 0), scale
+        match = self._match_region(
+            full_image[y0:y1, x0:x1],
+            self._resize_template(template_image, (width, height), template_key),
+            (x0, y0),
+        )
+        if match is None:
+            return 0.0, (0, 0), scale
+        return match[0], match[1], scale
 
-            except cv2.error as e:
-                self.logger.warning("Template matching error at scale %.2f: %s", scale, e)
-                continue
+    def _match_region(
+        self,
+        image: np.ndarray[Any, Any],
+        template: np.ndarray[Any, Any],
+        origin: tuple[int, int],
+        *,
+        tiled: bool = False,
+    ) -> tuple[float, tuple[int, int]] | None:
+        """Run matchTemplate and return the best score and its location offset by origin."""
+        try:
+            result = self._match_template(image, template, tiled=tiled)
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        except cv2.error as e:
+            self.logger.warning("Template matching error: %s", e)
+            return None
+        return float(max_val), (origin[0] + int(max_loc[0]), origin[1] + int(max_loc[1]))
 
-        self.logger.info("Multi-scale matching: best_val=%.3f at %s", best_val, best_loc)
-        return best_val, best_loc
+    @staticmethod
+    def _match_template(
+        image: np.ndarray[Any, Any],
+        template: np.ndarray[Any, Any],
+        *,
+        tiled: bool = False,
+    ) -> np.ndarray[Any, Any]:
+        """Compute the TM_CCOEFF_NORMED result matrix, split into row tiles on the matching pool.
 
-    # ==================== ADDITIONAL METHODS (P2 - Extended functionality) ====================
+        Tiles overlap by the template height, so the stacked result equals the
+        untiled one. Must not be called with tiled=True from a pool worker.
+        """
+        pool = get_matching_pool()
+        rows = image.shape[0] - template.shape[0] + 1
+        if not tiled or pool is None or rows < 2 * MIN_TILE_ROWS:
+            return cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
+        tiles = min(get_matching_workers(), rows // MIN_TILE_ROWS)
+        bounds = [rows * index // tiles for index in range(tiles + 1)]
+        overlap = template.shape[0] - 1
+        futures = [
+            pool.submit(cv2.matchTemplate, image[start:end + overlap], template, cv2.TM_CCOEFF_NORMED)
+            for start, end in zip(bounds[:-1], bounds[1:])
+        ]
+        return np.vstack([future.result() for future in futures])
 
     @log_image()
     def find_all(
         self,
         coord_threshold: int = 5,
+        *,
+        max_results: int | None = None,
+        overlap_threshold: float = DEFAULT_OVERLAP_THRESHOLD,
     ) -> list[tuple[int, int, int, int]]:
         """Find all occurrences of the image on screen.
 
         Args:
             coord_threshold: Minimum pixel distance between matches to consider them unique.
+            max_results: Return at most this many matches, best first. None returns all.
+            overlap_threshold: Matches whose boxes overlap a better match by more than
+                this intersection over union are dropped.
 
         Returns:
             list[tuple[int, int, int, int]]: List of (x1, y1, x2, y2) coordinates
-                for each match found.
+                for each match found, best match first.
 
         Example:
             # Find all instances of a button
@@ -792,40 +1089,41 @@ class ShadowstepImage:
 
         Note:
             This is migrated from legacy get_many_coordinates_of_image.
-            Close matches (within coord_threshold pixels) are filtered out.
+            Only local score maxima within coord_threshold pixels are kept,
+            then overlapping boxes are suppressed in score order (NMS).
+            Boxes have the size of the template at the scale that matched.
 
         """
         screenshot = self._get_screenshot_as_bytes()
         full_image = self.to_ndarray(screenshot, grayscale=True)
-        template = self.to_ndarray(self._image, grayscale=True)
+        template = self._load_template(self._image, self._template_key)
 
         # Perform multi-scale matching to get all possible matches
-        # We need to modify multi_scale_matching to return raw result
-        result = self._multi_scale_matching_raw(full_image, template)
+        result = self._multi_scale_matching_raw(full_image, template, template_key=self._template_key)
 
         if result is None:
             self.logger.warning("No matches found for find_all()")
             return []
 
-        # Get all matches above threshold
-        locations = np.where(result >= self.threshold)
-        matches = list(zip(*locations[::-1]))
-
-        # Filter out duplicate/close matches
-        unique_matches: list[tuple[int, int]] = []
-        for x1, y1 in matches:
-            is_duplicate = False
-            for x2, y2 in unique_matches:
-                if abs(x1 - x2) <= coord_threshold and abs(y1 - y2) <= coord_threshold:
-                    is_duplicate = True
-                    break
-            if not is_duplicate:
-                unique_matches.append((x1, y1))
-
-        # Convert to bounding boxes
-        template_height, template_width = template.shape[:2]
+        # The result map of a scaled template is smaller than the screen by its size
+        template_height = full_image.shape[0] - result.shape[0] + 1
+        template_width = full_image.shape[1] - result.shape[1] + 1
+
+        # Local maxima above threshold: one peak per coord_threshold neighbourhood
+        kernel = np.ones((2 * coord_threshold + 1, 2 * coord_threshold + 1), dtype=np.uint8)
+        peaks = (result >= self.threshold) & (result >= cv2.dilate(result, kernel))
+        ys, xs = np.nonzero(peaks)
+        if xs.size == 0:
+            self.logger.info("Found 0 unique matches")
+            return []
+        scores = result[ys, xs].astype(float)
+
+        boxes = [[int(x), int(y), template_width, template_height] for x, y in zip(xs, ys)]
+        # Indices of kept boxes, best score first; top_k would cap before suppression
+        keep = np.asarray(cv2.dnn.NMSBoxes(boxes, scores.tolist(), self.threshold, overlap_threshold))
         bounding_boxes = [
-            (x, y, x + template_width, y + template_height) for x, y in unique_matches
+            (x, y, x + width, y + height)
+            for x, y, width, height in (boxes[int(index)] for index in keep.reshape(-1)[:max_results])
         ]
 
         self.logger.info("Found %d unique matches", len(bounding_boxes))
@@ -855,7 +1153,7 @@ class ShadowstepImage:
         try:
             self.ensure_visible()
 
-            screenshot = self._get_screenshot_as_bytes()
+            screenshot = self._get_screenshot_as_bytes(reuse=True)
             img_array = self.to_ndarray(screenshot, grayscale=False)
 
             x1, y1, x2, y2 = self._coords  # type: ignore[misc]
@@ -907,19 +1205,176 @@ class ShadowstepImage:
         self._last_screenshot_time = time.time()
         self.logger.info("Image found at coords=%s, center=%s", self._coords, self._center)
 
-    def _get_screenshot_as_bytes(self) -> bytes:
+    def locate_in(
+        self,
+        full_image: np.ndarray[Any, Any],
+        *,
+        widen: bool = True,
+    ) -> tuple[int, int, int, int] | None:
+        """Find the image on an already captured screen and cache its coordinates.
+
+        Args:
+            full_image: Grayscale screenshot to search in.
+            widen: Search the whole screen when the image is not in the search region.
+
+        Returns:
+            tuple[int, int, int, int] | None: (x1, y1, x2, y2) if found, None otherwise.
+
+        """
+        coords = self._locate(full_image, widen=widen)
+        if coords is not None:
+            self._coords = coords
+            self._center = self._calculate_center(coords)
+            self._last_screenshot_time = time.time()
+        return coords
+
+    @staticmethod
+    def locate_all(images: Sequence[ShadowstepImage]) -> list[tuple[int, int, int, int] | None]:
+        """Search several templates on a single screenshot.
+
+        The screenshot is taken and decoded once and every template is matched
+        against it, concurrently when the matching pool is enabled. Found images
+        get their coordinates and center cached, as after ensure_visible().
+
+        Args:
+            images: Images to search for.
+
+        Returns:
+            list[tuple[int, int, int, int] | None]: (x1, y1, x2, y2) of each image,
+                in input order, or None for images not on screen.
+
+        Example:
+            ok, cancel = ShadowstepImage.locate_all([ok_image, cancel_image])
+
+        """
+        if not images:
+            return []
+        full_image = images[0].to_ndarray(images[0].shadowstep.get_screenshot(), grayscale=True)
+        pool = get_matching_pool()
+        if pool is None:
+            return [image.locate_in(full_image) for image in images]
+        return list(pool.map(methodcaller("locate_in", full_image), images))
+
+    @staticmethod
+    def locate_first(images: Sequence[ShadowstepImage]) -> int | None:
+        """Search templates on a single screenshot in order, stopping at the first found.
+
+        Unlike locate_all, templates after the first one on screen are not matched.
+        The found image gets its coordinates and center cached.
+
+        Args:
+            images: Images to search for, in order of preference.
+
+        Returns:
+            int | None: Index of the first image on screen, None if none is.
+
+        """
+        if not images:
+            return None
+        full_image = images[0].to_ndarray(images[0].shadowstep.get_screenshot(), grayscale=True)
+        for index, image in enumerate(images):
+            if image.locate_in(full_image) is not None:
+                return index
+        return None
+
+    @staticmethod
+    def find_text(
+        text: str,
+        *,
+        region: SearchRegion | None = None,
+        threshold: float = 0.5,
+        lang: str = DEFAULT_OCR_LANG,
+        exact: bool = False,
+    ) -> list[tuple[int, int, int, int]]:
+        """Find a phrase on the current screen with OCR.
+
+        Args:
+            text: Phrase to find; several words must follow each other on one line.
+            region: Part of the screen to read, as for ShadowstepImage; None reads the whole screen.
+            threshold: Lowest OCR confidence (0-1) accepted for each word.
+            lang: Tesseract language, e.g. "eng" or "eng+rus".
+            exact: Compare case and punctuation as well.
+
+        Returns:
+            list[tuple[int, int, int, int]]: (x1, y1, x2, y2) of each occurrence, top to bottom.
+
+        Example:
+            boxes = ShadowstepImage.find_text("Continue")
+            if boxes:
+            ...     x1, y1, x2, y2 = boxes[0]
+            ...     app.tap((x1 + x2) // 2, (y1 + y2) // 2)
+
+        """
+        from shadowstep.image.text_region import TextRegion  # noqa: PLC0415
+
+        return TextRegion(text, threshold, region=region, lang=lang, exact=exact).find_all()
+
+    def _get_screenshot_as_bytes(self, *, reuse: bool = False) -> bytes:
         """Get current screenshot as bytes.
 
+        Args:
+            reuse: Take the frame captured by a previous step of the same
+                operation if the frame cache still holds it, e.g. the one
+                ensure_visible matched; otherwise a new screenshot is taken.
+
         Returns:
             bytes: Screenshot in PNG format as bytes.
 
         """
-        screenshot_b64 = self.shadowstep.driver.get_screenshot_as_base64()
-        return base64.b64decode(screenshot_b64.encode("utf-8"))
+        driver = self.shadowstep.driver
+
+        def capture() -> bytes:
+            return base64.b64decode(driver.get_screenshot_as_base64().encode("utf-8"))
+
+        if reuse:
+            return frame_cache.get(driver, capture).data
+        return frame_cache.capture(driver, capture).data
+
+    @cached_property
+    def _template_key(self) -> str | None:
+        """Template cache key of this image, hashed once per instance."""
+        return template_cache.key_for(self._image)
+
+    def _load_template(
+        self,
+        image: bytes | np.ndarray[Any, Any] | PILImage.Image | str,
+        key: str | None,
+    ) -> np.ndarray[Any, Any]:
+        """Get a grayscale template, decoding it only on a template cache miss.
+
+        Args:
+            image: Template in any format accepted by to_ndarray.
+            key: Template cache key; None bypasses the cache.
+
+        Returns:
+            np.ndarray: Grayscale template.
+
+        """
+        if key is None:
+            return self.to_ndarray(image, grayscale=True)
+        entry = template_cache.get(key)
+        if entry is None:
+            entry = template_cache.put(key, self.to_ndarray(image, grayscale=True))
+        return entry.gray
+
+    @staticmethod
+    def _resize_template(
+        template: np.ndarray[Any, Any],
+        size: tuple[int, int],
+        key: str | None,
+    ) -> np.ndarray[Any, Any]:
+        """Resize a template to (width, height), through the template cache when keyed."""
+        if key is None:
+            return cv2.resize(template, size)
+        return template_cache.resized(key, template, size)
 
-    def _get_image_coordinates(self) -> tuple[int, int, int, int] | None:
+    def _get_image_coordinates(self, gate: ChangeGate | None = None) -> tuple[int, int, int, int] | None:
         """Find coordinates of the image on current screen.
 
+        Args:
+            gate: Change gate of a wait loop; the screen is matched only where it
+                changed since the previous poll.
+
         Returns:
             tuple[int, int, int, int] | None: (x1, y1, x2, y2) if found, None otherwise.
 
@@ -928,38 +1383,304 @@ class ShadowstepImage:
             get_image_coordinates method.
 
         """
+        factor = self._match_reduction()
         try:
             # Get screenshot
             screenshot = self._get_screenshot_as_bytes()
-            full_image = self.to_ndarray(screenshot, grayscale=True)
+        except Exception:
+            self.logger.exception("Error finding image coordinates")
+            return None
+        # Results of a whole-screen match are reused while the frame is unchanged
+        frame = frame_cache.find(screenshot)
+        key = self._match_cache_key(factor) if gate is None and frame is not None else None
+        if frame is not None and key is not None:
+            cached, coords = match_cache.get(frame.digest, key)
+            if cached:
+                self.logger.debug("Match result on unchanged frame reused: %s", coords)
+                return coords
+        try:
+            if factor == 1:
+                full_image = self.to_ndarray(screenshot, grayscale=True)
+            else:
+                full_image = frame.reduced_gray(factor) if frame else decode_reduced_gray(screenshot, factor)
+        except Exception:
+            self.logger.exception("Error finding image coordinates")
+            return None
+        coords = self._locate_reduced(full_image, factor, gate)
+        if frame is not None and key is not None:
+            match_cache.put(frame.digest, key, coords)
+        return coords
+
+    def _match_cache_key(self, factor: int) -> Hashable | None:
+        """Match parameters a result on one frame depends on; None if results must not be cached."""
+        if self._template_key is None:
+            return None
+        region = self.region
+        if region == LAST_LOCATION:
+            region = (LAST_LOCATION, self._coords)
+        return type(self), self._template_key, self.threshold, region, factor, self.matcher
 
-            # Convert template to ndarray
-            template = self.to_ndarray(self._image, grayscale=True)
+    def _match_reduction(self) -> int:
+        """Resolution divisor visibility checks of this image match at."""
+        return get_match_reduction()
 
-            # Perform multi-scale matching
-            max_val, max_loc = self.multi_scale_matching(full_image, template)
+    def _locate_reduced(
+        self,
+        screen: np.ndarray[Any, Any],
+        factor: int,
+        gate: ChangeGate | None = None,
+    ) -> tuple[int, int, int, int] | None:
+        """Find the image on a screen decoded at 1/factor resolution; coordinates are in device pixels."""
+        if factor == 1:
+            return self._locate(screen) if gate is None else self._locate_changed(screen, gate)
+        view = self._reduced_view(factor)
+        coords = view._locate(screen) if gate is None else view._locate_changed(screen, gate)  # noqa: SLF001
+        if coords is None:
+            return None
+        x1, y1, x2, y2 = coords
+        return x1 * factor, y1 * factor, x2 * factor, y2 * factor
+
+    def _reduced_view(self, factor: int) -> ShadowstepImage:
+        """Copy of this image with the template and search region shrunk by factor."""
+        view = self._reduced_views.get(factor)
+        if view is None:
+            template = self._load_template(self._image, self._template_key)
+            height, width = template.shape[:2]
+            view = copy.copy(self)
+            view._image = cv2.resize(  # noqa: SLF001
+                template,
+                (max(1, width // factor), max(1, height // factor)),
+                interpolation=cv2.INTER_AREA,
+            )
+            view.__dict__.pop("_template_key", None)
+            view._reduced_views = {}  # noqa: SLF001
+            self._reduced_views[factor] = view
+        view.threshold = self.threshold
+        view.matcher = self.matcher
+        view.region = self._reduced_region(factor)
+        view._coords = cast(  # noqa: SLF001
+            "tuple[int, int, int, int]",
+            None if self._coords is None else tuple(value // factor for value in self._coords),  # type: ignore[reportUnnecessaryComparison]
+        )
+        return view
 
-            # Check if match is good enough
-            if max_val < self.threshold:
-                self.logger.info(
-                    "Match quality %.3f below threshold %.3f",
-                    max_val,
-                    self.threshold,
-                )
+    def _reduced_region(self, factor: int) -> SearchRegion | None:
+        """Search region in the pixels of a screen reduced by factor."""
+        region = self.region
+        if isinstance(region, Element):
+            try:
+                region = cast("tuple[int, int, int, int]", tuple(region.get_coordinates()))
+            except Exception:  # noqa: BLE001
+                self.logger.warning("Cannot get bounds of region element, searching the whole screen")
                 return None
+        if region is None or region == LAST_LOCATION:
+            return region
+        if any(isinstance(value, float) for value in region):
+            return cast("tuple[float, float, float, float]", region)
+        x1, y1, x2, y2 = cast("tuple[int, int, int, int]", region)
+        return x1 // factor, y1 // factor, x2 // factor, y2 // factor
+
+    def _locate_changed(
+        self,
+        full_image: np.ndarray[Any, Any],
+        gate: ChangeGate,
+    ) -> tuple[int, int, int, int] | None:
+        """Find the image on a frame of a wait loop, matching only what changed.
+
+        An unchanged frame, or a frame changed only away from where the image was
+        found, keeps the previous result. If the image was not on the previous
+        frame, it can only have appeared where pixels changed, so only the changed
+        rect, widened by the largest scaled template, is searched.
+        """
+        rect = gate.changed_rect(full_image)
+        height, width = full_image.shape[:2]
+        previous = gate.coords
+        if rect is None or (previous is not None and not self._overlaps(rect, previous)):
+            gate.record(previous, matched=False)
+            return previous
+
+        if previous is None and rect != (0, 0, width, height):
+            margin = self._appear_margin()
+            x1, y1 = max(0, rect[0] - margin), max(0, rect[1] - margin)
+            x2, y2 = min(width, rect[2] + margin), min(height, rect[3] + margin)
+            device_key = self._device_key(full_image)
+            try:
+                coords = self._locate_in_rect(full_image[y1:y2, x1:x2], (x1, y1), device_key)
+            except Exception:
+                self.logger.exception("Error finding image coordinates")
+                coords = None
+        else:
+            coords = self._locate(full_image)
+        gate.record(coords, matched=True)
+        return coords
+
+    def _appear_margin(self) -> int:
+        """Pixels around a changed rect that a newly appeared image may extend over."""
+        template = self._load_template(self._image, self._template_key)
+        return int(max(template.shape[:2]) * float(MATCH_SCALES.max()))
+
+    @staticmethod
+    def _overlaps(first: tuple[int, int, int, int], second: tuple[int, int, int, int]) -> bool:
+        """Check whether two (x1, y1, x2, y2) rects intersect."""
+        return first[0] < second[2] and second[0] < first[2] and first[1] < second[3] and second[1] < first[3]
+
+    def _locate(
+        self,
+        full_image: np.ndarray[Any, Any],
+        *,
+        widen: bool = True,
+    ) -> tuple[int, int, int, int] | None:
+        """Find coordinates of the image on an already decoded grayscale screen.
 
-            # Calculate bounding box
-            template_height, template_width = template.shape[:2]
-            x1 = int(max_loc[0])
-            y1 = int(max_loc[1])
-            x2 = x1 + template_width
-            y2 = y1 + template_height
+        The search region, if any, is searched first; the whole screen is searched
+        only if the image is not found there and widen is set.
+
+        Args:
+            full_image: Grayscale screenshot to search in.
+            widen: Search the whole screen when the image is not in the region.
+
+        Returns:
+            tuple[int, int, int, int] | None: (x1, y1, x2, y2) if found, None otherwise.
 
+        """
+        try:
+            device_key = self._device_key(full_image)
+            rect = self._resolve_region(full_image)
+            if rect is not None:
+                x1, y1, x2, y2 = rect
+                coords = self._locate_in_rect(full_image[y1:y2, x1:x2], (x1, y1), device_key)
+                if coords is not None or not widen or rect == (0, 0, full_image.shape[1], full_image.shape[0]):
+                    return coords
+                self.logger.info("Image not found in region %s, searching the whole screen", rect)
+            return self._locate_in_rect(full_image, (0, 0), device_key)
         except Exception:
             self.logger.exception("Error finding image coordinates")
             return None
+
+    def _locate_in_rect(
+        self,
+        image: np.ndarray[Any, Any],
+        origin: tuple[int, int],
+        device_key: str,
+    ) -> tuple[int, int, int, int] | None:
+        """Match the template on a screen crop whose top-left corner is at origin."""
+        # Decoded once per process through the template cache
+        template = self._load_template(self._image, self._template_key)
+        if self.matcher is not None:
+            return self._locate_with_matcher(self.matcher, image, template, origin)
+
+        # Perform multi-scale matching
+        max_val, max_loc, scale = self._match_with_prior(image, template, self._template_key, device_key)
+        self.logger.info("Multi-scale matching: best_val=%.3f at %s, scale %.2f", max_val, max_loc, scale)
+
+        # Check if match is good enough
+        if max_val < self.threshold:
+            self.logger.info(
+                "Match quality %.3f below threshold %.3f",
+                max_val,
+                self.threshold,
+            )
+            return None
+
+        # Bounding box of the template at the scale it matched at
+        template_height, template_width = template.shape[:2]
+        x1 = origin[0] + int(max_loc[0])
+        y1 = origin[1] + int(max_loc[1])
+        return x1, y1, x1 + int(template_width * scale), y1 + int(template_height * scale)
+
+    def _locate_with_matcher(
+        self,
+        matcher: ImageMatcher,
+        image: np.ndarray[Any, Any],
+        template: np.ndarray[Any, Any],
+        origin: tuple[int, int],
+    ) -> tuple[int, int, int, int] | None:
+        """Match the template with a pluggable engine on a screen crop whose top-left corner is at origin."""
+        found = matcher.match(image, template, template_key=self._template_key)
+        if found is None or found[0] < self.threshold:
+            self.logger.info(
+                "%s match quality %.3f below threshold %.3f",
+                matcher.name,
+                0.0 if found is None else found[0],
+                self.threshold,
+            )
+            return None
+        x1, y1, x2, y2 = found[1]
+        return x1 + origin[0], y1 + origin[1], x2 + origin[0], y2 + origin[1]
+
+    def _resolve_region(self, full_image: np.ndarray[Any, Any]) -> tuple[int, int, int, int] | None:
+        """Turn the search region into a pixel rect clipped to the screen.
+
+        Returns:
+            tuple[int, int, int, int] | None: (x1, y1, x2, y2), or None to search
+                the whole screen.
+
+        """
+        region = self.region
+        height, width = full_image.shape[:2]
+        if region is None:
+            return None
+        if isinstance(region, Element):
+            try:
+                rect = region.get_coordinates()
+            except Exception:  # noqa: BLE001
+                self.logger.warning("Cannot get bounds of region element, searching the whole screen")
+                return None
+        elif isinstance(region, str):
+            if self._coords is None:  # type: ignore[reportUnnecessaryComparison]
+                return None
+            x1, y1, x2, y2 = self._coords
+            rect = (
+                x1 - LAST_LOCATION_MARGIN,
+                y1 - LAST_LOCATION_MARGIN,
+                x2 + LAST_LOCATION_MARGIN,
+                y2 + LAST_LOCATION_MARGIN,
+            )
+        elif any(isinstance(value, float) for value in region):
+            rect = (
+                int(region[0] * width),
+                int(region[1] * height),
+                int(region[2] * width),
+                int(region[3] * height),
+            )
         else:
-            return x1, y1, x2, y2
+            rect = cast("tuple[int, int, int, int]", region)
+        x1, y1 = max(0, int(rect[0])), max(0, int(rect[1]))
+        x2, y2 = min(width, int(rect[2])), min(height, int(rect[3]))
+        if x2 <= x1 or y2 <= y1:
+            self.logger.warning("Search region %s is outside the screen, searching the whole screen", rect)
+            return None
+        return x1, y1, x2, y2
+
+    def _get_frame_source(self) -> FrameSource | None:
+        """Frame source of visual waits, None to use driver screenshots."""
+        return self.frame_source or get_default_frame_source()
+
+    def _visibility_probe(self) -> tuple[Callable[[], tuple[int, int, int, int] | None], float]:
+        """Return a function locating the image on the current screen and its poll interval.
+
+        Polls share a change gate, so a frame identical to the previous one is not
+        matched again and a changed one is matched only where it changed. Stream
+        frames may be scaled down, so callers take coordinates from a screenshot
+        once the image is seen. Frames captured before the probe was made are
+        not used, as actions sent straight to the driver do not invalidate them.
+        """
+        gate = ChangeGate()
+        factor = self._match_reduction()
+        source = self._get_frame_source()
+        if source is None:
+            return partial(self._get_image_coordinates, gate), WAIT_POLL_FREQUENCY
+        started = time.monotonic()
+
+        def probe() -> tuple[int, int, int, int] | None:
+            try:
+                frame = source.read(newer_than=started, timeout=self.timeout)
+            except ShadowstepFrameSourceError:
+                self.logger.warning("No frame from %s, checking with a screenshot", source)
+                return self._get_image_coordinates(gate)
+            return self._locate_reduced(frame.reduced_gray(factor), factor, gate)
+
+        return probe, source.poll_interval
 
     @staticmethod
     def _calculate_center(coords: tuple[int, int, int, int]) -> tuple[int, int]:
@@ -1022,46 +1743,137 @@ class ShadowstepImage:
             ShadowstepImage: Instance for call chaining.
 
         Raises:
-            ShadowstepImageNotFoundError: Raised when the image is not found after max_attempts.
+            ShadowstepImageNotFoundError: Raised when the image is not found after max_attempts,
+                or earlier once a swipe no longer moves the content.
 
         """
+        source = self._get_frame_source()
+        tracker = ScrollTracker(direction)
+        size: dict[str, int] | None = None
+        scrolled_at: float | None = None
+        attempts = 0
         for attempt in range(max_attempts):
-            # Check if image is visible
-            if self.is_visible():
+            found, moved = self._check_scrolled(source, tracker, scrolled_at)
+            if found:
                 self.logger.info("Image found after %d scroll attempts", attempt)
                 return self
+            if not moved:
+                self.logger.info("Screen unchanged after scrolling %s, end of content reached", direction)
+                break
 
-            # Perform scroll
-            self._perform_scroll(direction, from_percent, to_percent)
+            # Window size is fetched once per scroll loop
+            size = self._perform_scroll(direction, from_percent, to_percent, size)
+            attempts += 1
 
-            # Wait before next attempt
+            # Wait before next attempt; streamed frames from before the screen settled are skipped
             time.sleep(step_delay)
+            scrolled_at = time.monotonic()
 
         # Not found after all attempts
         self.logger.error("Image not found after scroll attempts")
         raise ShadowstepImageNotFoundError(
             threshold=self.threshold,
             timeout=self.timeout,
-            operation=f"{max_attempts} scroll attempts ({direction})",
+            operation=f"{attempts} scroll attempts ({direction})",
         )
 
+    def _check_scrolled(
+        self,
+        source: FrameSource | None,
+        tracker: ScrollTracker,
+        scrolled_at: float | None,
+    ) -> tuple[bool, bool]:
+        """Look for the image on the first frame after a scroll.
+
+        Only the band the scroll revealed is matched: the rest of the frame was
+        searched before the swipe, just at another offset. Coordinates found on a
+        streamed frame are confirmed by a screenshot.
+
+        Args:
+            source: Frame source of the scroll loop, None to use screenshots.
+            tracker: Tracker holding the frame checked before the swipe.
+            scrolled_at: time.monotonic() of the last swipe, None before the first.
+
+        Returns:
+            tuple[bool, bool]: Whether the image was found, and whether the content
+                moved since the previous check.
+
+        """
+        factor = self._match_reduction()
+        try:
+            screen, streamed = self._scroll_frame(source, scrolled_at, factor)
+            view = self if factor == 1 else self._reduced_view(factor)
+            margin = view._appear_margin()  # noqa: SLF001
+        except Exception as error:  # noqa: BLE001
+            self.logger.warning("Cannot read the screen (%s), checking visibility with a screenshot", error)
+            return self.is_visible(), True
+
+        moved, band = tracker.step(screen, margin, 1 / factor)
+        if not moved:
+            return False, False
+        if band is None or self.region is not None:
+            coords = self._locate_reduced(screen, factor)
+        else:
+            x1, y1, x2, y2 = band
+            try:
+                coords = view._locate_in_rect(screen[y1:y2, x1:x2], (x1, y1), view._device_key(screen))  # noqa: SLF001
+            except Exception:
+                self.logger.exception("Error finding image coordinates")
+                coords = None
+            if coords is not None:
+                coords = cast("tuple[int, int, int, int]", tuple(value * factor for value in coords))
+        if coords is None:
+            return False, True
+        if streamed:
+            return self.is_visible(), True
+        self._coords = coords
+        self._center = self._calculate_center(coords)
+        return True, True
+
+    def _scroll_frame(
+        self,
+        source: FrameSource | None,
+        scrolled_at: float | None,
+        factor: int,
+    ) -> tuple[np.ndarray[Any, Any], bool]:
+        """Grayscale frame at 1/factor resolution, and whether it came from a stream rather than a screenshot."""
+        if source is not None:
+            try:
+                return source.read(newer_than=scrolled_at, timeout=self.timeout).reduced_gray(factor), True
+            except ShadowstepFrameSourceError:
+                self.logger.warning("No frame from %s, checking with a screenshot", source)
+        screenshot = self._get_screenshot_as_bytes()
+        frame = frame_cache.find(screenshot)
+        if frame is not None:
+            return frame.reduced_gray(factor), False
+        if factor == 1:
+            return self.to_ndarray(screenshot, grayscale=True), False
+        return decode_reduced_gray(screenshot, factor), False
+
     def _perform_scroll(
         self,
         direction: str,
         from_percent: float = 0.5,
         to_percent: float = 0.1,
-    ) -> None:
+        size: dict[str, int] | None = None,
+    ) -> dict[str, int]:
         """Perform a single scroll gesture.
 
         Args:
             direction: "up", "down", "left", or "right".
             from_percent: Starting position as percentage of screen dimension.
             to_percent: Ending position as percentage of screen dimension.
+            size: Window size returned by a previous scroll, None to ask the driver.
+
+        Returns:
+            dict[str, int]: Window size the gesture was computed from.
 
         """
         # Get screen dimensions
-        width = int(self.shadowstep.driver.get_window_size()["width"])  # type: ignore[reportUnknownMemberType]
-        height = int(self.shadowstep.driver.get_window_size()["height"])  # type: ignore[reportUnknownMemberType]
+        if size is None:
+            size = cast("dict[str, int]", self.shadowstep.driver.get_window_size())  # type: ignore[reportUnknownMemberType]
+        width = int(size["width"])
+        height = int(size["height"])
 
         # Calculate scroll coordinates based on direction
         if direction == "down":
@@ -1092,6 +1904,7 @@ class ShadowstepImage:
 
         # Perform swipe
         self.shadowstep.driver.swipe(start_x, start_y, end_x, end_y, duration=500)
+        frame_cache.invalidate()
         self.logger.info(
             "Scrolled %s: (%d,%d) -> (%d,%d)",
             direction,
@@ -1100,11 +1913,14 @@ class ShadowstepImage:
             end_x,
             end_y,
         )
+        return size
 
     def _multi_scale_matching_raw(
         self,
         full_image: np.ndarray[Any, Any],
         template_image: np.ndarray[Any, Any],
+        *,
+        template_key: str | None = None,
     ) -> np.ndarray[Any, Any] | None:
         """Perform multi-scale matching and return raw result matrix.
 
@@ -1113,6 +1929,7 @@ class ShadowstepImage:
         Args:
             full_image: Full image to search in.
             template_image: Template to search for.
+            template_key: Template cache key for reusing resized templates.
 
         Returns:
             np.ndarray | None: Raw matching result matrix or None if no valid matches.
@@ -1120,15 +1937,7 @@ class ShadowstepImage:
         """
         origin_width, origin_height = template_image.shape[::-1]
 
-        # Try multiple scales
-        scales = np.concatenate(
-            [
-                np.linspace(0.2, 1.0, 10)[::-1],
-                np.linspace(1.1, 2.0, 10),
-            ],
-        )
-
-        for scale in scales:
+        for scale in MATCH_SCALES:
             new_width = int(origin_width * scale)
             new_height = int(origin_height * scale)
 
@@ -1136,10 +1945,10 @@ class ShadowstepImage:
             if new_height > full_image.shape[0] or new_width > full_image.shape[1]:
                 continue
 
-            resized_template = cv2.resize(template_image, (new_width, new_height))
+            resized_template = self._resize_template(template_image, (new_width, new_height), template_key)
 
             try:
-                result = cv2.matchTemplate(full_image, resized_template, cv2.TM_CCOEFF_NORMED)
+                result = self._match_template(full_image, resized_template, tiled=True)
                 _, max_val, _, _ = cv2.minMaxLoc(result)
 
                 if max_val > self.threshold:
@@ -0,0 +1,119 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+"""Cache of image match results on the current frame.
+
+Assertions and actions running against one screen (is_visible(), coordinates,
+center, should.*) each call the matcher on the same captured frame. Results are
+kept per (frame digest, template digest, threshold, search region, ...) key,
+including "not found", so repeated checks of an unchanged frame return at once.
+The cache only holds results of the latest frame: a lookup or store with
+another frame digest drops them all.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+logger = logging.getLogger(__name__)
+
+# Match results kept for the current frame
+DEFAULT_MATCH_CACHE_ENTRIES = 256
+
+# Coordinates found, or None if the image was not on the frame
+MatchResult = Optional[tuple[int, int, int, int]]
+
+
+class MatchCache:
+    """Bounded LRU cache of match results on the latest frame."""
+
+    def __init__(self, max_entries: int = DEFAULT_MATCH_CACHE_ENTRIES) -> None:
+        """Initialize the MatchCache.
+
+        Args:
+            max_entries: Number of match results kept; 0 disables the cache.
+
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._frame: str | None = None
+        self._entries: OrderedDict[Hashable, MatchResult] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache, 0.0 before any lookup."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, frame: str, key: Hashable) -> tuple[bool, MatchResult]:
+        """Look up the result of a match on a frame.
+
+        Args:
+            frame: Content digest of the frame.
+            key: Template, threshold, region and other match parameters.
+
+        Returns:
+            tuple[bool, MatchResult]: Whether a result was cached, and the result.
+
+        """
+        with self._lock:
+            self._switch_frame(frame)
+            if key not in self._entries:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, self._entries[key]
+
+    def put(self, frame: str, key: Hashable, result: MatchResult) -> None:
+        """Cache the result of a match on a frame, evicting the least recently used ones."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._switch_frame(frame)
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, float]:
+        """Return hits, misses, hit rate and the number of cached results."""
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate, "entries": len(self)}
+
+    def invalidate(self) -> None:
+        """Drop cached results, keeping statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._frame = None
+
+    def clear(self) -> None:
+        """Drop cached results and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._frame = None
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached results."""
+        return len(self._entries)
+
+    def _switch_frame(self, frame: str) -> None:
+        """Forget results of an older frame; called with the lock held."""
+        if frame != self._frame:
+            if self._entries:
+                logger.debug("Frame changed, dropping %d cached match results", len(self._entries))
+            self._entries.clear()
+            self._frame = frame
+
+
+match_cache = MatchCache()
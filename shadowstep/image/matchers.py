@@ -0,0 +1,221 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+"""Pluggable matching engines for ShadowstepImage.
+
+ShadowstepImage matches templates with multi-scale normalized cross-correlation
+by default. That finds pixel-exact icons quickly but fails on icons that are
+rotated, stretched or partly covered. FeatureMatcher instead detects keypoints
+(ORB, AKAZE or SIFT) on the template and the screen, pairs their descriptors
+and fits a homography with RANSAC, which tolerates rotation, perspective, any
+scale and occlusion of part of the template. Template keypoints are computed
+once per template and the keypoints of the last screen are reused, so several
+templates searched on one screenshot detect screen features once.
+
+Custom engines implement ImageMatcher and are passed as
+ShadowstepImage(..., matcher=...).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+import cv2
+import numpy as np
+
+from shadowstep.exceptions.shadowstep_exceptions import ShadowstepUnsupportedMatcherError
+
+logger = logging.getLogger(__name__)
+
+# Feature detectors FeatureMatcher can use, with the descriptor distance each needs
+FEATURE_DETECTORS = {
+    "orb": cv2.NORM_HAMMING,
+    "akaze": cv2.NORM_HAMMING,
+    "sift": cv2.NORM_L2,
+}
+# Lowe's ratio test: best descriptor match must be this much closer than the second best
+DEFAULT_RATIO = 0.75
+# Fewest RANSAC inliers accepted as a match
+DEFAULT_MIN_INLIERS = 8
+# Keypoints kept per screen
+DEFAULT_MAX_FEATURES = 5000
+# Largest reprojection error, in pixels, of a RANSAC inlier
+RANSAC_REPROJECTION_THRESHOLD = 5.0
+# Pixels of reflected border added around templates so keypoints near their edges get descriptors
+TEMPLATE_BORDER = 32
+# Templates whose keypoints are kept
+DEFAULT_FEATURE_CACHE_ENTRIES = 128
+# Minimum matches for the homography fit
+MIN_HOMOGRAPHY_POINTS = 4
+
+# (points, descriptors) of an image
+Features = tuple[np.ndarray[Any, Any], np.ndarray[Any, Any] | None]
+
+
+class ImageMatcher(ABC):
+    """Locates a template on a screen."""
+
+    # Name shown in logs and benchmarks
+    name: str = "custom"
+
+    @abstractmethod
+    def match(
+        self,
+        image: np.ndarray[Any, Any],
+        template: np.ndarray[Any, Any],
+        *,
+        template_key: str | None = None,
+    ) -> tuple[float, tuple[int, int, int, int]] | None:
+        """Find the template on a grayscale screen.
+
+        Args:
+            image: Grayscale screen or screen crop.
+            template: Grayscale template.
+            template_key: Content hash of the template, to cache work done on it.
+
+        Returns:
+            tuple[float, tuple[int, int, int, int]] | None: Match score (0-1)
+                compared with the image threshold and the (x1, y1, x2, y2) box in
+                image pixels, or None if nothing plausible was found.
+
+        """
+
+
+class FeatureMatcher(ImageMatcher):
+    """Keypoint matching with a RANSAC homography."""
+
+    def __init__(
+        self,
+        detector: str = "orb",
+        *,
+        ratio: float = DEFAULT_RATIO,
+        min_inliers: int = DEFAULT_MIN_INLIERS,
+        max_features: int = DEFAULT_MAX_FEATURES,
+    ) -> None:
+        """Initialize the FeatureMatcher.
+
+        Args:
+            detector: "orb", "akaze" or "sift". AKAZE is missing from some OpenCV builds.
+            ratio: Lowe's ratio test threshold.
+            min_inliers: Fewest homography inliers accepted as a match.
+            max_features: Keypoints kept per screen (ORB and SIFT).
+
+        Raises:
+            ShadowstepUnsupportedMatcherError: If the detector is unknown or unavailable.
+
+        """
+        factory = getattr(cv2, f"{detector.upper()}_create", None) if detector in FEATURE_DETECTORS else None
+        if factory is None:
+            available = [name for name in FEATURE_DETECTORS if hasattr(cv2, f"{name.upper()}_create")]
+            raise ShadowstepUnsupportedMatcherError(detector=detector, available=available)
+        self.name = detector
+        self.ratio = ratio
+        self.min_inliers = min_inliers
+        self.max_features = max_features
+        self._factory = factory
+        self._norm = FEATURE_DETECTORS[detector]
+        self._templates: OrderedDict[str, Features] = OrderedDict()
+        self._screen: tuple[str, Features] | None = None
+        self._lock = threading.Lock()
+
+    def match(
+        self,
+        image: np.ndarray[Any, Any],
+        template: np.ndarray[Any, Any],
+        *,
+        template_key: str | None = None,
+    ) -> tuple[float, tuple[int, int, int, int]] | None:
+        """Find the template by keypoints; the score is the share of matches consistent with the homography."""
+        template_points, template_descriptors = self._template_features(template, template_key)
+        screen_points, screen_descriptors = self._screen_features(image)
+        if template_descriptors is None or screen_descriptors is None or len(screen_points) < self.min_inliers:
+            return None
+
+        pairs = cv2.BFMatcher(self._norm).knnMatch(template_descriptors, screen_descriptors, k=2)
+        good = [pair[0] for pair in pairs if len(pair) == 2 and pair[0].distance < self.ratio * pair[1].distance]  # noqa: PLR2004
+        if len(good) < max(self.min_inliers, MIN_HOMOGRAPHY_POINTS):
+            return None
+        source = np.array([template_points[m.queryIdx] for m in good], dtype=np.float32).reshape(-1, 1, 2)
+        destination = np.array([screen_points[m.trainIdx] for m in good], dtype=np.float32).reshape(-1, 1, 2)
+        homography, mask = cv2.findHomography(source, destination, cv2.RANSAC, RANSAC_REPROJECTION_THRESHOLD)
+        if homography is None or mask is None:  # type: ignore[reportUnnecessaryComparison]
+            return None
+        inliers = int(mask.sum())
+        if inliers < self.min_inliers:
+            return None
+        box = self._project_box(homography, template.shape[:2], image.shape[:2])
+        return None if box is None else (inliers / len(good), box)
+
+    @staticmethod
+    def _project_box(
+        homography: np.ndarray[Any, Any],
+        template_shape: tuple[int, ...],
+        image_shape: tuple[int, ...],
+    ) -> tuple[int, int, int, int] | None:
+        """Bounding box of the template outline mapped onto the screen, None if the mapping is degenerate."""
+        height, width = template_shape
+        corners = np.array([[0, 0], [width, 0], [width, height], [0, height]], dtype=np.float32).reshape(-1, 1, 2)
+        projected = cv2.perspectiveTransform(corners, homography)
+        if not cv2.isContourConvex(projected.astype(np.int32)) or cv2.contourArea(projected) < 1:
+            return None
+        x1, y1 = (int(value) for value in np.floor(projected.min(axis=(0, 1))))
+        x2, y2 = (int(value) for value in np.ceil(projected.max(axis=(0, 1))))
+        box = (max(0, x1), max(0, y1), min(image_shape[1], x2), min(image_shape[0], y2))
+        if box[2] <= box[0] or box[3] <= box[1]:
+            return None
+        return box
+
+    def clear(self) -> None:
+        """Drop cached template and screen keypoints."""
+        with self._lock:
+            self._templates.clear()
+            self._screen = None
+
+    def _detect(self, image: np.ndarray[Any, Any]) -> Features:
+        """Detect keypoints; a detector per call, as OpenCV detectors are not thread-safe."""
+        detector = self._factory(self.max_features) if self.name in {"orb", "sift"} else self._factory()
+        keypoints, descriptors = detector.detectAndCompute(image, None)
+        points = np.array([keypoint.pt for keypoint in keypoints], dtype=np.float32).reshape(-1, 2)
+        return points, descriptors
+
+    def _template_features(self, template: np.ndarray[Any, Any], key: str | None) -> Features:
+        """Keypoints of a template in template pixels, computed once per template key."""
+        if key is not None:
+            with self._lock:
+                cached = self._templates.get(key)
+                if cached is not None:
+                    self._templates.move_to_end(key)
+                    return cached
+        border = TEMPLATE_BORDER
+        padded = cv2.copyMakeBorder(template, border, border, border, border, cv2.BORDER_REFLECT_101)
+        points, descriptors = self._detect(padded)
+        points -= border
+        height, width = template.shape[:2]
+        inside = (points[:, 0] >= 0) & (points[:, 1] >= 0) & (points[:, 0] < width) & (points[:, 1] < height)
+        features: Features = (points[inside], descriptors[inside] if descriptors is not None else None)
+        if key is not None:
+            with self._lock:
+                self._templates[key] = features
+                while len(self._templates) > DEFAULT_FEATURE_CACHE_ENTRIES:
+                    self._templates.popitem(last=False)
+        return features
+
+    def _screen_features(self, image: np.ndarray[Any, Any]) -> Features:
+        """Keypoints of a screen, reused while the same pixels are searched."""
+        array = np.ascontiguousarray(image)
+        digest = hashlib.blake2b(f"{array.shape}".encode(), digest_size=16)
+        digest.update(array.data)
+        key = digest.hexdigest()
+        with self._lock:
+            if self._screen is not None and self._screen[0] == key:
+                return self._screen[1]
+        features = self._detect(array)
+        with self._lock:
+            self._screen = (key, features)
+        return features
@@ -0,0 +1,74 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+"""Thread pool for parallel template matching.
+
+cv2.matchTemplate releases the GIL, so independent template scales and
+horizontal tiles of a large screen can be matched on several cores at once.
+The pool is process-wide and disabled by default; enable it with
+set_matching_workers. Results are always reduced in submission order, so
+parallel matching returns the same match as the sequential one. Code running
+on a pool thread sees no pool, so nested matching runs sequentially instead of
+waiting on its own workers.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_workers = 0
+_local = threading.local()
+
+
+def _mark_worker() -> None:
+    """Flag the current thread as a matching pool worker."""
+    _local.worker = True
+
+
+def set_matching_workers(workers: int | None) -> None:
+    """Configure the number of threads used for template matching.
+
+    Args:
+        workers: Number of threads. None uses one thread per CPU core;
+            0 or 1 disables parallel matching.
+
+    """
+    global _executor, _workers  # noqa: PLW0603
+    if workers is None:
+        workers = os.cpu_count() or 1
+    with _lock:
+        if workers == _workers:
+            return
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+        _executor = (
+            ThreadPoolExecutor(
+                max_workers=workers,
+                thread_name_prefix="shadowstep-match",
+                initializer=_mark_worker,
+            )
+            if workers > 1
+            else None
+        )
+        _workers = workers if workers > 1 else 0
+    logger.info("Template matching workers: %d", _workers)
+
+
+def get_matching_pool() -> ThreadPoolExecutor | None:
+    """Return the matching thread pool, or None when disabled or called from a pool worker."""
+    if getattr(_local, "worker", False):
+        return None
+    return _executor
+
+
+def get_matching_workers() -> int:
+    """Return the number of matching threads, 0 when parallel matching is disabled."""
+    return _workers
@@ -0,0 +1,230 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+"""Text recognition on screenshots with Tesseract.
+
+Canvas, game and Flutter screens often have no accessibility tree, so their
+buttons can only be found by the text drawn on them. read_words runs Tesseract
+(through pytesseract) on a downscaled, normalized grayscale copy of the screen
+and maps the word boxes back to screen pixels. Results are cached by the hash
+of the searched pixels, so several text lookups on one screen run OCR once.
+find_phrase then finds one- or multi-word phrases among the words of a line.
+
+The tesseract binary must be installed and on PATH.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import string
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import cv2
+import numpy as np
+import pytesseract  # type: ignore[import-untyped]
+
+logger = logging.getLogger(__name__)
+
+# Tesseract language used when none is given
+DEFAULT_OCR_LANG = "eng"
+# Screen scale OCR runs at; phone text stays well above Tesseract's minimum size at half resolution
+OCR_SCALE = 0.5
+# Page segmentation mode 11: sparse text, as on app screens, in no particular order
+OCR_CONFIG = "--psm 11"
+# Recognized word boxes cached, one entry per searched screen area
+DEFAULT_OCR_CACHE_ENTRIES = 32
+# Mean gray level below which the screen is treated as light text on a dark background
+DARK_BACKGROUND_LEVEL = 128
+
+# Punctuation ignored around words, with typographic quotes and ellipsis
+_PUNCTUATION = string.punctuation + "\u2026\u00ab\u00bb\u201c\u201d\u2018\u2019"
+
+
+@dataclass(frozen=True)
+class TextBox:
+    """Word recognized on the screen."""
+
+    text: str
+    confidence: float
+    coordinates: tuple[int, int, int, int]
+    line: tuple[int, int, int]
+
+    @property
+    def center(self) -> tuple[int, int]:
+        """Center of the word box."""
+        x1, y1, x2, y2 = self.coordinates
+        return (x1 + x2) // 2, (y1 + y2) // 2
+
+
+class OcrCache:
+    """Bounded LRU cache of recognized words keyed by screen content hash."""
+
+    def __init__(self, max_entries: int = DEFAULT_OCR_CACHE_ENTRIES) -> None:
+        """Initialize the OcrCache.
+
+        Args:
+            max_entries: Number of recognized screen areas kept.
+
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str, float], tuple[TextBox, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str, float]) -> tuple[TextBox, ...] | None:
+        """Return the words cached for a (digest, lang, scale) key, counting hits and misses."""
+        with self._lock:
+            words = self._entries.get(key)
+            if words is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return words
+
+    def put(self, key: tuple[str, str, float], words: tuple[TextBox, ...]) -> None:
+        """Cache the words of a screen area, evicting the least recently used ones."""
+        with self._lock:
+            self._entries[key] = words
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached words and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached screen areas."""
+        return len(self._entries)
+
+
+ocr_cache = OcrCache()
+
+
+def preprocess(image: np.ndarray[Any, Any], scale: float = OCR_SCALE) -> np.ndarray[Any, Any]:
+    """Prepare a grayscale screen for Tesseract.
+
+    The screen is downscaled and, when it is mostly dark, inverted, since
+    Tesseract reads dark text on a light background best.
+
+    Args:
+        image: Grayscale screen or screen area.
+        scale: Resize factor, 1.0 keeps the original size.
+
+    Returns:
+        np.ndarray: Image to run OCR on.
+
+    """
+    if scale != 1.0:
+        height, width = image.shape[:2]
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+    if float(np.mean(image)) < DARK_BACKGROUND_LEVEL:
+        image = cv2.bitwise_not(image)
+    return image
+
+
+def read_words(
+    image: np.ndarray[Any, Any],
+    *,
+    lang: str = DEFAULT_OCR_LANG,
+    scale: float = OCR_SCALE,
+) -> tuple[TextBox, ...]:
+    """Recognize the words on a grayscale screen, using the OCR cache.
+
+    Args:
+        image: Grayscale screen or screen area.
+        lang: Tesseract language, e.g. "eng" or "eng+rus".
+        scale: Resize factor applied before OCR.
+
+    Returns:
+        tuple[TextBox, ...]: Words with boxes in the pixels of image.
+
+    """
+    array = np.ascontiguousarray(image)
+    digest = hashlib.blake2b(f"{array.shape}".encode(), digest_size=16)
+    digest.update(array.data)
+    key = (digest.hexdigest(), lang, scale)
+    words = ocr_cache.get(key)
+    if words is not None:
+        return words
+
+    data: dict[str, list[Any]] = pytesseract.image_to_data(  # type: ignore[reportUnknownMemberType]
+        preprocess(array, scale),
+        lang=lang,
+        config=OCR_CONFIG,
+        output_type=pytesseract.Output.DICT,
+    )
+    found: list[TextBox] = []
+    for index, text in enumerate(data["text"]):
+        confidence = float(data["conf"][index])
+        if not str(text).strip() or confidence < 0:
+            continue
+        x1 = int(data["left"][index] / scale)
+        y1 = int(data["top"][index] / scale)
+        x2 = int((data["left"][index] + data["width"][index]) / scale)
+        y2 = int((data["top"][index] + data["height"][index]) / scale)
+        line = (int(data["block_num"][index]), int(data["par_num"][index]), int(data["line_num"][index]))
+        found.append(TextBox(str(text).strip(), confidence / 100, (x1, y1, x2, y2), line))
+    words = tuple(found)
+    ocr_cache.put(key, words)
+    logger.debug("Recognized %d words on %dx%d pixels", len(words), array.shape[1], array.shape[0])
+    return words
+
+
+def _normalize(word: str, *, exact: bool) -> str:
+    """Return a word as compared by find_phrase."""
+    return word if exact else word.strip(_PUNCTUATION).casefold()
+
+
+def find_phrase(
+    words: tuple[TextBox, ...] | list[TextBox],
+    phrase: str,
+    *,
+    exact: bool = False,
+    min_confidence: float = 0.0,
+) -> list[tuple[int, int, int, int]]:
+    """Find a phrase among consecutive words of one line.
+
+    Args:
+        words: Words returned by read_words.
+        phrase: Text to find; several words must follow each other on a line.
+        exact: Compare case and punctuation as well.
+        min_confidence: Lowest confidence (0-1) accepted for every word of a match.
+
+    Returns:
+        list[tuple[int, int, int, int]]: (x1, y1, x2, y2) box of each match, top to bottom.
+
+    """
+    wanted = [_normalize(token, exact=exact) for token in phrase.split()]
+    if not wanted:
+        return []
+    lines: dict[tuple[int, int, int], list[TextBox]] = {}
+    for word in words:
+        lines.setdefault(word.line, []).append(word)
+
+    boxes: list[tuple[int, int, int, int]] = []
+    for line in lines.values():
+        for start in range(len(line) - len(wanted) + 1):
+            window = line[start:start + len(wanted)]
+            if all(
+                _normalize(word.text, exact=exact) == token and word.confidence >= min_confidence
+                for word, token in zip(window, wanted)
+            ):
+                boxes.append((
+                    min(word.coordinates[0] for word in window),
+                    min(word.coordinates[1] for word in window),
+                    max(word.coordinates[2] for word in window),
+                    max(word.coordinates[3] for word in window),
+                ))
+    return sorted(boxes, key=lambda box: (box[1], box[0]))
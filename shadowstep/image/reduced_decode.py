@@ -0,0 +1,79 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+"""Reduced-resolution screenshot decoding for visibility checks.
+
+On 1440p devices most of the CPU of a visual wait goes to matching templates
+over the full screen, and to converting the decoded color screenshot to
+grayscale. With a match reduction of 2 or 4, visibility checks decode frames
+straight to a grayscale image at 1/2 or 1/4 of the size
+(cv2.IMREAD_REDUCED_GRAYSCALE_*), match templates shrunk by the same factor and
+map the found coordinates back to device pixels. The saving is in matching,
+which scans 4 or 16 times fewer pixels: Appium screenshots are PNG, which is
+still decoded in full and downsampled afterwards. Only JPEG frames, such as
+those of an MJPEG stream, are decoded at the reduced DCT size and so also
+decode faster. Small icons lose detail at 1/4, so the reduction is off by
+default.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import cv2
+import numpy as np
+
+from shadowstep.exceptions.shadowstep_exceptions import ShadowstepImageLoadError
+
+logger = logging.getLogger(__name__)
+
+# Supported reductions and the imdecode flag of each
+REDUCED_GRAYSCALE_FLAGS = {
+    1: cv2.IMREAD_GRAYSCALE,
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+
+_reduction = 1
+
+
+def set_match_reduction(factor: int) -> None:
+    """Configure the resolution visibility checks match at.
+
+    Args:
+        factor: 1 matches at full resolution, 2, 4 or 8 divide both screen sides.
+
+    Raises:
+        ValueError: If factor is not 1, 2, 4 or 8.
+
+    """
+    global _reduction  # noqa: PLW0603
+    if factor not in REDUCED_GRAYSCALE_FLAGS:
+        msg = f"Match reduction must be one of {sorted(REDUCED_GRAYSCALE_FLAGS)}, got {factor}"
+        raise ValueError(msg)
+    _reduction = factor
+    logger.info("Visibility checks match at 1/%d resolution", factor)
+
+
+def get_match_reduction() -> int:
+    """Return the resolution divisor of visibility checks, 1 for full resolution."""
+    return _reduction
+
+
+def decode_reduced_gray(data: bytes, factor: int) -> np.ndarray[Any, Any]:
+    """Decode an encoded screenshot to grayscale with both sides divided by factor.
+
+    JPEG data is decoded at the reduced size directly; PNG data is decoded in
+    full and downsampled by the decoder.
+
+    Raises:
+        ShadowstepImageLoadError: If the data cannot be decoded.
+
+    """
+    image = cv2.imdecode(np.frombuffer(data, np.uint8), REDUCED_GRAYSCALE_FLAGS[factor])
+    if image is None:  # type: ignore[reportUnnecessaryComparison]
+        raise ShadowstepImageLoadError(path="<screenshot>")
+    return image
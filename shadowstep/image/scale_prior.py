@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+"""Learned template scale per device.
+
+The scale at which a template matches depends on the screen density of the
+device and on the resolution the template was captured at, so it rarely changes
+between searches. Multi-scale matching records the winning scale for each
+(device, template) pair here and tries it first next time. Scales can be saved
+to and loaded from a JSON file to survive between test runs.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class ScalePrior:
+    """Winning template scale per (device, template) pair."""
+
+    def __init__(self) -> None:
+        """Initialize an empty ScalePrior."""
+        self.hits = 0
+        self.misses = 0
+        self._scales: dict[tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, device: str, template: str) -> float | None:
+        """Return the last winning scale of a template on a device."""
+        with self._lock:
+            return self._scales.get((device, template))
+
+    def record(self, device: str, template: str, scale: float) -> None:
+        """Remember the scale a template was found at on a device."""
+        with self._lock:
+            self._scales[device, template] = float(scale)
+
+    def record_outcome(self, *, hit: bool) -> None:
+        """Count whether trying the remembered scale first found the template."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def forget(self, device: str, template: str) -> None:
+        """Drop the remembered scale of a template on a device."""
+        with self._lock:
+            self._scales.pop((device, template), None)
+
+    def clear(self) -> None:
+        """Drop all remembered scales and reset statistics."""
+        with self._lock:
+            self._scales.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def save(self, path: str | Path) -> None:
+        """Write remembered scales to a JSON file."""
+        with self._lock:
+            records = [
+                {"device": device, "template": template, "scale": scale}
+                for (device, template), scale in self._scales.items()
+            ]
+        Path(path).write_text(json.dumps(records, indent=2), encoding="utf-8")
+
+    def load(self, path: str | Path) -> None:
+        """Load scales saved by save, replacing remembered ones for the same pairs."""
+        records: list[dict[str, str | float]] = json.loads(Path(path).read_text(encoding="utf-8"))
+        with self._lock:
+            for record in records:
+                self._scales[str(record["device"]), str(record["template"])] = float(record["scale"])
+        logger.debug("Loaded %d template scales from %s", len(records), path)
+
+    def __len__(self) -> int:
+        """Return the number of remembered scales."""
+        return len(self._scales)
+
+
+scale_prior = ScalePrior()
@@ -0,0 +1,161 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+"""Alignment of consecutive frames of a scroll-to-image loop.
+
+After every swipe scroll_to() looks at the screen again, and most of it shows
+content the previous check already searched, only moved by the scroll. The
+offset actually scrolled differs from the swipe length (touch slop, fling,
+list edges), so ScrollTracker measures it: a strip from the middle of the new
+frame is located in the previous frame, both shrunk to ALIGN_WIDTH pixels
+across. The band the scroll revealed, widened by the largest scaled template
+so that an image cut by the edge of the previous frame is found whole, is then
+the only part of the frame that needs matching.
+
+A frame that does not differ from the previous one outside the volatile areas
+(the fingerprint masks: status bar clock, notifications) means the swipe no
+longer moves the content, i.e. its end was reached.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+import cv2
+import numpy as np
+
+from shadowstep.image.change_gate import ChangeGate
+from shadowstep.image.fingerprint import blank_masked
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from shadowstep.image.fingerprint import FingerprintMask
+
+logger = logging.getLogger(__name__)
+
+# Frames are aligned at this many pixels across the scroll axis
+ALIGN_WIDTH = 180
+# Part of the frame along the scroll axis the aligned strip is taken from
+STRIP_SPAN = (0.4, 0.6)
+# Part of the frame across the scroll axis the aligned strip is taken from
+STRIP_CROSS = (0.1, 0.9)
+# TM_CCOEFF_NORMED score from which the strip offset is trusted
+MIN_ALIGN_SCORE = 0.9
+# Gray level deviation below which a strip is too plain to align
+MIN_STRIP_STD = 2.0
+
+
+class ScrollTracker:
+    """Remembers the previous frame of a scroll loop and what the last swipe revealed."""
+
+    def __init__(self, direction: str, masks: Sequence[FingerprintMask] | None = None) -> None:
+        """Initialize the ScrollTracker.
+
+        Args:
+            direction: Scroll direction: "up", "down", "left", or "right".
+            masks: Areas whose changes do not count as movement; None uses the
+                configured fingerprint masks.
+
+        """
+        self.direction = direction
+        self.vertical = direction in {"up", "down"}
+        self.masks = masks
+        # Pixels the content moved by between the last two frames along the scroll axis, None if unknown
+        self.offset: int | None = None
+        self._gate = ChangeGate()
+        self._small: np.ndarray[Any, Any] | None = None
+
+    def step(
+        self,
+        screen: np.ndarray[Any, Any],
+        margin: int,
+        scale: float = 1.0,
+    ) -> tuple[bool, tuple[int, int, int, int] | None]:
+        """Compare the frame after a swipe with the previous one.
+
+        Args:
+            screen: Grayscale frame.
+            margin: Pixels the band is widened by, the largest template side.
+            scale: Frame size relative to the device screen, for pixel masks.
+
+        Returns:
+            tuple[bool, tuple[int, int, int, int] | None]: Whether the content
+                moved, and the (x1, y1, x2, y2) band it revealed, or None if the
+                whole frame must be searched (first frame, offset not measurable).
+
+        """
+        image = blank_masked(screen, self.masks, scale)
+        changed = self._gate.changed_rect(image)
+        if changed is None:
+            self.offset = 0
+            return False, None
+        height, width = image.shape[:2]
+        across = width if self.vertical else height
+        ratio = min(1.0, ALIGN_WIDTH / across)
+        size = (max(1, round(width * ratio)), max(1, round(height * ratio)))
+        small = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+        previous, self._small = self._small, small
+        if previous is None or previous.shape != small.shape:
+            self.offset = None
+            return True, None
+
+        offset = self._align(previous, small)
+        self.offset = None if offset is None else round(offset / ratio)
+        if not self.offset:
+            return True, None
+        band = self._band(changed, self.offset, margin, width, height)
+        logger.debug("Content moved by %d px, searching %s", self.offset, band)
+        return True, band
+
+    def _align(self, previous: np.ndarray[Any, Any], current: np.ndarray[Any, Any]) -> int | None:
+        """Pixels of the small frames the content moved by along the scroll axis, None if unknown.
+
+        Positive offsets move the content down or right.
+        """
+        if not self.vertical:
+            previous, current = previous.T, current.T
+        length, across = current.shape[:2]
+        top, bottom = int(length * STRIP_SPAN[0]), int(length * STRIP_SPAN[1])
+        left, right = int(across * STRIP_CROSS[0]), int(across * STRIP_CROSS[1])
+        strip = np.ascontiguousarray(current[top:bottom, left:right])
+        if strip.size == 0 or float(strip.std()) < MIN_STRIP_STD:
+            return None
+        result = cv2.matchTemplate(np.ascontiguousarray(previous[:, left:right]), strip, cv2.TM_CCOEFF_NORMED)
+        _, score, _, location = cv2.minMaxLoc(result)
+        if score < MIN_ALIGN_SCORE:
+            return None
+        offset = top - int(location[1])
+        # The swipes of _perform_scroll move the content up for "down" and left for "left",
+        # down for "up" and right for "right"; the other way is a false alignment
+        if offset * (1 if self.direction in {"up", "right"} else -1) < 0:
+            return None
+        return offset
+
+    def _band(
+        self,
+        changed: tuple[int, int, int, int],
+        offset: int,
+        margin: int,
+        width: int,
+        height: int,
+    ) -> tuple[int, int, int, int]:
+        """Rect of the changed area the content moved in from, widened by margin.
+
+        "down" and "left" reveal content at the bottom or right edge, "up" and
+        "right" at the top or left edge.
+        """
+        x1, y1, x2, y2 = changed
+        revealed = abs(offset) + margin
+        from_end = self.direction in {"down", "left"}
+        if self.vertical:
+            x1, x2 = max(0, x1 - margin), min(width, x2 + margin)
+            if from_end:
+                return x1, max(y1, y2 - revealed), x2, y2
+            return x1, y1, x2, min(y2, y1 + revealed)
+        y1, y2 = max(0, y1 - margin), min(height, y2 + margin)
+        if from_end:
+            return max(x1, x2 - revealed), y1, x2, y2
+        return x1, y1, min(x2, x1 + revealed), y2
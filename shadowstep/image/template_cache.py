@@ -0,0 +1,170 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+"""Process-wide cache of preprocessed image templates.
+
+Templates are keyed by a hash of their content, so the same icon passed as a
+path, bytes or array is decoded once per process. Each entry keeps the grayscale
+template and the resized copies used by multi-scale matching. Memory is bounded
+and the least recently used templates are evicted first.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, cast
+
+import cv2
+import numpy as np
+from PIL import Image as PILImage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class CachedTemplate:
+    """Decoded grayscale template and its resized copies."""
+
+    gray: np.ndarray[Any, Any]
+    resized: dict[tuple[int, int], np.ndarray[Any, Any]] = field(
+        default_factory=lambda: {},  # noqa: PIE807
+    )
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the template and all of its resized copies."""
+        return int(self.gray.nbytes) + sum(int(level.nbytes) for level in self.resized.values())
+
+
+class TemplateCache:
+    """Bounded LRU cache of decoded templates keyed by content hash."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """Initialize the TemplateCache.
+
+        Args:
+            max_bytes: Upper bound of memory held by cached arrays.
+
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, CachedTemplate] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(image: Any) -> str | None:
+        """Hash the content of a template.
+
+        Args:
+            image: Template as bytes, file path, numpy array or PIL image.
+
+        Returns:
+            str | None: Content hash, or None if the template cannot be read.
+
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        if isinstance(image, bytes):
+            digest.update(image)
+        elif isinstance(image, str):
+            try:
+                digest.update(Path(image).read_bytes())
+            except OSError:
+                return None
+        elif isinstance(image, np.ndarray):
+            array = np.ascontiguousarray(cast("np.ndarray[Any, Any]", image))
+            digest.update(f"{array.shape}{array.dtype}".encode())
+            digest.update(array.data)
+        elif isinstance(image, PILImage.Image):
+            digest.update(f"{image.size}{image.mode}".encode())
+            digest.update(image.tobytes())
+        else:
+            return None
+        return digest.hexdigest()
+
+    def get(self, key: str) -> CachedTemplate | None:
+        """Return the cached template and mark it as recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, gray: np.ndarray[Any, Any]) -> CachedTemplate:
+        """Store a read-only copy of a decoded grayscale template."""
+        gray = np.array(gray, copy=True)
+        gray.setflags(write=False)
+        entry = CachedTemplate(gray=gray)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous.nbytes
+            self._entries[key] = entry
+            self._size += entry.nbytes
+            self._evict()
+        return entry
+
+    def resized(self, key: str, template: np.ndarray[Any, Any], size: tuple[int, int]) -> np.ndarray[Any, Any]:
+        """Return the template resized to (width, height), reusing the cached copy.
+
+        Args:
+            key: Content hash of the template.
+            template: Grayscale template, used when the key is not cached.
+            size: Target (width, height).
+
+        Returns:
+            np.ndarray: Resized template.
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            level = entry.resized.get(size) if entry is not None else None
+        if level is not None:
+            return level
+        level = cv2.resize(template, size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and size not in entry.resized:
+                entry.resized[size] = level
+                self._size += int(level.nbytes)
+                self._evict()
+        return level
+
+    def clear(self) -> None:
+        """Drop all cached templates and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def size(self) -> int:
+        """Memory currently held by cached arrays, in bytes."""
+        return self._size
+
+    def __len__(self) -> int:
+        """Return the number of cached templates."""
+        return len(self._entries)
+
+    def _evict(self) -> None:
+        """Evict least recently used templates until under max_bytes; keeps the newest one."""
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            key, entry = self._entries.popitem(last=False)
+            self._size -= entry.nbytes
+            logger.debug("Evicted template %s (%d bytes)", key, entry.nbytes)
+
+
+template_cache = TemplateCache()
@@ -0,0 +1,125 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+"""Text found on the screen by OCR, used like an image.
+
+TextRegion is a ShadowstepImage whose template is a phrase: visibility checks
+run OCR instead of template matching, so tap(), wait(), wait_not(),
+scroll_to(), coordinates and center work the same way for text as for images.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from shadowstep.decorators.decorators import log_image
+from shadowstep.image.image import DEFAULT_OVERLAP_THRESHOLD, ShadowstepImage
+from shadowstep.image.ocr import DEFAULT_OCR_LANG, OCR_SCALE, find_phrase, read_words
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from shadowstep.image.frame_source import FrameSource
+    from shadowstep.image.image import SearchRegion
+
+# Pixels around a changed screen area kept when OCR runs only on that area
+TEXT_APPEAR_MARGIN = 16
+
+
+class TextRegion(ShadowstepImage):
+    """Phrase on the screen located with OCR."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        text: str,
+        threshold: float = 0.5,
+        timeout: float = 5.0,
+        region: SearchRegion | None = None,
+        frame_source: FrameSource | None = None,
+        *,
+        lang: str = DEFAULT_OCR_LANG,
+        exact: bool = False,
+        scale: float = OCR_SCALE,
+    ) -> None:
+        """Initialize the TextRegion.
+
+        Args:
+            text: Phrase to find; several words must follow each other on one line.
+            threshold: Lowest OCR confidence (0-1) accepted for each word.
+            timeout: Timeout in seconds for visibility/wait operations.
+            region: Part of the screen searched first, as for ShadowstepImage.
+                OCR of a small region is much faster than of the whole screen.
+            frame_source: Frames read by wait(), wait_not() and scroll_to().
+            lang: Tesseract language, e.g. "eng" or "eng+rus".
+            exact: Compare case and punctuation as well.
+            scale: Screen resize factor applied before OCR.
+
+        """
+        super().__init__(text, threshold=threshold, timeout=timeout, region=region, frame_source=frame_source)
+        self.text = text
+        self.lang = lang
+        self.exact = exact
+        self.scale = scale
+
+    def __repr__(self) -> str:
+        """Return the phrase searched for."""
+        return f"TextRegion({self.text!r})"
+
+    @log_image()
+    def find_all(
+        self,
+        coord_threshold: int = 5,  # noqa: ARG002
+        *,
+        max_results: int | None = None,
+        overlap_threshold: float = DEFAULT_OVERLAP_THRESHOLD,  # noqa: ARG002
+    ) -> list[tuple[int, int, int, int]]:
+        """Find all occurrences of the phrase on screen, or in the region if one is set.
+
+        Args:
+            coord_threshold: Unused, word boxes do not overlap.
+            max_results: Return at most this many matches. None returns all.
+            overlap_threshold: Unused, word boxes do not overlap.
+
+        Returns:
+            list[tuple[int, int, int, int]]: (x1, y1, x2, y2) of each occurrence, top to bottom.
+
+        """
+        full_image = self.to_ndarray(self._get_screenshot_as_bytes(), grayscale=True)
+        x1, y1, x2, y2 = self._resolve_region(full_image) or (0, 0, full_image.shape[1], full_image.shape[0])
+        boxes = self._find_boxes(full_image[y1:y2, x1:x2], (x1, y1))
+        self.logger.info("Found %d occurrences of %r", len(boxes), self.text)
+        return boxes[:max_results]
+
+    def _locate_in_rect(
+        self,
+        image: np.ndarray[Any, Any],
+        origin: tuple[int, int],
+        device_key: str,  # noqa: ARG002
+    ) -> tuple[int, int, int, int] | None:
+        """Find the first occurrence of the phrase on a screen crop whose top-left corner is at origin."""
+        boxes = self._find_boxes(image, origin)
+        if not boxes:
+            self.logger.info("Text %r not recognized", self.text)
+            return None
+        return boxes[0]
+
+    def _find_boxes(self, image: np.ndarray[Any, Any], origin: tuple[int, int]) -> list[tuple[int, int, int, int]]:
+        """Run (cached) OCR on a screen crop and return the phrase boxes in screen pixels."""
+        words = read_words(image, lang=self.lang, scale=self.scale)
+        return [
+            (x1 + origin[0], y1 + origin[1], x2 + origin[0], y2 + origin[1])
+            for x1, y1, x2, y2 in find_phrase(words, self.text, exact=self.exact, min_confidence=self.threshold)
+        ]
+
+    def _match_reduction(self) -> int:
+        """OCR reads full-resolution screens and downscales them itself."""
+        return 1
+
+    def _match_cache_key(self, factor: int) -> None:  # noqa: ARG002
+        """Not cached here: the recognized words of a frame are kept by the OCR cache."""
+        return
+
+    def _appear_margin(self) -> int:
+        """Pixels of context kept around a changed screen area for OCR."""
+        return TEXT_APPEAR_MARGIN
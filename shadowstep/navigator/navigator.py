@@ -5,8 +5,8 @@
 """Navigation module for managing page transitions in Shadowstep framework.
 
 This module provides functionality for navigating between pages using graph-based
-pathfinding algorithms. It supports both NetworkX-based shortest path finding
-and fallback BFS traversal.
+pathfinding algorithms. It supports NetworkX-based shortest path finding weighted
+by measured transition costs and fallback BFS traversal.
 """
 
 from __future__ import annotations
@@ -23,6 +23,7 @@ from collections import deque
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, ClassVar
 
+from lxml import etree  # type: ignore[import]
 from networkx.exception import NetworkXException
 from selenium.common import WebDriverException
 
@@ -35,6 +36,9 @@ from shadowstep.exceptions.shadowstep_exceptions import (
     ShadowstepTimeoutMustBeNonNegativeError,
     ShadowstepToPageCannotBeNoneError,
 )
+from shadowstep.image.fingerprint import FingerprintIndex, fingerprint
+from shadowstep.image.frame_cache import frame_cache
+from shadowstep.locator import LocatorConverter
 from shadowstep.navigator.page_graph import PageGraph
 from shadowstep.page_base import PageBaseShadowstep
 from shadowstep.utils.utils import get_current_func_name
@@ -42,11 +46,22 @@ from shadowstep.utils.utils import get_current_func_name
 logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import numpy as np
+
+    from shadowstep.locator import UiSelector
     from shadowstep.shadowstep import Shadowstep
 
 # Constants
 DEFAULT_NAVIGATION_TIMEOUT = 10
 MIN_PATH_LENGTH = 2
+# Arrival polling: first interval, growth factor and cap, in seconds
+ARRIVAL_POLL_INITIAL = 0.05
+ARRIVAL_POLL_FACTOR = 1.5
+ARRIVAL_POLL_MAX = 0.5
+# Tuple signature strategies matched against the page source, and their node attribute
+SIGNATURE_STRATEGY_ATTRIBUTES = {"id": "resource-id", "accessibility id": "content-desc", "class name": "class"}
 
 
 class PageNavigator:
@@ -59,11 +74,15 @@ class PageNavigator:
         shadowstep: The main Shadowstep instance for page resolution.
         graph_manager: Manages the page transition graph.
         logger: Logger instance for dom events.
+        fingerprints: Screen fingerprints of visited pages, used as a first guess
+            of the current page. None (default) disables them; assign a
+            FingerprintIndex to enable. Only screenshots already in the frame
+            cache are fingerprinted, so navigation takes none of its own.
 
     """
 
     pages: ClassVar[dict[str, type[PageBaseShadowstep]]] = {}
-    _pages_discovered: bool = False
+    _discovered_graph: ClassVar[PageGraph | None] = None
 
     def __init__(self, shadowstep: Shadowstep) -> None:
         """Initialize the PageNavigator.
@@ -94,6 +113,9 @@ class PageNavigator:
             "results",
         }
         self._ignored_base_path_parts: set[str] = self._get_ignored_dirs()
+        self._converter = LocatorConverter()
+        self._signature_xpaths: dict[type, list[Any] | None] = {}
+        self.fingerprints: FingerprintIndex[str] | None = None
 
     def get_page(self, name: str) -> PageBaseShadowstep:
         """Get a page instance by name.
@@ -134,11 +156,15 @@ class PageNavigator:
         raise ValueError(msg)
 
     def auto_discover_pages(self) -> None:
-        """Automatically import and register all PageBase subclasses from all 'pages' directories in sys.path."""
+        """Automatically import and register all PageBase subclasses from all 'pages' directories in sys.path.
+
+        Discovery runs once per process; later navigators reuse the same page graph.
+        """
         self.logger.debug("📂 %s: %s", get_current_func_name(), list(set(sys.path)))
-        if self._pages_discovered:
+        if PageNavigator._discovered_graph is not None:
+            self.graph_manager = PageNavigator._discovered_graph
             return
-        self._pages_discovered = True
+        PageNavigator._discovered_graph = self.graph_manager
         for base_path in map(Path, list(set(sys.path))):
             base_str = base_path.name.lower()
             if base_str in self._ignored_base_path_parts:
@@ -175,14 +201,24 @@ class PageNavigator:
                 if not name.startswith("Page"):
                     continue
                 self.pages[name] = obj
-                page_instance = obj()
-                edges = page_instance.edges
-                edge_names = list(edges.keys())
-                self.logger.info("✅ register page: %s with edges %s", page_instance, edge_names)
-                self.add_page(page_instance, edges)
+                if obj.edge_targets is None:
+                    self.logger.info("✅ register page: %s with deferred edges", name)
+                    self.graph_manager.add_lazy_page(name, self._edges_loader(obj))
+                    continue
+                self.logger.info("✅ register page: %s with edges %s", name, list(obj.edge_targets))
+                self.add_page(name, dict.fromkeys(obj.edge_targets))
         except Exception:
             self.logger.exception("❌ Error page register from module %s", module.__name__)
 
+    @staticmethod
+    def _edges_loader(page_cls: type[PageBaseShadowstep]) -> Callable[[], dict[str, Any]]:
+        """Build a loader that instantiates the page only when its edges are needed."""
+
+        def load() -> dict[str, Any]:
+            return page_cls().edges
+
+        return load
+
     def list_registered_pages(self) -> None:
         """Log all registered page classes."""
         self.logger.info("=== Registered Pages ===")
@@ -264,6 +300,75 @@ class PageNavigator:
         else:
             return True
 
+    def navigate_many(
+        self,
+        from_page: Any,
+        to_pages: list[Any],
+        timeout: int = DEFAULT_NAVIGATION_TIMEOUT,
+    ) -> bool:
+        """Navigate from one page through all target pages along a planned tour.
+
+        Args:
+            from_page: The current page.
+            to_pages: Pages to visit, in any order.
+            timeout: Timeout in seconds for each transition.
+
+        Returns:
+            True if every target page was visited, False otherwise.
+
+        Raises:
+            TypeError: If from_page is None.
+            ValueError: If timeout is negative.
+
+        """
+        if from_page is None:
+            raise ShadowstepFromPageCannotBeNoneError
+        if timeout < 0:
+            raise ShadowstepTimeoutMustBeNonNegativeError
+
+        tour = self.plan_tour(from_page, to_pages)
+        if not tour:
+            self.logger.error("❌ No dom tour found from %s over %s", from_page, to_pages)
+            return False
+        if len(tour) < MIN_PATH_LENGTH:
+            self.logger.info("⏭️ Already on target pages: %s", to_pages)
+            return True
+
+        self.logger.info("🚀 Navigating tour from %s via path: %s", from_page, tour)
+        try:
+            self.perform_navigation(tour, timeout)
+        except WebDriverException:
+            self.logger.exception("❗ WebDriverException during dom tour %s", tour)
+            return False
+        return True
+
+    def plan_tour(self, start: Any, targets: list[Any]) -> list[str] | None:
+        """Plan a path from start that visits every target, nearest target first.
+
+        Targets passed through on the way to another target count as visited.
+
+        Returns:
+            The tour as a list of page names, or None if a target is unreachable.
+
+        """
+        current = self.graph_manager.page_key(start)
+        remaining: list[str] = list(
+            dict.fromkeys(self.graph_manager.page_key(target) for target in targets),
+        )
+        tour = [current]
+        while remaining:
+            best: list[str] | None = None
+            for target in remaining:
+                path = self.find_path(current, target)
+                if path and (best is None or len(path) < len(best)):
+                    best = path
+            if best is None:
+                return None
+            tour.extend(best[1:])
+            remaining = [target for target in remaining if target not in best]
+            current = best[-1]
+        return tour
+
     def find_path(self, start: Any, target: Any) -> list[str] | None:
         """Find a path from start page to target page."""
         start_key = self.graph_manager.page_key(start)
@@ -292,12 +397,208 @@ class PageNavigator:
                     queue.append((next_page, [*path, current]))
         return None
 
+    def identify_current_page(self) -> list[tuple[str, float]]:
+        """Identify the current page from a single hierarchy snapshot.
+
+        Every registered page that declares a ``signature`` is matched locally
+        against one ``page_source``; pages without a signature are skipped.
+
+        Returns:
+            (page name, score) pairs, best first. The score is the share of the
+            page's signature locators found on screen; unmatched pages are omitted.
+
+        """
+        screen = self._screen_fingerprint()
+        root = self._capture_hierarchy()
+        guess = self._guess_from_fingerprint(screen)
+        if guess is not None:
+            xpaths = self._get_signature_xpaths(self.pages[guess])
+            if xpaths and self._signature_score(xpaths, root) == 1.0:
+                self.logger.debug("🔎 Current page recognized by screen fingerprint: %s", guess)
+                return [(guess, 1.0)]
+        candidates: list[tuple[str, float, int]] = []
+        for name, page_cls in self.pages.items():
+            xpaths = self._get_signature_xpaths(page_cls)
+            if not xpaths:
+                continue
+            score = self._signature_score(xpaths, root)
+            if score > 0:
+                candidates.append((name, score, len(xpaths)))
+        # ties go to the page with the more specific signature
+        candidates.sort(key=lambda candidate: (candidate[1], candidate[2]), reverse=True)
+        self.logger.debug("🔎 Current page candidates: %s", candidates)
+        if screen is not None and candidates and candidates[0][1] == 1.0:
+            self._remember_fingerprint(candidates[0][0], screen)
+        return [(name, score) for name, score, _ in candidates]
+
+    def guess_current_page(self) -> str | None:
+        """Guess the current page from a screenshot alone, without the hierarchy.
+
+        Only pages reached by navigation or recognized by identify_current_page
+        since fingerprints were enabled can be guessed.
+
+        Returns:
+            The name of the known page whose screen looks most alike, or None if
+            fingerprints are disabled or no known screen is close enough.
+
+        """
+        return self._guess_from_fingerprint(self._screen_fingerprint(capture=True))
+
+    def _guess_from_fingerprint(self, screen: np.ndarray[Any, Any] | None) -> str | None:
+        """Name of the registered page whose remembered screen is nearest, if any."""
+        if screen is None or self.fingerprints is None:
+            return None
+        found = self.fingerprints.nearest(screen)
+        if found is None or found[0] not in self.pages:
+            return None
+        return found[0]
+
+    def _screen_fingerprint(
+        self, *, capture: bool = False, newer_than: float | None = None,
+    ) -> np.ndarray[Any, Any] | None:
+        """Fingerprint of the current screen, None if fingerprints are disabled or no screenshot is at hand.
+
+        Args:
+            capture: Take a new screenshot instead of using the one kept in the frame cache.
+            newer_than: time.monotonic() value a kept screenshot must be captured after;
+                None accepts one that is still fresh.
+
+        """
+        if self.fingerprints is None:
+            return None
+        try:
+            if capture:
+                return fingerprint(self.shadowstep.get_screenshot())
+            frame = frame_cache.latest(self.shadowstep.driver, newer_than=newer_than)
+            return None if frame is None else fingerprint(frame.data)
+        except Exception as error:  # noqa: BLE001
+            self.logger.debug("Screen fingerprint failed: %s", error)
+            return None
+
+    def _remember_fingerprint(
+        self, page: str, screen: np.ndarray[Any, Any] | None = None, *, newer_than: float | None = None,
+    ) -> None:
+        """Store the screen of a page unless an alike screen of it is already known.
+
+        Without a screen, one kept in the frame cache and captured after newer_than is used.
+        """
+        if self.fingerprints is None:
+            return
+        screen = self._screen_fingerprint(newer_than=newer_than) if screen is None else screen
+        if screen is None:
+            return
+        known = self.fingerprints.nearest(screen)
+        if known is None or known[0] != page:
+            self.fingerprints.add(screen, page)
+
+    def _capture_hierarchy(self) -> Any:
+        """Fetch the page source once and parse it into an lxml tree."""
+        return self._parse_hierarchy(self.shadowstep.driver.page_source)
+
+    @staticmethod
+    def _parse_hierarchy(page_source: str) -> Any:
+        """Parse a page source into an lxml tree."""
+        parser = etree.XMLParser(recover=True)  # type: ignore[attr-defined]
+        return etree.fromstring(page_source.encode("utf-8"), parser=parser)  # type: ignore[attr-defined]
+
+    def _get_signature_xpaths(self, page_cls: type) -> list[Any] | None:
+        """Compile the signature locators of a page class to XPath, once per class."""
+        if page_cls in self._signature_xpaths:
+            return self._signature_xpaths[page_cls]
+        signature = getattr(page_cls, "signature", None)
+        xpaths: list[Any] | None = None
+        if signature:
+            try:
+                xpaths = [
+                    etree.XPath(self._signature_xpath(locator))  # type: ignore[attr-defined]
+                    for locator in signature
+                ]
+            except Exception:
+                self.logger.exception("❌ Cannot compile signature of %s", page_cls.__name__)
+                xpaths = None
+        self._signature_xpaths[page_cls] = xpaths
+        return xpaths
+
+    def _signature_xpath(self, locator: tuple[str, str] | dict[str, Any] | UiSelector) -> str:
+        """Convert a signature locator to an XPath over the page source.
+
+        Raises:
+            ValueError: If a tuple uses a strategy the page source cannot be matched by.
+
+        """
+        if isinstance(locator, tuple) and locator[0] != "xpath":
+            strategy, value = locator
+            attribute = SIGNATURE_STRATEGY_ATTRIBUTES.get(strategy)
+            if attribute is None:
+                msg = f"Signature strategy '{strategy}' cannot be matched against the page source"
+                raise ValueError(msg)
+            if strategy == "id" and ":id/" not in value:
+                # short ids are resolved by the driver against the app package
+                return f"//*[@resource-id='{value}' or substring-after(@resource-id, ':id/')='{value}']"
+            locator = {attribute: value}
+        return self._converter.to_xpath(locator)[1]
+
+    @staticmethod
+    def _signature_score(xpaths: list[Any], root: Any) -> float:
+        """Share of signature XPaths that match at least one node of the tree."""
+        matched = sum(1 for xpath in xpaths if PageNavigator._xpath_matches(xpath, root))
+        return matched / len(xpaths)
+
+    @staticmethod
+    def _xpath_matches(xpath: Any, root: Any) -> bool:
+        """Check whether a compiled XPath matches the tree; evaluation errors count as no match."""
+        try:
+            return bool(xpath(root))
+        except etree.XPathError:  # type: ignore[attr-defined]
+            logger.debug("Signature XPath %s failed", xpath, exc_info=True)
+            return False
+
+    def _wait_for_page(self, page: Any, timeout: float) -> bool:
+        """Wait until the page is on screen, returning as soon as it is.
+
+        Polling starts at ARRIVAL_POLL_INITIAL and grows up to ARRIVAL_POLL_MAX.
+        Pages with a signature are checked against one hierarchy per poll, and
+        only when it changed since the previous poll; other pages are checked
+        with is_current_page().
+
+        Returns:
+            True if the page appeared within timeout, False otherwise.
+
+        """
+        xpaths = self._get_signature_xpaths(page.__class__)
+        end_time = time.monotonic() + timeout
+        interval = ARRIVAL_POLL_INITIAL
+        last_source: str | None = None
+        while True:
+            if not xpaths:
+                if page.is_current_page():
+                    return True
+            else:
+                try:
+                    page_source: str | None = self.shadowstep.driver.page_source
+                except WebDriverException as error:
+                    self.logger.debug("Hierarchy snapshot failed: %s", error)
+                    page_source = None
+                if page_source is not None and page_source != last_source:
+                    last_source = page_source
+                    if self._signature_score(xpaths, self._parse_hierarchy(page_source)) == 1.0:
+                        return True
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(interval, remaining))
+            interval = min(interval * ARRIVAL_POLL_FACTOR, ARRIVAL_POLL_MAX)
+
     def perform_navigation(
         self,
         path: list[str],
         timeout: int = DEFAULT_NAVIGATION_TIMEOUT,
     ) -> None:
-        """Perform navigation through a given path of page names."""
+        """Perform navigation through a given path of page names.
+
+        The wall time and outcome of every hop is recorded into the page graph,
+        so later path lookups prefer transitions that proved fast and reliable.
+        """
         if not path:
             raise ShadowstepPathCannotBeEmptyError
         if len(path) < MIN_PATH_LENGTH:
@@ -311,15 +612,25 @@ class PageNavigator:
             next_page = self.shadowstep.resolve_page(next_name)
 
             transition_method = current_page.edges[next_name]
-            transition_method()
-
-            end_time = time.time() + timeout
-            while time.time() < end_time:
-                if next_page.is_current_page():  # type: ignore[attr-defined]
-                    break
-                time.sleep(0.5)
-            else:
+            started = time.monotonic()
+            try:
+                transition_method()
+            except WebDriverException:
+                self.graph_manager.record_transition(
+                    current_name, next_name, time.monotonic() - started, success=False,
+                )
+                raise
+
+            transitioned = time.monotonic()
+            if not self._wait_for_page(next_page, timeout):
+                self.graph_manager.record_transition(
+                    current_name, next_name, time.monotonic() - started, success=False,
+                )
                 raise ShadowstepNavigationFailedError(str(current_page), str(next_page), str(transition_method))
+            self.graph_manager.record_transition(
+                current_name, next_name, time.monotonic() - started, success=True,
+            )
+            self._remember_fingerprint(next_name, newer_than=transitioned)
 
     def _get_ignored_dirs(self) -> set[str]:
         logger.debug(get_current_func_name())
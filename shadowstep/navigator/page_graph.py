@@ -6,7 +6,10 @@
 
 from __future__ import annotations
 
+import json
 import logging
+from dataclasses import asdict, dataclass
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 import networkx as nx
@@ -14,10 +17,42 @@ import networkx as nx
 from shadowstep.exceptions.shadowstep_exceptions import ShadowstepPageCannotBeNoneError
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from shadowstep.page_base import PageBaseShadowstep
 
 logger = logging.getLogger(__name__)
 
+# Cost of a transition that has never been measured, in seconds
+DEFAULT_EDGE_COST = 1.0
+# Relative change of an edge cost below which its weight and the cached paths are kept
+WEIGHT_CHANGE_THRESHOLD = 0.2
+
+
+@dataclass
+class EdgeStats:
+    """Measured traversals of a single page transition."""
+
+    attempts: int = 0
+    failures: int = 0
+    total_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        """Mean wall time of a traversal attempt."""
+        return self.total_seconds / self.attempts if self.attempts else DEFAULT_EDGE_COST
+
+    @property
+    def failure_rate(self) -> float:
+        """Share of failed attempts, smoothed so it never reaches 1."""
+        return self.failures / (self.attempts + 1)
+
+    @property
+    def expected_cost(self) -> float:
+        """Expected time to traverse the edge when failed attempts are retried."""
+        return self.mean_seconds / (1 - self.failure_rate)
+
+
 class PageGraph:
     """Manages the graph of page transitions."""
 
@@ -25,6 +60,10 @@ class PageGraph:
         """Initialize the PageGraph with empty graphs."""
         self.graph: dict[str, dict[str, Any]] = {}
         self.nx_graph: nx.DiGraph[str] = nx.DiGraph()
+        self._pending: dict[str, Callable[[], dict[str, Any]]] = {}
+        # source page -> predecessor of every reachable page, invalidated on graph change
+        self._path_cache: dict[str, dict[str, str | None]] = {}
+        self.edge_stats: dict[tuple[str, str], EdgeStats] = {}
 
     @staticmethod
     def page_key(page: str | PageBaseShadowstep) -> str:
@@ -39,41 +78,141 @@ class PageGraph:
             raise ShadowstepPageCannotBeNoneError
 
         page_key = self.page_key(page)
+        self._pending.pop(page_key, None)
+        self._path_cache.clear()
         self.graph[page_key] = edges
 
         self.nx_graph.add_node(page_key)
         for target_name in edges:
-            self.nx_graph.add_edge(page_key, self.page_key(target_name))
+            target_key = self.page_key(target_name)
+            self.nx_graph.add_edge(page_key, target_key, weight=self.edge_cost(page_key, target_key))
+
+    def edge_cost(self, from_page: Any, to_page: Any) -> float:
+        """Expected cost of a transition, DEFAULT_EDGE_COST until it is measured."""
+        stats = self.edge_stats.get((self.page_key(from_page), self.page_key(to_page)))
+        return stats.expected_cost if stats else DEFAULT_EDGE_COST
+
+    def record_transition(
+        self,
+        from_page: Any,
+        to_page: Any,
+        seconds: float,
+        *,
+        success: bool,
+    ) -> None:
+        """Record one traversal of an edge and update its weight."""
+        key = (self.page_key(from_page), self.page_key(to_page))
+        stats = self.edge_stats.setdefault(key, EdgeStats())
+        stats.attempts += 1
+        stats.failures += 0 if success else 1
+        stats.total_seconds += seconds
+        self._apply_weight(*key)
+
+    def save_stats(self, path: str | Path) -> None:
+        """Write measured edge statistics to a JSON file."""
+        records = [
+            {"from": from_key, "to": to_key, **asdict(stats)}
+            for (from_key, to_key), stats in self.edge_stats.items()
+        ]
+        Path(path).write_text(json.dumps(records, indent=2), encoding="utf-8")
+
+    def load_stats(self, path: str | Path) -> None:
+        """Load edge statistics saved by save_stats, replacing measured ones."""
+        records: list[dict[str, Any]] = json.loads(Path(path).read_text(encoding="utf-8"))
+        for record in records:
+            key = (str(record["from"]), str(record["to"]))
+            self.edge_stats[key] = EdgeStats(
+                attempts=int(record["attempts"]),
+                failures=int(record["failures"]),
+                total_seconds=float(record["total_seconds"]),
+            )
+            self._apply_weight(*key)
+
+    def _apply_weight(self, from_key: str, to_key: str) -> None:
+        """Refresh the weight of an existing edge if its cost changed materially.
+
+        Small drifts are left out so that recording every hop does not drop the
+        cached paths; they add up in the stats until the cost moves by more than
+        WEIGHT_CHANGE_THRESHOLD of the applied weight.
+        """
+        if not self.nx_graph.has_edge(from_key, to_key):
+            return
+        edge = self.nx_graph[from_key][to_key]
+        cost = self.edge_cost(from_key, to_key)
+        weight = float(edge.get("weight", DEFAULT_EDGE_COST))
+        if abs(cost - weight) <= WEIGHT_CHANGE_THRESHOLD * weight:
+            return
+        edge["weight"] = cost
+        self._path_cache.clear()
+
+    def add_lazy_page(self, page: Any, loader: Callable[[], dict[str, Any]]) -> None:
+        """Register a page whose edges are collected by ``loader`` on first graph lookup."""
+        if page is None:
+            raise ShadowstepPageCannotBeNoneError
+
+        page_key = self.page_key(page)
+        self._pending[page_key] = loader
+        self._path_cache.clear()
+        self.nx_graph.add_node(page_key)
+
+    def _load_pending(self) -> None:
+        """Collect edges of all lazily registered pages."""
+        while self._pending:
+            page_key, loader = next(iter(self._pending.items()))
+            try:
+                edges = loader()
+            except Exception:
+                logger.exception("Error collecting edges of page %s", page_key)
+                edges = {}
+            self.add_page(page_key, edges)
 
     def get_edges(self, page: Any) -> list[str]:
         """Get edges for a given page."""
+        self._load_pending()
         return list(self.graph.get(self.page_key(page), {}).keys())
 
     def is_valid_edge(self, from_page: Any, to_page: Any) -> bool:
         """Check if there's a valid edge between two pages."""
+        self._load_pending()
         from_key = self.page_key(from_page)
         to_key = self.page_key(to_page)
         return to_key in self.graph.get(from_key, {})
 
     def has_path(self, from_page: Any, to_page: Any) -> bool:
         """Check if there's a path between two pages."""
-        try:
-            return nx.has_path(
-                self.nx_graph,
-                self.page_key(from_page),
-                self.page_key(to_page),
-            )
-        except (nx.NetworkXError, KeyError):
-            return False
+        self._load_pending()
+        return self.page_key(to_page) in self._predecessors(self.page_key(from_page))
 
     def find_shortest_path(self, from_page: Any, to_page: Any) -> list[str] | None:
-        """Find the shortest path between two pages."""
-        try:
-            return nx.shortest_path(  # type: ignore[misc]
-                self.nx_graph,
-                source=self.page_key(from_page),
-                target=self.page_key(to_page),
-            )
-        except (nx.NetworkXNoPath, nx.NodeNotFound, nx.NetworkXError):
-            logger.exception("Error finding shortest path")
+        """Find the cheapest path between two pages.
+
+        Edges are weighted by their expected traversal cost. Paths are rebuilt from
+        a cached per-source Dijkstra tree, so repeated lookups cost O(path length)
+        until the graph or its weights change.
+        """
+        self._load_pending()
+        source = self.page_key(from_page)
+        target = self.page_key(to_page)
+        predecessors = self._predecessors(source)
+        if target not in predecessors:
+            logger.debug("No path from %s to %s", source, target)
             return None
+        path = [target]
+        while (previous := predecessors[path[-1]]) is not None:
+            path.append(previous)
+        path.reverse()
+        return path
+
+    def _predecessors(self, source: str) -> dict[str, str | None]:
+        """Return the cached predecessor map of all pages reachable from source."""
+        predecessors = self._path_cache.get(source)
+        if predecessors is None:
+            predecessors = {}
+            if source in self.nx_graph:
+                pred, _ = nx.dijkstra_predecessor_and_distance(self.nx_graph, source)  # type: ignore[misc]
+                predecessors = {
+                    node: previous[0] if previous else None
+                    for node, previous in pred.items()  # type: ignore[misc]
+                }
+            self._path_cache[source] = predecessors
+        return predecessors
@@ -17,6 +17,7 @@ from typing_extensions import Self
 T = TypeVar("T", bound="PageBase")  # type: ignore[valid-type]  # noqa: F821
 
 if TYPE_CHECKING:
+    from shadowstep.locator import UiSelector
     from shadowstep.shadowstep import Shadowstep
 
 
@@ -29,6 +30,16 @@ class PageBaseShadowstep(ABC):
     shadowstep: "Shadowstep"
     _instances: ClassVar[dict[type, "PageBaseShadowstep"]] = {}
 
+    # Names of the pages reachable from this page. When declared, the navigator
+    # builds the graph from it without instantiating the page; otherwise the
+    # ``edges`` property is evaluated lazily, on the first path lookup.
+    edge_targets: "ClassVar[tuple[str, ...] | None]" = None
+
+    # Locators that are all present when this page is on screen. When declared,
+    # the navigator identifies the page from a single hierarchy snapshot instead
+    # of calling ``is_current_page``.
+    signature: "ClassVar[tuple[tuple[str, str] | dict[str, Any] | UiSelector, ...] | None]" = None
+
     def __new__(cls) -> Any:
         """Create a new instance or return existing singleton instance.
 
@@ -22,14 +22,20 @@ from shadowstep.exceptions.shadowstep_exceptions import (
     ShadowstepPageObjectError,
     ShadowstepTerminalNotInitializedError,
 )
+from shadowstep.image.fingerprint import distance, fingerprint
 from shadowstep.page_object.page_object_generator import PageObjectGenerator
 from shadowstep.page_object.page_object_merger import PageObjectMerger
 from shadowstep.page_object.page_object_parser import PageObjectParser
 from shadowstep.utils.utils import get_current_func_name
 
 if TYPE_CHECKING:
+    import numpy as np
+
     from shadowstep.shadowstep import Shadowstep
 
+# Differing fingerprint bits up to which two consecutive scroll positions are the same
+DUPLICATE_POSITION_DISTANCE = 6
+
 
 class PageObjectRecyclerExplorer:
     """Explorer for scrollable content in mobile applications.
@@ -37,6 +43,13 @@ class PageObjectRecyclerExplorer:
     This class provides functionality to automatically explore scrollable
     content by generating page objects for different scroll positions
     and merging them into a comprehensive page object.
+
+    Attributes:
+        compare_screens: When a scroll changes the page source, also compare a
+            screenshot with the previous position and stop if the screen did not
+            move. For lists whose hierarchy changes while standing still, e.g.
+            animated items; off by default as it takes a screenshot per scroll.
+
     """
 
     def __init__(self, base: Shadowstep, translator: Any) -> None:
@@ -52,8 +65,9 @@ class PageObjectRecyclerExplorer:
         self.parser = PageObjectParser()
         self.generator = PageObjectGenerator(translator)
         self.merger = PageObjectMerger()
+        self.compare_screens = False
 
-    def explore(self, output_dir: str, timeout: float = 360) -> Path:  # noqa: C901, PLR0915
+    def explore(self, output_dir: str, timeout: float = 360) -> Path:  # noqa: C901, PLR0912, PLR0915
         """Explore recycler views and generate page objects.
 
         Args:
@@ -90,7 +104,8 @@ class PageObjectRecyclerExplorer:
             )
 
         pages = []
-        original_tree = self.parser.parse(self.base.driver.page_source)
+        previous_source = self.base.driver.page_source
+        original_tree = self.parser.parse(previous_source)
         original_page_path, original_page_class_name = self.generator.generate(
             original_tree,
             output_dir=output_dir,
@@ -116,16 +131,28 @@ class PageObjectRecyclerExplorer:
             self.logger.warning("`recycler` does not support scroll_down")
             raise ShadowstepPageObjectError
         prefix = 0
+        previous_screen = self._screen_fingerprint() if self.compare_screens else None
 
         start_time = time.monotonic()
         while recycler_el.scroll_down(percent=0.5, speed=1000, return_bool=True):
             if time.monotonic() - start_time > timeout:
                 self.logger.warning("Timeout reached while scrolling recycler")
                 break
+            page_source = self.base.driver.page_source
+            if page_source == previous_source:
+                self.logger.info("Page source did not change after scrolling, stopping")
+                break
+            previous_source = page_source
+            if self.compare_screens:
+                screen = self._screen_fingerprint()
+                if self._same_position(previous_screen, screen):
+                    self.logger.info("Screen did not move after scrolling, stopping")
+                    break
+                previous_screen = screen
 
             # tree changed!!! recycler_raw needs to be redefined
             prefix += 1
-            tree = self.parser.parse(self.base.driver.page_source)
+            tree = self.parser.parse(page_source)
             page_path, page_class_name = self.generator.generate(
                 tree,
                 output_dir=output_dir,
@@ -182,6 +209,20 @@ class PageObjectRecyclerExplorer:
 
         return output_path
 
+    @staticmethod
+    def _same_position(previous: np.ndarray[Any, Any] | None, current: np.ndarray[Any, Any] | None) -> bool:
+        """Check whether two consecutive scroll positions show the same screen; unknown screens differ."""
+        if previous is None or current is None:
+            return False
+        return distance(previous, current) <= DUPLICATE_POSITION_DISTANCE
+
+    def _screen_fingerprint(self) -> np.ndarray[Any, Any] | None:
+        try:
+            return fingerprint(self.base.get_screenshot())
+        except Exception as error:  # noqa: BLE001
+            self.logger.debug("Screen fingerprint failed: %s", error)
+            return None
+
     def _load_class_from_file(self, path: str | Path, class_name: str) -> type | None:
         spec = importlib.util.spec_from_file_location("loaded_po", path)
         if spec is None or spec.loader is None:
@@ -8,9 +8,144 @@ This module provides the ActionHistory class for tracking
 and managing the history of scheduled actions in the
 Shadowstep automation framework.
 """
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, cast
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+
+
+@dataclass(frozen=True)
+class StepException:
+    """Exception a step threw on the device."""
+
+    name: str
+    message: str
+    stacktrace: str
+
+
+@dataclass(frozen=True)
+class StepResult:
+    """One execution of one step of a scheduled action."""
+
+    name: str
+    step_type: str
+    timestamp: int
+    passed: bool
+    result: Any = None
+    exception: StepException | None = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> StepResult:
+        """Parse a step record of mobile: getActionHistory.
+
+        Args:
+            data: Record with name, type, timestamp, passed, result and exception.
+
+        Returns:
+            StepResult: Parsed record.
+
+        """
+        exception = data.get("exception")
+        return cls(
+            name=str(data.get("name", "")),
+            step_type=str(data.get("type", "")),
+            timestamp=int(data.get("timestamp") or 0),
+            passed=bool(data.get("passed")),
+            result=data.get("result"),
+            exception=None if not exception else StepException(
+                name=str(exception.get("name", "")),
+                message=str(exception.get("message", "")),
+                stacktrace=str(exception.get("stacktrace", "")),
+            ),
+        )
 
 
 class ActionHistory:
-    """Tracks the history of scheduled actions for debugging and analysis."""
+    """Tracks the history of scheduled actions for debugging and analysis.
+
+    Wraps the response of mobile: getActionHistory and mobile: unscheduleAction.
+    The server keeps at most maxHistoryItems runs, in no promised order; they are
+    sorted newest first by the start of their first step. Every run lists the
+    results of its steps in execution order.
+
+    Attributes:
+        name: Name of the scheduled action.
+        repeats: Number of times the action has run so far, including runs
+            dropped from the history.
+        executions: Step results of each kept run, newest first.
+        raw: Response as returned by the server.
+
+    Example:
+        history = app.get_action_history("permissions")
+        for step in history.results("allow"):
+            print(step.timestamp, step.passed)
+
+    """
+
+    def __init__(self, raw: Mapping[str, Any] | None, name: str = "") -> None:
+        """Initialize the ActionHistory.
+
+        Args:
+            raw: Server response; None is an empty history.
+            name: Name of the scheduled action.
+
+        """
+        self.name = name
+        self.raw: dict[str, Any] = dict(raw or {})
+        self.repeats = int(self.raw.get("repeats") or 0)
+        runs = cast("list[list[dict[str, Any]]]", self.raw.get("stepResults") or [])
+        executions = [[StepResult.from_dict(step) for step in run] for run in runs]
+        self.executions: list[list[StepResult]] = sorted(
+            executions, key=lambda execution: execution[0].timestamp if execution else 0, reverse=True,
+        )
+
+    @property
+    def passed(self) -> int:
+        """Number of kept runs in which every step passed."""
+        return sum(1 for execution in self.executions if self._run_passed(execution))
+
+    @property
+    def failed(self) -> int:
+        """Number of kept runs in which a step failed."""
+        return len(self.executions) - self.passed
+
+    def last(self) -> list[StepResult] | None:
+        """Return the step results of the latest run, None if the action has not run yet."""
+        return self.executions[0] if self.executions else None
+
+    def results(self, step_name: str) -> list[StepResult]:
+        """Return every kept result of a step, newest first."""
+        return [step for execution in self.executions for step in execution if step.name == step_name]
+
+    def since(self, timestamp: int) -> list[list[StepResult]]:
+        """Return the runs started after a timestamp, newest first.
+
+        Args:
+            timestamp: Unix time in milliseconds, e.g. of the newest run seen by
+                a previous poll.
+
+        Returns:
+            list[list[StepResult]]: Runs whose first step started later.
+
+        """
+        return [execution for execution in self.executions if execution and execution[0].timestamp > timestamp]
+
+    @staticmethod
+    def _run_passed(execution: list[StepResult]) -> bool:
+        """Check whether every step of a run passed."""
+        return all(step.passed for step in execution)
+
+    def __iter__(self) -> Iterator[list[StepResult]]:
+        """Iterate over the kept runs, newest first."""
+        return iter(self.executions)
 
+    def __len__(self) -> int:
+        """Return the number of kept runs."""
+        return len(self.executions)
 
+    def __repr__(self) -> str:
+        """Return a short summary of the history."""
+        return f"ActionHistory(name={self.name!r}, repeats={self.repeats}, passed={self.passed}, failed={self.failed})"
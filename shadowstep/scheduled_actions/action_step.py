@@ -10,22 +10,56 @@ in the Shadowstep automation framework.
 """
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
+from shadowstep.locator import LocatorConverter
+
 if TYPE_CHECKING:
     from shadowstep.element.element import Element
+    from shadowstep.locator import UiSelector
+
+# Step types supported by the UiAutomator2 server
+GESTURE_STEP = "gesture"
+SOURCE_STEP = "source"
+SCREENSHOT_STEP = "screenshot"
 
 
+@dataclass(frozen=True)
 class ActionStep:
     """Represents a single action step in scheduled actions.
 
     This class provides static methods for creating various types of
     action steps that can be scheduled and executed in the Shadowstep
     automation framework.
+
+    Attributes:
+        step_type: "gesture", "source" or "screenshot".
+        name: Step name, reported in the action history.
+        payload: Step payload as sent to the server.
+
+    Example:
+        allow = ActionStep.gesture_click("allow", {"text": "Allow"})
+        app.schedule_action("permissions", [allow], interval_ms=500, times=600)
+
     """
 
+    step_type: str
+    name: str
+    payload: dict[str, Any] = field(default_factory=dict)  # type: ignore[var-annotated]
+
+    def __post_init__(self) -> None:
+        """Validate the step."""
+        if not self.name:
+            msg = "Step name must not be empty"
+            raise ValueError(msg)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the step in the format of mobile: scheduleAction."""
+        return {"type": self.step_type, "name": self.name, "payload": dict(self.payload)}
+
     @staticmethod
-    def gesture_click(name: str, locator: tuple[str, str] | dict[str, Any] | Element) -> ActionStep:
+    def gesture_click(name: str, locator: tuple[str, str] | dict[str, Any] | Element | UiSelector) -> ActionStep:
         """Create click gesture action step.
 
         Args:
@@ -36,10 +70,13 @@ class ActionStep:
             ActionStep: Click action step.
 
         """
-        raise NotImplementedError
+        return ActionStep(GESTURE_STEP, name, {"subtype": "click", "locator": ActionStep.server_locator(locator)})
 
     @staticmethod
-    def gesture_long_click(name: str, locator: tuple[str, str] | dict[str, Any] | Element) -> ActionStep:
+    def gesture_long_click(
+        name: str,
+        locator: tuple[str, str] | dict[str, Any] | Element | UiSelector,
+    ) -> ActionStep:
         """Create long click gesture action step.
 
         Args:
@@ -50,7 +87,7 @@ class ActionStep:
             ActionStep: Long click action step.
 
         """
-        raise NotImplementedError
+        return ActionStep(GESTURE_STEP, name, {"subtype": "longClick", "locator": ActionStep.server_locator(locator)})
 
     @staticmethod
     def gesture_double_click(name: str, element_id: str, x: int, y: int) -> ActionStep:
@@ -66,7 +103,7 @@ class ActionStep:
             ActionStep: Double click action step.
 
         """
-        raise NotImplementedError
+        return ActionStep(GESTURE_STEP, name, {"subtype": "doubleClick", "elementId": element_id, "x": x, "y": y})
 
     @staticmethod
     def source(name: str) -> ActionStep:
@@ -79,7 +116,7 @@ class ActionStep:
             ActionStep: Source action step.
 
         """
-        raise NotImplementedError
+        return ActionStep(SOURCE_STEP, name, {"subtype": "xml"})
 
     @staticmethod
     def screenshot(name: str) -> ActionStep:
@@ -92,4 +129,20 @@ class ActionStep:
             ActionStep: Screenshot action step.
 
         """
-        raise NotImplementedError
+        return ActionStep(SCREENSHOT_STEP, name, {"subtype": "png"})
+
+    @staticmethod
+    def server_locator(locator: tuple[str, str] | dict[str, Any] | Element | UiSelector) -> dict[str, str]:
+        """Convert a Shadowstep locator to the {"strategy", "selector"} form of step payloads.
+
+        Tuples keep their strategy; dicts, UiSelectors and elements are located by XPath.
+
+        Args:
+            locator: Element locator.
+
+        Returns:
+            dict[str, str]: Server-side locator.
+
+        """
+        strategy, selector = LocatorConverter().to_xpath(locator)
+        return {"strategy": strategy, "selector": selector}
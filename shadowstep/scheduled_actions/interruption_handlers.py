@@ -0,0 +1,273 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+"""Background handling of system dialogs and other interruptions.
+
+Each registered handler is a locator and a gesture, e.g. the "Allow" button of
+a permission dialog and a click. Installed handlers run as repeating scheduled
+actions inside the UiAutomator2 server: the server looks for the element every
+interval and taps it when it is there, so tests need no defensive visibility
+checks before their steps. A run of a handler passes only when the element was
+found and tapped, which is how the handler histories, pulled periodically on a
+background thread, tell what fired.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Literal
+
+from typing_extensions import Self
+
+from shadowstep.scheduled_actions.action_step import ActionStep
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import TracebackType
+
+    from shadowstep.element.element import Element
+    from shadowstep.locator import UiSelector
+    from shadowstep.scheduled_actions.action_history import ActionHistory
+    from shadowstep.shadowstep import Shadowstep
+
+logger = logging.getLogger(__name__)
+
+# Prefix of the scheduled action names of handlers
+HANDLER_ACTION_PREFIX = "shadowstep.interruption."
+# Milliseconds between two looks for the interruption on the device
+DEFAULT_HANDLER_INTERVAL_MS = 500
+# Runs of a handler, 12 hours at the default interval
+DEFAULT_HANDLER_TIMES = 86_400
+# Runs the server keeps per handler; failed runs (nothing to dismiss) count too
+DEFAULT_HANDLER_HISTORY_ITEMS = 100
+# Seconds between pulls of the handler histories
+DEFAULT_REPORT_INTERVAL = 5.0
+
+HandlerGesture = Literal["click", "long_click"]
+
+
+@dataclass(frozen=True)
+class InterruptionHandler:
+    """Locator of an interruption and the gesture dismissing it."""
+
+    name: str
+    locator: tuple[str, str] | dict[str, Any] | Element | UiSelector
+    gesture: HandlerGesture = "click"
+
+    @property
+    def action_name(self) -> str:
+        """Name of the scheduled action running the handler."""
+        return HANDLER_ACTION_PREFIX + self.name
+
+    def step(self) -> ActionStep:
+        """Step performing the gesture on the server."""
+        if self.gesture == "long_click":
+            return ActionStep.gesture_long_click(self.name, self.locator)
+        return ActionStep.gesture_click(self.name, self.locator)
+
+
+@dataclass(frozen=True)
+class HandlerEvent:
+    """A handler found its interruption and dismissed it."""
+
+    handler: str
+    timestamp: int
+
+
+class InterruptionHandlers:
+    """Registry of interruption handlers installed as server-side scheduled actions.
+
+    Attributes:
+        events: Every time a handler fired, in order, as far as the pulled
+            histories tell.
+        on_fired: Called with each new HandlerEvent from the thread pulling
+            the histories.
+
+    Example:
+        app.interruption_handlers.register("allow", {"text": "Allow"})
+        app.interruption_handlers.register("not now", {"text": "Not now"})
+        with app.interruption_handlers:
+            run_scenario()
+        print(app.interruption_handlers.events)
+
+    """
+
+    def __init__(
+        self,
+        shadowstep: Shadowstep,
+        interval_ms: int = DEFAULT_HANDLER_INTERVAL_MS,
+        report_interval: float | None = DEFAULT_REPORT_INTERVAL,
+    ) -> None:
+        """Initialize the InterruptionHandlers.
+
+        Args:
+            shadowstep: Session the handlers run in.
+            interval_ms: Milliseconds between two looks for each interruption.
+            report_interval: Seconds between pulls of the handler histories;
+                None pulls only on poll() and uninstall().
+
+        """
+        self.shadowstep = shadowstep
+        self.interval_ms = interval_ms
+        self.times = DEFAULT_HANDLER_TIMES
+        self.max_history_items = DEFAULT_HANDLER_HISTORY_ITEMS
+        self.report_interval = report_interval
+        self.events: list[HandlerEvent] = []
+        self.on_fired: Callable[[HandlerEvent], None] | None = None
+        self._handlers: dict[str, InterruptionHandler] = {}
+        self._installed: set[str] = set()
+        self._active = False
+        # Start of the newest run already reported, per handler
+        self._seen: dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._thread: threading.Thread | None = None
+        self._stop_evt = threading.Event()
+
+    def register(
+        self,
+        name: str,
+        locator: tuple[str, str] | dict[str, Any] | Element | UiSelector,
+        gesture: HandlerGesture = "click",
+    ) -> Self:
+        """Add a handler, or replace the one with the same name.
+
+        A handler added while the handlers are installed starts right away.
+
+        Args:
+            name: Handler name, reported in events.
+            locator: Element that shows the interruption, e.g. {"text": "Allow"}.
+            gesture: "click" or "long_click" on the element.
+
+        Returns:
+            Self: For chaining.
+
+        """
+        handler = InterruptionHandler(name, locator, gesture)
+        handler.step()  # the locator must convert before anything is scheduled
+        with self._lock:
+            if name in self._installed:
+                self._uninstall_one(name)
+            self._handlers[name] = handler
+            if self._active:
+                self._install_one(handler)
+        return self
+
+    def unregister(self, name: str) -> Self:
+        """Remove a handler; it stops on the server if it is installed."""
+        with self._lock:
+            if name in self._installed:
+                self._uninstall_one(name)
+            self._handlers.pop(name, None)
+        return self
+
+    @property
+    def installed(self) -> bool:
+        """Whether the handlers are running on the server."""
+        return self._active
+
+    def install(self) -> Self:
+        """Schedule every handler on the server and start reporting what fires."""
+        with self._lock:
+            self._active = True
+            for handler in self._handlers.values():
+                if handler.name not in self._installed:
+                    self._install_one(handler)
+        if self.report_interval is not None and self._thread is None:
+            self._stop_evt.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True, name="ShadowstepInterruptionHandlers")
+            self._thread.start()
+        logger.info("Installed interruption handlers: %s", ", ".join(self._handlers) or "none")
+        return self
+
+    def uninstall(self) -> list[HandlerEvent]:
+        """Unschedule every handler and return all events, including those of the final histories."""
+        self._active = False
+        self._stop_evt.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            for name in list(self._installed):
+                self._uninstall_one(name)
+        logger.info("Uninstalled interruption handlers, %d fired", len(self.events))
+        return list(self.events)
+
+    def poll(self) -> list[HandlerEvent]:
+        """Pull the histories of the installed handlers and return the events new since the last pull."""
+        new: list[HandlerEvent] = []
+        with self._lock:
+            for name in list(self._installed):
+                try:
+                    history = self.shadowstep.get_action_history(self._handlers[name].action_name)
+                except Exception as error:  # noqa: BLE001
+                    logger.debug("Cannot pull history of handler '%s': %s", name, error)
+                    continue
+                new.extend(self._record(name, history))
+        return new
+
+    def _install_one(self, handler: InterruptionHandler) -> None:
+        """Schedule one handler."""
+        self.shadowstep.schedule_action(
+            handler.action_name,
+            [handler.step()],
+            interval_ms=self.interval_ms,
+            times=self.times,
+            max_history_items=self.max_history_items,
+        )
+        self._installed.add(handler.name)
+        self._seen.setdefault(handler.name, 0)
+
+    def _uninstall_one(self, name: str) -> None:
+        """Unschedule one handler and report what its final history shows."""
+        self._installed.discard(name)
+        try:
+            history = self.shadowstep.unschedule_action(self._handlers[name].action_name)
+        except Exception as error:  # noqa: BLE001
+            logger.warning("Cannot unschedule handler '%s': %s", name, error)
+            return
+        self._record(name, history)
+
+    def _record(self, name: str, history: ActionHistory) -> list[HandlerEvent]:
+        """Turn the passed runs of a handler newer than the last reported one into events."""
+        runs = history.since(self._seen.get(name, 0))
+        if runs:
+            self._seen[name] = runs[0][0].timestamp
+        new = [HandlerEvent(name, run[0].timestamp) for run in reversed(runs) if all(step.passed for step in run)]
+        for event in new:
+            logger.info("Interruption handler '%s' fired at %d", name, event.timestamp)
+            self.events.append(event)
+            if self.on_fired is not None:
+                try:
+                    self.on_fired(event)
+                except Exception:
+                    logger.exception("on_fired callback failed for handler '%s'", name)
+        return new
+
+    def _run(self) -> None:
+        """Pull the handler histories every report_interval until uninstalled."""
+        interval = self.report_interval or DEFAULT_REPORT_INTERVAL
+        while not self._stop_evt.wait(interval):
+            self.poll()
+
+    def __contains__(self, name: object) -> bool:
+        """Check whether a handler with the name is registered."""
+        return name in self._handlers
+
+    def __len__(self) -> int:
+        """Return the number of registered handlers."""
+        return len(self._handlers)
+
+    def __enter__(self) -> Self:
+        """Install the handlers."""
+        return self.install()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Uninstall the handlers."""
+        self.uninstall()
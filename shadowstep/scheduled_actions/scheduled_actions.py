@@ -9,3 +9,181 @@ scheduled actions in the Shadowstep automation framework,
 including action queuing, execution, and history tracking.
 https://github.com/appium/appium-uiautomator2-driver?tab=readme-ov-file#mobile-scheduleaction
 """
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from typing_extensions import Self
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from types import TracebackType
+
+    from shadowstep.scheduled_actions.action_history import ActionHistory
+    from shadowstep.scheduled_actions.action_step import ActionStep
+    from shadowstep.shadowstep import Shadowstep
+
+logger = logging.getLogger(__name__)
+
+# Defaults of the UiAutomator2 server
+DEFAULT_INTERVAL_MS = 1000
+DEFAULT_TIMES = 1
+DEFAULT_MAX_HISTORY_ITEMS = 20
+
+
+def action_params(  # noqa: PLR0913
+    name: str,
+    steps: Sequence[ActionStep],
+    interval_ms: int = DEFAULT_INTERVAL_MS,
+    times: int = DEFAULT_TIMES,
+    max_pass: int | None = None,
+    max_fail: int | None = None,
+    max_history_items: int = DEFAULT_MAX_HISTORY_ITEMS,
+) -> dict[str, Any]:
+    """Build the arguments of mobile: scheduleAction.
+
+    Args:
+        name: Unique action name.
+        steps: Steps run in order on every run.
+        interval_ms: Pause between runs in milliseconds.
+        times: How many times to run the action.
+        max_pass: Stop after N successful runs.
+        max_fail: Stop after N failed runs.
+        max_history_items: How many runs the server keeps in the history.
+
+    Returns:
+        dict[str, Any]: Command arguments.
+
+    Raises:
+        ValueError: If the name or steps are empty or a limit is out of range.
+
+    """
+    if not name:
+        msg = "Action name must not be empty"
+        raise ValueError(msg)
+    if not steps:
+        msg = f"Action '{name}' has no steps"
+        raise ValueError(msg)
+    if interval_ms < 0:
+        msg = f"Interval must be non-negative, got {interval_ms}"
+        raise ValueError(msg)
+    for label, value in (("times", times), ("max_history_items", max_history_items),
+                         ("max_pass", max_pass), ("max_fail", max_fail)):
+        if value is not None and value < 1:
+            msg = f"{label} must be positive, got {value}"
+            raise ValueError(msg)
+    params: dict[str, Any] = {
+        "name": name,
+        "steps": [step.to_dict() for step in steps],
+        "intervalMs": interval_ms,
+        "times": times,
+        "maxHistoryItems": max_history_items,
+    }
+    if max_pass is not None:
+        params["maxPass"] = max_pass
+    if max_fail is not None:
+        params["maxFail"] = max_fail
+    return params
+
+
+class ScheduledAction:
+    """Server-side action scheduled for the duration of a with block.
+
+    The steps run inside the UiAutomator2 server, so repeating work (dismissing
+    popups, capturing the source) costs no client round-trips while the test
+    runs. Leaving the block unschedules the action and keeps its final history.
+
+    Example:
+        allow = ActionStep.gesture_click("allow", {"text": "Allow"})
+        with app.scheduled_action("permissions", [allow], interval_ms=500, times=600) as action:
+            app.get_element({"text": "Start"}).tap()
+        print(action.final_history.passed)
+
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        shadowstep: Shadowstep,
+        name: str,
+        steps: Sequence[ActionStep],
+        interval_ms: int = DEFAULT_INTERVAL_MS,
+        times: int = DEFAULT_TIMES,
+        max_pass: int | None = None,
+        max_fail: int | None = None,
+        max_history_items: int = DEFAULT_MAX_HISTORY_ITEMS,
+    ) -> None:
+        """Initialize the ScheduledAction.
+
+        Args:
+            shadowstep: Session the action runs in.
+            name: Unique action name.
+            steps: Steps run in order on every run.
+            interval_ms: Pause between runs in milliseconds.
+            times: How many times to run the action.
+            max_pass: Stop after N successful runs.
+            max_fail: Stop after N failed runs.
+            max_history_items: How many runs the server keeps in the history.
+
+        """
+        self.shadowstep = shadowstep
+        self.name = name
+        self.steps = list(steps)
+        self.interval_ms = interval_ms
+        self.times = times
+        self.max_pass = max_pass
+        self.max_fail = max_fail
+        self.max_history_items = max_history_items
+        self.scheduled = False
+        # History returned when the action was unscheduled
+        self.final_history: ActionHistory | None = None
+
+    def start(self) -> Self:
+        """Schedule the action on the server; an action already scheduled is left as is."""
+        if self.scheduled:
+            return self
+        self.shadowstep.schedule_action(
+            self.name,
+            self.steps,
+            interval_ms=self.interval_ms,
+            times=self.times,
+            max_pass=self.max_pass,
+            max_fail=self.max_fail,
+            max_history_items=self.max_history_items,
+        )
+        self.scheduled = True
+        self.final_history = None
+        return self
+
+    def history(self) -> ActionHistory:
+        """Fetch the history of the running action, or the final one once stopped."""
+        if not self.scheduled and self.final_history is not None:
+            return self.final_history
+        return self.shadowstep.get_action_history(self.name)
+
+    def stop(self) -> ActionHistory | None:
+        """Unschedule the action and return its final history; None if it is not scheduled."""
+        if self.scheduled:
+            self.final_history = self.shadowstep.unschedule_action(self.name)
+            self.scheduled = False
+        return self.final_history
+
+    def __enter__(self) -> Self:
+        """Schedule the action."""
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Unschedule the action; a failure to do so does not hide an error raised in the block."""
+        if exc_type is None:
+            self.stop()
+            return
+        try:
+            self.stop()
+        except Exception:
+            logger.warning("Failed to unschedule action '%s'", self.name, exc_info=True)
+            self.scheduled = False
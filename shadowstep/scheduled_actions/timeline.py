@@ -0,0 +1,195 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+"""Server-side capture of a source and screenshot timeline for post-mortems.
+
+A TimelineRecorder schedules an action that takes the page source and a
+screenshot every interval inside the UiAutomator2 server; the server keeps
+the last max_items runs, so the test thread does no captures of its own. When
+the recorder stops, the history is pulled and written to a directory as a
+compact timeline: the first hierarchy in full and then only unified diffs of
+the hierarchies that changed, and only the frames whose fingerprint differs
+from the previous written frame. timeline.json lists, per run that changed
+something, its timestamp and the files written for it.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import difflib
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from shadowstep.exceptions.shadowstep_exceptions import ShadowstepImageLoadError
+from shadowstep.image.fingerprint import distance, fingerprint
+from shadowstep.scheduled_actions.action_step import ActionStep
+from shadowstep.scheduled_actions.scheduled_actions import ScheduledAction
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from shadowstep.scheduled_actions.action_history import ActionHistory, StepResult
+    from shadowstep.shadowstep import Shadowstep
+
+logger = logging.getLogger(__name__)
+
+# Name of the scheduled action and of its steps
+TIMELINE_ACTION = "shadowstep.timeline"
+SOURCE_STEP_NAME = "source"
+SCREENSHOT_STEP_NAME = "screenshot"
+# Runs of the action, 24 hours at one run per second
+DEFAULT_TIMELINE_TIMES = 86_400
+# Fingerprint bits a frame must differ in from the previous written one to be written
+TIMELINE_FRAME_DISTANCE = 2
+# Unchanged lines around each change in hierarchy diffs
+TIMELINE_DIFF_CONTEXT = 2
+# Manifest written next to the hierarchies and frames
+TIMELINE_MANIFEST = "timeline.json"
+
+
+def write_timeline(history: ActionHistory, directory: str | Path) -> Path:
+    """Write the runs of a timeline action as deduplicated hierarchies and frames.
+
+    Args:
+        history: History of an action with SOURCE_STEP_NAME and SCREENSHOT_STEP_NAME steps.
+        directory: Output directory, created if missing.
+
+    Returns:
+        Path: Path of the written manifest.
+
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    entries: list[dict[str, Any]] = []
+    previous_source: list[str] | None = None
+    previous_frame: np.ndarray[Any, Any] | None = None
+    # ActionHistory keeps the runs newest first, whatever order the server sent
+    for index, run in enumerate(reversed(history.executions)):
+        if not run:
+            continue
+        steps = {step.name: step for step in run}
+        entry: dict[str, Any] = {"timestamp": run[0].timestamp}
+
+        source = _text_result(steps.get(SOURCE_STEP_NAME))
+        if source is not None:
+            lines = source.splitlines(keepends=True)
+            if previous_source is None:
+                entry["source"] = _write(directory / f"{index:04}.xml", source)
+            elif lines != previous_source:
+                diff = difflib.unified_diff(
+                    previous_source, lines, "previous", f"{index:04}", n=TIMELINE_DIFF_CONTEXT,
+                )
+                entry["source_diff"] = _write(directory / f"{index:04}.diff", "".join(diff))
+            previous_source = lines
+
+        frame = _frame_result(steps.get(SCREENSHOT_STEP_NAME))
+        if frame is not None:
+            value = _frame_fingerprint(frame)
+            if previous_frame is None or value is None or distance(value, previous_frame) > TIMELINE_FRAME_DISTANCE:
+                path = directory / f"{index:04}.png"
+                path.write_bytes(frame)
+                entry["frame"] = path.name
+                previous_frame = value
+
+        errors = [f"{step.name}: {step.exception.message}" for step in run if step.exception is not None]
+        if errors:
+            entry["errors"] = errors
+        if len(entry) > 1:
+            entries.append(entry)
+
+    manifest = directory / TIMELINE_MANIFEST
+    manifest.write_text(
+        json.dumps(
+            {"action": history.name, "repeats": history.repeats, "runs": len(history), "entries": entries},
+            indent=1,
+        ),
+        encoding="utf-8",
+    )
+    logger.info("Timeline of %d runs written to %s, %d with changes", len(history), directory, len(entries))
+    return manifest
+
+
+def _write(path: Path, text: str) -> str:
+    """Write a text file of the timeline and return its name for the manifest."""
+    path.write_text(text, encoding="utf-8")
+    return path.name
+
+
+def _text_result(step: StepResult | None) -> str | None:
+    """Result of a passed step as text, None if the step failed or returned nothing."""
+    if step is None or not step.passed or not isinstance(step.result, str):
+        return None
+    return step.result
+
+
+def _frame_result(step: StepResult | None) -> bytes | None:
+    """PNG of a passed screenshot step."""
+    text = _text_result(step)
+    if text is None:
+        return None
+    try:
+        return base64.b64decode(text)
+    except (binascii.Error, ValueError):
+        logger.warning("Screenshot of step '%s' is not base64", step.name if step else "")
+        return None
+
+
+def _frame_fingerprint(frame: bytes) -> np.ndarray[Any, Any] | None:
+    """Fingerprint of a frame, None if it cannot be decoded."""
+    try:
+        return fingerprint(frame)
+    except ShadowstepImageLoadError:
+        return None
+
+
+class TimelineRecorder(ScheduledAction):
+    """Source and screenshot timeline recorded by the server, written to disk on stop.
+
+    Attributes:
+        directory: Where the timeline is written.
+        manifest: Path of the written timeline.json, None before stop().
+
+    Example:
+        with app.record_timeline(interval_ms=500, max_items=120, directory="artifacts/login") as timeline:
+            run_flaky_scenario()
+        print(timeline.manifest)
+
+    """
+
+    def __init__(
+        self,
+        shadowstep: Shadowstep,
+        directory: str | Path,
+        interval_ms: int = 1000,
+        max_items: int = 60,
+    ) -> None:
+        """Initialize the TimelineRecorder.
+
+        Args:
+            shadowstep: Session to record.
+            directory: Where the timeline is written.
+            interval_ms: Milliseconds between two captures.
+            max_items: Captures the server keeps; older ones are dropped.
+
+        """
+        super().__init__(
+            shadowstep,
+            TIMELINE_ACTION,
+            [ActionStep.source(SOURCE_STEP_NAME), ActionStep.screenshot(SCREENSHOT_STEP_NAME)],
+            interval_ms=interval_ms,
+            times=DEFAULT_TIMELINE_TIMES,
+            max_history_items=max_items,
+        )
+        self.directory = Path(directory)
+        self.manifest: Path | None = None
+
+    def stop(self) -> ActionHistory | None:
+        """Unschedule the capture and write the timeline; None if it is not recording."""
+        was_scheduled = self.scheduled
+        history = super().stop()
+        if was_scheduled and history is not None:
+            self.manifest = write_timeline(history, self.directory)
+        return history
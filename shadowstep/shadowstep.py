@@ -15,6 +15,8 @@ from __future__ import annotations
 
 import base64
 import logging
+import time
+from collections.abc import Mapping
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal
 
@@ -24,21 +26,31 @@ from shadowstep.decorators.decorators import log_debug
 from shadowstep.decorators.shadowstep_decorators import fail_safe_shadowstep
 from shadowstep.element.element import Element
 from shadowstep.exceptions.shadowstep_exceptions import ShadowstepException
+from shadowstep.image.frame_cache import frame_cache
 from shadowstep.image.image import ShadowstepImage
+from shadowstep.image.ocr import DEFAULT_OCR_LANG
+from shadowstep.image.text_region import TextRegion
 from shadowstep.locator import LocatorConverter
 from shadowstep.navigator.navigator import PageNavigator
+from shadowstep.scheduled_actions.action_history import ActionHistory
+from shadowstep.scheduled_actions.interruption_handlers import InterruptionHandlers
+from shadowstep.scheduled_actions.scheduled_actions import ScheduledAction, action_params
+from shadowstep.scheduled_actions.timeline import TimelineRecorder
 from shadowstep.shadowstep_base import ShadowstepBase, WebDriverSingleton
 from shadowstep.ui_automator.mobile_commands import MobileCommands
 
 if TYPE_CHECKING:
+    from collections.abc import Hashable, Sequence
+
     import numpy as np
     from numpy._typing import NDArray
     from PIL import Image
     from selenium.types import WaitExcTypes
 
+    from shadowstep.image.image import SearchRegion
+    from shadowstep.image.matchers import ImageMatcher
     from shadowstep.locator import UiSelector
     from shadowstep.page_base import PageBaseShadowstep
-    from shadowstep.scheduled_actions.action_history import ActionHistory
     from shadowstep.scheduled_actions.action_step import ActionStep
 
 # Configure the root logger (basic configuration)
@@ -94,6 +106,7 @@ class Shadowstep(ShadowstepBase):
         self.navigator: PageNavigator = PageNavigator(self)
         self.converter: LocatorConverter = LocatorConverter()
         self.mobile_commands: MobileCommands = MobileCommands()
+        self.interruption_handlers: InterruptionHandlers = InterruptionHandlers(self)
         self.navigator.auto_discover_pages()
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         self._initialized = True
@@ -207,6 +220,8 @@ class Shadowstep(ShadowstepBase):
         image: bytes | NDArray[np.uint8] | Image.Image | str,
         threshold: float = 0.5,
         timeout: float = 5.0,
+        region: SearchRegion | None = None,
+        matcher: ImageMatcher | None = None,
     ) -> ShadowstepImage:
         """Return a lazy ShadowstepImage wrapper for the given template.
 
@@ -214,6 +229,10 @@ class Shadowstep(ShadowstepBase):
             image: template (bytes, ndarray, PIL.Image or path)
             threshold: matching threshold [0-1]  # noqa: RUF002
             timeout: max seconds to search
+            region: part of the screen searched first: pixel rect, screen
+                fractions, Element or "last" (see ShadowstepImage)
+            matcher: matching engine, e.g. FeatureMatcher("orb"); None uses
+                multi-scale template matching
 
         Returns:
             ShadowstepImage: Lazy object for image-actions.
@@ -223,6 +242,8 @@ class Shadowstep(ShadowstepBase):
             image=image,
             threshold=threshold,
             timeout=timeout,
+            region=region,
+            matcher=matcher,
         )
 
     @log_debug()
@@ -251,8 +272,118 @@ class Shadowstep(ShadowstepBase):
             ),
         ]
 
+    @log_debug()
+    def get_text_region(
+        self,
+        text: str,
+        threshold: float = 0.5,
+        timeout: float = 5.0,
+        region: SearchRegion | None = None,
+        lang: str = DEFAULT_OCR_LANG,
+    ) -> TextRegion:
+        """Return a lazy TextRegion for a phrase recognized on screen with OCR.
+
+        Args:
+            text: phrase to find, e.g. "Continue"
+            threshold: lowest OCR confidence of each word [0-1]  # noqa: RUF002
+            timeout: max seconds to search
+            region: part of the screen read first: pixel rect, screen
+                fractions, Element or "last" (see ShadowstepImage)
+            lang: Tesseract language, e.g. "eng" or "eng+rus"
+
+        Returns:
+            TextRegion: Lazy object for image-actions (tap, wait, coordinates...).
+
+        """
+        return TextRegion(
+            text,
+            threshold=threshold,
+            timeout=timeout,
+            region=region,
+            lang=lang,
+        )
+
+    @log_debug()
+    def find_all_of(
+        self,
+        images: Sequence[bytes | NDArray[np.uint8] | Image.Image | str]
+        | Mapping[Hashable, bytes | NDArray[np.uint8] | Image.Image | str],
+        threshold: float = 0.5,
+    ) -> dict[Hashable, ShadowstepImage | None]:
+        """Check which of several templates are on screen, using one screenshot.
+
+        Args:
+            images: Templates (bytes, ndarray, PIL.Image or path) as a sequence or
+                as a mapping of names to templates.
+            threshold: matching threshold [0-1]  # noqa: RUF002
+
+        Returns:
+            dict[Hashable, ShadowstepImage | None]: For every key of the mapping, or
+                index of the sequence, the found image with its coordinates cached,
+                or None if the template is not on screen.
+
+        Example:
+            found = app.find_all_of({"rate": "rate.png", "update": "update.png"})
+            if found["rate"]:
+                found["rate"].tap()
+
+        """
+        items = images.items() if isinstance(images, Mapping) else enumerate(images)
+        wrappers = {key: ShadowstepImage(image=image, threshold=threshold) for key, image in items}
+        coordinates = ShadowstepImage.locate_all(list(wrappers.values()))
+        return {
+            key: wrapper if coords is not None else None
+            for (key, wrapper), coords in zip(wrappers.items(), coordinates)
+        }
+
+    @log_debug()
+    def find_any(
+        self,
+        images: Sequence[bytes | NDArray[np.uint8] | Image.Image | str]
+        | Mapping[Hashable, bytes | NDArray[np.uint8] | Image.Image | str],
+        threshold: float = 0.5,
+        timeout: float = 5.0,
+        poll_frequency: float = 0.5,
+    ) -> tuple[Hashable, ShadowstepImage] | None:
+        """Wait until any of several templates is on screen.
+
+        The templates are loaded once. Each poll takes one screenshot and matches
+        the templates against it in order, up to the first one found.
+
+        Args:
+            images: Templates as a sequence or as a mapping of names to templates.
+            threshold: matching threshold [0-1]  # noqa: RUF002
+            timeout: max seconds to wait.
+            poll_frequency: seconds between polls.
+
+        Returns:
+            tuple[Hashable, ShadowstepImage] | None: key (or index) and image of the
+                first template, in input order, found on screen; None on timeout.
+
+        Example:
+            found = app.find_any(["allow.png", "deny.png"], timeout=10)
+            if found is not None:
+                found[1].tap()
+
+        """
+        items = images.items() if isinstance(images, Mapping) else enumerate(images)
+        keys: list[Hashable] = []
+        wrappers: list[ShadowstepImage] = []
+        for key, image in items:
+            keys.append(key)
+            wrappers.append(ShadowstepImage(image=image, threshold=threshold))
+        deadline = time.monotonic() + timeout
+        while True:
+            index = ShadowstepImage.locate_first(wrappers)
+            if index is not None:
+                return keys[index], wrappers[index]
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(poll_frequency)
+
     # ------------------------- schedule -------------------------
 
+    @fail_safe_shadowstep(raise_exception=ShadowstepException)
     @log_debug()
     def schedule_action(  # noqa: PLR0913
         self,
@@ -266,9 +397,13 @@ class Shadowstep(ShadowstepBase):
     ) -> Shadowstep:
         """Schedule a server-side action sequence.
 
+        The steps run inside the UiAutomator2 server every interval_ms, without
+        client round-trips, until the action ran times times, reached max_pass
+        or max_fail, or is unscheduled.
+
         Args:
             name: unique action name.
-            steps: List of steps (GestureStep, SourceStep, ScreenshotStep, etc.).
+            steps: List of steps built with ActionStep (gesture_click, source, screenshot, etc.).
             interval_ms: Pause between runs in milliseconds.
             times: How many times to attempt execution.
             max_pass: Stop after N successful runs.
@@ -278,10 +413,16 @@ class Shadowstep(ShadowstepBase):
         Returns:
             self — for convenient chaining.
 
+        Raises:
+            ValueError: If the name or steps are empty or a limit is out of range.
+
         """
-        # shadowstep/scheduled_actions
-        raise NotImplementedError
+        self.mobile_commands.schedule_action(
+            action_params(name, steps, interval_ms, times, max_pass, max_fail, max_history_items),
+        )
+        return self
 
+    @fail_safe_shadowstep(raise_exception=ShadowstepException)
     @log_debug()
     def get_action_history(self, name: str) -> ActionHistory:
         """Fetch the execution history for the named action.
@@ -293,9 +434,9 @@ class Shadowstep(ShadowstepBase):
             ActionHistory — convenient wrapper over JSON response.
 
         """
-        # shadowstep/scheduled_actions
-        raise NotImplementedError
+        return ActionHistory(self.mobile_commands.get_action_history({"name": name}), name)
 
+    @fail_safe_shadowstep(raise_exception=ShadowstepException)
     @log_debug()
     def unschedule_action(self, name: str) -> ActionHistory:
         """Unschedule the action and return its final history.
@@ -307,8 +448,68 @@ class Shadowstep(ShadowstepBase):
             ActionHistory — history of all executions until cancellation.
 
         """
-        # shadowstep/scheduled_actions
-        raise NotImplementedError
+        return ActionHistory(self.mobile_commands.unschedule_action({"name": name}), name)
+
+    def scheduled_action(  # noqa: PLR0913
+        self,
+        name: str,
+        steps: list[ActionStep],
+        interval_ms: int = 1000,
+        times: int = 1,
+        max_pass: int | None = None,
+        max_fail: int | None = None,
+        max_history_items: int = 20,
+    ) -> ScheduledAction:
+        """Return a context manager scheduling the action for the duration of a with block.
+
+        Args:
+            name: unique action name.
+            steps: List of steps built with ActionStep.
+            interval_ms: Pause between runs in milliseconds.
+            times: How many times to attempt execution.
+            max_pass: Stop after N successful runs.
+            max_fail: Stop after N failures.
+            max_history_items: How many records to keep in history.
+
+        Returns:
+            ScheduledAction: Scheduled on enter, unscheduled on exit.
+
+        Example:
+            with app.scheduled_action("snapshots", [ActionStep.source("xml")], times=30) as action:
+                ...
+            print(action.final_history)
+
+        """
+        return ScheduledAction(self, name, steps, interval_ms, times, max_pass, max_fail, max_history_items)
+
+    def record_timeline(
+        self,
+        interval_ms: int = 1000,
+        max_items: int = 60,
+        directory: str | Path = "timeline",
+    ) -> TimelineRecorder:
+        """Start recording the page source and screen on the server for a post-mortem.
+
+        The UiAutomator2 server captures the source and a screenshot every
+        interval_ms and keeps the last max_items captures; the test thread does no
+        polling. Stopping the recorder pulls the captures and writes a deduplicated
+        timeline of hierarchy diffs and frames to directory.
+
+        Args:
+            interval_ms: Milliseconds between two captures.
+            max_items: Captures the server keeps; older ones are dropped.
+            directory: Where the timeline is written.
+
+        Returns:
+            TimelineRecorder: Recording; stop() or leaving a with block writes the timeline.
+
+        Example:
+            with app.record_timeline(interval_ms=500, max_items=120, directory="artifacts/login") as timeline:
+                run_flaky_scenario()
+            print(timeline.manifest)
+
+        """
+        return TimelineRecorder(self, directory, interval_ms, max_items).start()
 
     # ------------------------- logcat -------------------------
 
@@ -3097,12 +3298,17 @@ class Shadowstep(ShadowstepBase):
     def get_screenshot(self) -> bytes:
         """Get screenshot as bytes.
 
+        Every call takes a new screenshot; it is kept in the frame cache so image
+        operations reading the same bytes share its decoded arrays.
+
         Returns:
             bytes: Screenshot data in binary format.
 
         """
-        screenshot = self.driver.get_screenshot_as_base64().encode("utf-8")
-        return base64.b64decode(screenshot)
+        driver = self.driver
+        return frame_cache.capture(
+            driver, lambda: base64.b64decode(driver.get_screenshot_as_base64().encode("utf-8")),
+        ).data
 
     # Override
     @fail_safe_shadowstep(raise_exception=ShadowstepException)
@@ -15,9 +15,44 @@ from typing import Any, ClassVar
 
 from typing_extensions import Self
 
+from shadowstep.image.frame_cache import frame_cache
 from shadowstep.utils.utils import get_current_func_name
 from shadowstep.web_driver.web_driver_singleton import WebDriverSingleton
 
+# Commands that never change the screen and so keep the cached screenshot valid
+READ_ONLY_COMMANDS = frozenset(
+    {
+        "mobile: batteryInfo",
+        "mobile: deviceInfo",
+        "mobile: getActionHistory",
+        "mobile: getAppStrings",
+        "mobile: getClipboard",
+        "mobile: getConnectivity",
+        "mobile: getContexts",
+        "mobile: getCurrentActivity",
+        "mobile: getCurrentPackage",
+        "mobile: getDeviceTime",
+        "mobile: getDisplayDensity",
+        "mobile: getGeolocation",
+        "mobile: getNotifications",
+        "mobile: getPerformanceData",
+        "mobile: getPerformanceDataTypes",
+        "mobile: getPermissions",
+        "mobile: getSystemBars",
+        "mobile: getUiMode",
+        "mobile: isAppInstalled",
+        "mobile: isGpsEnabled",
+        "mobile: isKeyboardShown",
+        "mobile: isLocked",
+        "mobile: isMediaProjectionRecordingRunning",
+        "mobile: listSms",
+        "mobile: pullFile",
+        "mobile: pullFolder",
+        "mobile: queryAppState",
+        "mobile: screenshots",
+    },
+)
+
 
 class MobileCommands:
     """Singleton mobile commands wrapper for Appium automation.
@@ -2687,4 +2722,8 @@ class MobileCommands:
     def _execute(self, name: str, params: dict[str, Any] | list[Any] | None) -> Any:
         # https://github.com/appium/appium-uiautomator2-driver/blob/master/docs/android-mobile-gestures.md
         driver = WebDriverSingleton.get_driver()
-        return driver.execute_script(name, params or {})  # type: ignore[reportUnknownMemberType]
+        try:
+            return driver.execute_script(name, params or {})  # type: ignore[reportUnknownMemberType]
+        finally:
+            if name not in READ_ONLY_COMMANDS:
+                frame_cache.invalidate()
@@ -0,0 +1,280 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Run image matching engines over a corpus of screenshots with expected boxes.
+
+A corpus is a directory with a corpus.json manifest:
+
+    {"cases": [{"screen": "home.png", "template": "wifi.png", "boxes": [[x1, y1, x2, y2], ...]}, ...]}
+
+Paths are relative to the directory. "boxes" lists every occurrence of the
+template on the screen; an empty list marks a screen without it, which counts
+against precision when an engine reports a match there.
+
+Each engine runs over every case --rounds times. The report gives wall latency
+percentiles, mean CPU time, the peak of memory traced by tracemalloc (Python and
+numpy allocations, measured in a separate untimed pass, as tracing slows
+matching down), and precision/recall with IoU >= --iou.
+
+Engines:
+    multi_scale  multi_scale_matching with threshold and scale prior, box at the matched scale
+    locate       ShadowstepImage.locate_in, the box visibility checks report
+    find_all     ShadowstepImage.find_all on the screenshot, every occurrence
+    <detector>   ShadowstepImage.locate_in with a FeatureMatcher, per available detector
+
+Usage:
+    PYTHONPATH=. python tests/test_benchmark/benchmark_image_corpus.py --generate CORPUS_DIR
+    PYTHONPATH=. python tests/test_benchmark/benchmark_image_corpus.py CORPUS_DIR [--rounds N] [--json OUT]
+"""
+import argparse
+import base64
+import json
+import logging
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from shadowstep.image.frame_cache import frame_cache
+from shadowstep.image.image import ShadowstepImage
+from shadowstep.image.match_cache import match_cache
+from shadowstep.image.matchers import FEATURE_DETECTORS, FeatureMatcher
+from shadowstep.image.scale_prior import scale_prior
+from shadowstep.image.template_cache import template_cache
+from tests.test_benchmark.benchmark_image_matching import SCREEN_SIZE, TEMPLATES_DIR, iou, place, synthetic_screen
+
+MANIFEST = "corpus.json"
+PERCENTILES = (50, 90, 99)
+
+
+class ScreenshotDriver:
+    """Driver stand-in serving one screenshot, for engines that capture the screen."""
+
+    capabilities = {}
+
+    def __init__(self, png):
+        self._encoded = base64.b64encode(png).decode()
+
+    def get_screenshot_as_base64(self):
+        return self._encoded
+
+
+class Session:
+    """Shadowstep stand-in holding the driver."""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+
+def load_corpus(directory):
+    """Return (name, screen bytes, template path, expected boxes) for every case of a corpus."""
+    manifest = json.loads((directory / MANIFEST).read_text(encoding="utf-8"))
+    cases = []
+    for case in manifest["cases"]:
+        screen = (directory / case["screen"]).read_bytes()
+        template = str(directory / case["template"])
+        boxes = [tuple(box) for box in case["boxes"]]
+        cases.append((f"{case['screen']}:{case['template']}", screen, template, boxes))
+    return cases
+
+
+def generate_corpus(directory, seed, count):
+    """Write a synthetic corpus: repo templates pasted onto UI-like screens, plus absent cases."""
+    rng = np.random.default_rng(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    template_paths = sorted(TEMPLATES_DIR.glob("*.png"))
+    templates = {path.name: cv2.imread(str(path), cv2.IMREAD_GRAYSCALE) for path in template_paths}
+    for name, template in templates.items():
+        cv2.imwrite(str(directory / name), template)
+    cases = []
+    for index in range(count):
+        screen = synthetic_screen(rng)
+        names = list(templates)
+        present, absent = names[index % len(names)], names[(index + 1) % len(names)]
+        placed = place(templates[present], float(rng.choice((0.75, 1.0, 1.25))), 0.0)
+        height, width = placed.shape
+        boxes = []
+        for _ in range(1 + index % 2):  # every second screen shows the template twice
+            x = int(rng.integers(0, SCREEN_SIZE[0] - width))
+            y = int(rng.integers(0, SCREEN_SIZE[1] - height))
+            if any(iou((x, y, x + width, y + height), box) > 0 for box in boxes):
+                continue
+            screen[y:y + height, x:x + width] = placed
+            boxes.append([x, y, x + width, y + height])
+        screen_name = f"screen_{index:03}.png"
+        cv2.imwrite(str(directory / screen_name), screen)
+        cases.append({"screen": screen_name, "template": present, "boxes": boxes})
+        cases.append({"screen": screen_name, "template": absent, "boxes": []})
+    (directory / MANIFEST).write_text(json.dumps({"cases": cases}, indent=1), encoding="utf-8")
+    print(f"Wrote {len(cases)} cases to {directory}")
+
+
+def make_image(template, screen, threshold, matcher=None):
+    image = ShadowstepImage(template, threshold=threshold, matcher=matcher)
+    image.shadowstep = Session(ScreenshotDriver(screen))
+    return image
+
+
+def locate_engine(threshold, matcher=None):
+    """Engine finding the best match on a decoded screen."""
+
+    def run(screen, template):
+        image = make_image(template, screen, threshold, matcher)
+        gray = cv2.imdecode(np.frombuffer(screen, np.uint8), cv2.IMREAD_GRAYSCALE)
+        found = image.locate_in(gray)
+        return [] if found is None else [found]
+
+    return run
+
+
+def multi_scale_engine(threshold):
+    """Engine scoring the matcher itself: the box is the template resized to the matched scale."""
+
+    def run(screen, template):
+        image = make_image(template, screen, threshold)
+        gray = cv2.imdecode(np.frombuffer(screen, np.uint8), cv2.IMREAD_GRAYSCALE)
+        template_gray = image._load_template(image._image, image._template_key)
+        value, (x, y), scale = image._match_with_prior(gray, template_gray, image._template_key)
+        if value < threshold:
+            return []
+        height, width = template_gray.shape
+        return [(x, y, x + int(width * scale), y + int(height * scale))]
+
+    return run
+
+
+def find_all_engine(threshold):
+    """Engine returning every occurrence, screenshot decoding included."""
+
+    def run(screen, template):
+        frame_cache.clear()
+        return make_image(template, screen, threshold).find_all()
+
+    return run
+
+
+def score(found, expected, min_iou):
+    """Count true positives, false positives and false negatives of one case."""
+    unmatched = list(expected)
+    true_positives = 0
+    for box in found:
+        best = max(unmatched, key=lambda candidate: iou(box, candidate), default=None)
+        if best is not None and iou(box, best) >= min_iou:
+            unmatched.remove(best)
+            true_positives += 1
+    return true_positives, len(found) - true_positives, len(unmatched)
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(share / 100 * len(ordered)) - 1))]
+
+
+def reset_caches():
+    for cache in (template_cache, scale_prior, frame_cache, match_cache):
+        cache.clear()
+
+
+def measure(name, engine, cases, rounds, min_iou):
+    """Run an engine over the corpus and return its metrics."""
+    latencies, cpu_times = [], []
+    totals = [0, 0, 0]
+    misses = []
+    for round_index in range(rounds):
+        reset_caches()
+        for case_name, screen, template, expected in cases:
+            wall, cpu = time.perf_counter(), time.process_time()
+            found = engine(screen, template)
+            latencies.append((time.perf_counter() - wall) * 1000)
+            cpu_times.append((time.process_time() - cpu) * 1000)
+            if round_index == 0:
+                counts = score(found, expected, min_iou)
+                totals = [total + count for total, count in zip(totals, counts)]
+                if counts[1] or counts[2]:
+                    misses.append(case_name)
+
+    reset_caches()
+    peak = 0
+    tracemalloc.start()
+    for _, screen, template, _ in cases:
+        tracemalloc.reset_peak()
+        engine(screen, template)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+
+    true_positives, false_positives, false_negatives = totals
+    return {
+        "engine": name,
+        "cases": len(cases),
+        "rounds": rounds,
+        **{f"p{share}_ms": percentile(latencies, share) for share in PERCENTILES},
+        "mean_ms": statistics.mean(latencies),
+        "cpu_ms": statistics.mean(cpu_times),
+        "peak_mib": peak / 2**20,
+        "precision": true_positives / (true_positives + false_positives) if true_positives + false_positives else 1.0,
+        "recall": true_positives / (true_positives + false_negatives) if true_positives + false_negatives else 1.0,
+        "errors": misses,
+    }
+
+
+def print_report(results):
+    header = f"{'engine':<12}" + "".join(f"{f'p{share}':>9}" for share in PERCENTILES)
+    print(f"{header}{'cpu':>9}{'peak':>10}{'precision':>11}{'recall':>8}")
+    for result in results:
+        latencies = "".join(f"{result[f'p{share}_ms']:7.1f}ms" for share in PERCENTILES)
+        print(
+            f"{result['engine']:<12}{latencies}{result['cpu_ms']:7.1f}ms{result['peak_mib']:7.1f}MiB"
+            f"{result['precision']:>11.1%}{result['recall']:>8.1%}",
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", type=Path, nargs="?", help="directory with corpus.json")
+    parser.add_argument("--generate", type=Path, help="write a synthetic corpus to this directory and exit")
+    parser.add_argument("--cases", type=int, default=12, help="screens of a generated corpus")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.7, help="template engine threshold (ShadowstepImage default)")
+    parser.add_argument("--feature-threshold", type=float, default=0.5, help="feature matcher threshold")
+    parser.add_argument("--iou", type=float, default=0.5, help="overlap counted as a correct box")
+    parser.add_argument("--engines", nargs="*", help="engines to run, default all")
+    parser.add_argument("--json", type=Path, help="also write the results here")
+    args = parser.parse_args()
+
+    if args.generate is not None:
+        generate_corpus(args.generate, args.seed, args.cases)
+        return
+    if args.corpus is None:
+        parser.error("a corpus directory or --generate is required")
+
+    logging.disable(logging.INFO)
+    cases = load_corpus(args.corpus)
+    engines = {
+        "multi_scale": multi_scale_engine(args.threshold),
+        "locate": locate_engine(args.threshold),
+        "find_all": find_all_engine(args.threshold),
+    }
+    for detector in FEATURE_DETECTORS:
+        if hasattr(cv2, f"{detector.upper()}_create"):
+            engines[detector] = locate_engine(args.feature_threshold, FeatureMatcher(detector))
+    selected = args.engines or list(engines)
+    print(f"{len(cases)} cases from {args.corpus}, {args.rounds} rounds")
+
+    results = [measure(name, engines[name], cases, args.rounds, args.iou) for name in selected]
+    print_report(results)
+    for result in results:
+        if result["errors"]:
+            print(f"{result['engine']}: wrong on {', '.join(result['errors'][:5])}{' ...' if len(result['errors']) > 5 else ''}")
+    if args.json is not None:
+        args.json.write_text(json.dumps(results, indent=1), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Compare template matching engines: exhaustive, coarse-to-fine and keypoint-based.
+
+Templates from tests/test_integro/_test_data are pasted at known positions and
+scales onto 1080x2400 screens, then located with each engine. A second set of
+cases also rotates the templates by --rotation degrees. Screens are recorded
+screenshots from --screens (any PNG/JPEG, resized to 1080x2400) or synthetic
+UI-like backgrounds when no directory is given.
+
+Usage:
+    PYTHONPATH=. python tests/test_benchmark/benchmark_image_matching.py [--screens DIR] [--rounds N] [--rotation DEG]
+"""
+import argparse
+import logging
+import statistics
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from shadowstep.image.image import MATCH_SCALES, ShadowstepImage
+from shadowstep.image.matchers import FeatureMatcher
+from shadowstep.image.matching_pool import set_matching_workers
+from shadowstep.image.scale_prior import scale_prior
+from shadowstep.image.template_cache import template_cache
+
+SCREEN_SIZE = (1080, 2400)
+TEMPLATES_DIR = Path(__file__).parent.parent / "test_integro" / "_test_data"
+PLACEMENT_SCALES = (0.5, 1.0, 1.5)
+
+
+def exhaustive_matching(full_image, template_image, min_sufficient_match=0.95):
+    """Reference implementation: every scale matched over the whole screen."""
+    origin_height, origin_width = template_image.shape[:2]
+    best = (0.0, (0, 0), 1.0)
+    for scale in MATCH_SCALES:
+        new_width = int(origin_width * scale)
+        new_height = int(origin_height * scale)
+        if new_height > full_image.shape[0] or new_width > full_image.shape[1]:
+            continue
+        resized = cv2.resize(template_image, (new_width, new_height))
+        result = cv2.matchTemplate(full_image, resized, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        if max_val > best[0]:
+            best = (float(max_val), (int(max_loc[0]), int(max_loc[1])), float(scale))
+        if max_val > min_sufficient_match:
+            break
+    return best
+
+
+def synthetic_screen(rng):
+    """Grey screen with cards, bars and text-like strokes."""
+    width, height = SCREEN_SIZE
+    screen = np.full((height, width), 245, dtype=np.uint8)
+    cv2.rectangle(screen, (0, 0), (width, 80), 60, -1)
+    for top in range(200, height - 200, 260):
+        cv2.rectangle(screen, (40, top), (width - 40, top + 220), int(rng.integers(200, 235)), -1)
+        for line in range(3):
+            y = top + 50 + line * 55
+            x = 80
+            while x < width - 200:
+                word = int(rng.integers(30, 140))
+                cv2.rectangle(screen, (x, y), (x + word, y + 22), int(rng.integers(40, 120)), -1)
+                x += word + 20
+    return screen
+
+
+def load_screens(directory, count, rng):
+    """Recorded screenshots from directory, or synthetic ones."""
+    if directory is None:
+        return [synthetic_screen(rng) for _ in range(count)]
+    paths = sorted(p for p in Path(directory).iterdir() if p.suffix.lower() in {".png", ".jpg", ".jpeg"})
+    return [cv2.resize(cv2.imread(str(p), cv2.IMREAD_GRAYSCALE), SCREEN_SIZE) for p in paths]
+
+
+def place(template, scale, angle):
+    """Scale and rotate a template onto a background-coloured canvas that fits it."""
+    height, width = template.shape
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, scale)
+    cos, sin = abs(matrix[0, 0]), abs(matrix[0, 1])
+    new_width, new_height = int(height * sin + width * cos), int(height * cos + width * sin)
+    matrix[0, 2] += new_width / 2 - width / 2
+    matrix[1, 2] += new_height / 2 - height / 2
+    return cv2.warpAffine(template, matrix, (new_width, new_height), flags=cv2.INTER_AREA, borderValue=245)
+
+
+def build_cases(screens, rng, angle=0.0):
+    """Paste every template onto every screen at each placement scale, rotated by angle."""
+    templates = [cv2.imread(str(p), cv2.IMREAD_GRAYSCALE) for p in sorted(TEMPLATES_DIR.glob("*.png"))]
+    cases = []
+    for screen in screens:
+        for template in templates:
+            for scale in PLACEMENT_SCALES:
+                placed = place(template, scale, angle)
+                height, width = placed.shape
+                if width >= SCREEN_SIZE[0] or height >= SCREEN_SIZE[1]:
+                    continue
+                x = int(rng.integers(0, SCREEN_SIZE[0] - width))
+                y = int(rng.integers(0, SCREEN_SIZE[1] - height))
+                image = screen.copy()
+                image[y:y + height, x:x + width] = placed
+                cases.append((image, template, (x, y, x + width, y + height)))
+    return cases
+
+
+def iou(first, second):
+    """Intersection over union of two (x1, y1, x2, y2) boxes."""
+    width = min(first[2], second[2]) - max(first[0], second[0])
+    height = min(first[3], second[3]) - max(first[1], second[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    intersection = width * height
+    area = (first[2] - first[0]) * (first[3] - first[1]) + (second[2] - second[0]) * (second[3] - second[1])
+    return intersection / (area - intersection)
+
+
+def template_engine(matcher):
+    """Adapt a (val, loc, scale) matcher to return the box of the scaled template."""
+
+    def locate(image, template):
+        _, (x, y), scale = matcher(image, template)
+        height, width = template.shape
+        return x, y, x + int(width * scale), y + int(height * scale)
+
+    return locate
+
+
+def feature_engine(matcher):
+    """Adapt an ImageMatcher to return its box, or None."""
+
+    def locate(image, template):
+        found = matcher.match(image, template, template_key=template_cache.key_for(template))
+        return None if found is None else found[1]
+
+    return locate
+
+
+def run(name, locate, cases, rounds):
+    """Time an engine over all cases and report latency and accuracy."""
+    latencies = []
+    hits = 0
+    for _ in range(rounds):
+        template_cache.clear()
+        scale_prior.clear()
+        for image, template, expected in cases:
+            start = time.perf_counter()
+            found = locate(image, template)
+            latencies.append((time.perf_counter() - start) * 1000)
+            hits += found is not None and iou(found, expected) >= 0.5
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{name:<16} mean {statistics.mean(latencies):7.1f} ms  "
+        f"p50 {statistics.median(latencies):7.1f} ms  p95 {p95:7.1f} ms  "
+        f"accuracy {hits / len(latencies):.1%} (IoU >= 0.5)",
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--screens", type=Path, help="directory of recorded screenshots")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="matching threads, default one per core")
+    parser.add_argument("--rotation", type=float, default=15.0, help="template rotation of the second case set")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    rng = np.random.default_rng(args.seed)
+    screens = load_screens(args.screens, 3, rng)
+    cases = build_cases(screens, rng)
+    print(f"{len(cases)} cases on {SCREEN_SIZE[0]}x{SCREEN_SIZE[1]} screens, {args.rounds} rounds")
+
+    image = ShadowstepImage("benchmark")
+    run("exhaustive", template_engine(exhaustive_matching), cases, args.rounds)
+    run("coarse-to-fine", template_engine(image._match_best_scale), cases, args.rounds)
+    set_matching_workers(args.workers)
+    run("parallel", template_engine(image._match_best_scale), cases, args.rounds)
+    set_matching_workers(0)
+    run("orb features", feature_engine(FeatureMatcher("orb")), cases, args.rounds)
+
+    rotated = build_cases(screens, rng, angle=args.rotation)
+    print(f"\nRotated by {args.rotation} degrees:")
+    run("coarse-to-fine", template_engine(image._match_best_scale), rotated, args.rounds)
+    run("orb features", feature_engine(FeatureMatcher("orb")), rotated, args.rounds)
+
+if __name__ == "__main__":
+    main()
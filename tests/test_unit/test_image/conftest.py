@@ -0,0 +1,83 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Shared fixtures of the image unit tests."""
+import base64
+from unittest.mock import Mock
+
+import cv2
+import numpy as np
+import pytest
+
+from shadowstep.image.frame_cache import frame_cache
+from shadowstep.image.frame_source import set_default_frame_source
+from shadowstep.image.image import ShadowstepImage
+from shadowstep.image.match_cache import match_cache
+from shadowstep.image.matching_pool import set_matching_workers
+from shadowstep.image.ocr import ocr_cache
+from shadowstep.image.reduced_decode import set_match_reduction
+from shadowstep.image.scale_prior import scale_prior
+from shadowstep.image.template_cache import template_cache
+
+
+def reset_image_state():
+    """Empty every process-wide image cache and restore the matching and frame source settings."""
+    for cache in (template_cache, scale_prior, frame_cache, match_cache, ocr_cache):
+        cache.clear()
+    set_matching_workers(0)
+    set_match_reduction(1)
+    set_default_frame_source(None)
+
+
+@pytest.fixture(autouse=True)
+def isolated_image_state():
+    """Isolate every test from templates, scales, frames, results and settings left by other tests."""
+    reset_image_state()
+    yield
+    reset_image_state()
+
+
+@pytest.fixture
+def make_screen():
+    """Factory of smooth random dark grayscale screens, so downsampled copies keep their structure.
+
+    icon_at=(x, y) draws a white square of icon_size with a black circle in its
+    middle there, standing out of the dark noise; color=True returns the screen as BGR.
+    """
+
+    def make(height=1200, width=540, seed=0, *, icon_at=None, icon_size=40, color=False):
+        noise = np.random.default_rng(seed).integers(0, 120, (height // 8, width // 8), dtype=np.uint8)
+        screen = cv2.resize(noise, (width, height), interpolation=cv2.INTER_CUBIC)
+        if icon_at is not None:
+            x, y = icon_at
+            cv2.rectangle(screen, (x, y), (x + icon_size, y + icon_size), 255, -1)
+            cv2.circle(screen, (x + icon_size // 2, y + icon_size // 2), icon_size // 4, 0, -1)
+        return cv2.cvtColor(screen, cv2.COLOR_GRAY2BGR) if color else screen
+
+    return make
+
+
+@pytest.fixture
+def make_image():
+    """Factory of ShadowstepImages on a Mock Shadowstep, without a device.
+
+    The driver serves screen as a PNG screenshot when it is given; driver
+    replaces the Mock driver.
+    """
+
+    def make(template, screen=None, *, driver=None, threshold=0.8, **kwargs):
+        image = ShadowstepImage(template, threshold=threshold, **kwargs)
+        image.shadowstep = Mock()
+        if driver is not None:
+            image.shadowstep.driver = driver
+        else:
+            image.shadowstep.driver.capabilities = {}
+        if screen is not None:
+            png = cv2.imencode(".png", screen)[1].tobytes()
+            image.shadowstep.driver.get_screenshot_as_base64.return_value = base64.b64encode(png).decode()
+        return image
+
+    return make
@@ -0,0 +1,137 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Unit tests for searching several templates on one screenshot."""
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
+from shadowstep.image.image import ShadowstepImage
+from shadowstep.image.matching_pool import set_matching_workers
+from shadowstep.shadowstep import Shadowstep
+
+
+@pytest.fixture
+def screen():
+    """Smooth random screen with an absent template made of different noise."""
+    noise = np.random.default_rng(0).integers(0, 255, (100, 50), dtype=np.uint8)
+    return cv2.resize(noise, (400, 800), interpolation=cv2.INTER_CUBIC)
+
+
+@pytest.fixture
+def templates(screen):
+    """Two crops of the screen and one unrelated pattern."""
+    absent = np.tile(np.array([[0, 255], [255, 0]], dtype=np.uint8), (20, 20))
+    return {
+        "top": screen[100:160, 50:170].copy(),
+        "bottom": screen[600:680, 200:360].copy(),
+        "absent": absent,
+    }
+
+
+def patch_screenshot(screen):
+    """Serve screen as the device screenshot and count captures."""
+    png = cv2.imencode(".png", screen)[1].tobytes()
+    return patch.object(Shadowstep.get_instance(), "get_screenshot", return_value=png)
+
+
+class TestLocateAll:
+    """Test ShadowstepImage.locate_all."""
+
+    def test_single_screenshot_for_all_templates(self, screen, templates):
+        """Test every template is matched against one capture."""
+        images = [ShadowstepImage(template, threshold=0.9) for template in templates.values()]
+
+        with patch_screenshot(screen) as get_screenshot:
+            results = ShadowstepImage.locate_all(images)
+
+        assert get_screenshot.call_count == 1
+        assert results == [(50, 100, 170, 160), (200, 600, 360, 680), None]
+        assert images[0].coordinates == (50, 100, 170, 160)
+        assert images[1].center == (280, 640)
+
+    def test_parallel_results_in_input_order(self, screen, templates):
+        """Test the pool returns the same per-template results."""
+        images = [ShadowstepImage(template, threshold=0.9) for template in templates.values()]
+        set_matching_workers(3)
+
+        with patch_screenshot(screen):
+            results = ShadowstepImage.locate_all(images)
+
+        assert results == [(50, 100, 170, 160), (200, 600, 360, 680), None]
+
+    def test_locate_first_stops_at_first_found(self, screen, templates):
+        """Test templates after the first one on screen are not matched."""
+        images = [ShadowstepImage(templates[name], threshold=0.9) for name in ("absent", "bottom", "top")]
+
+        with patch_screenshot(screen) as get_screenshot:
+            assert ShadowstepImage.locate_first(images) == 1
+            assert ShadowstepImage.locate_first([]) is None
+
+        assert get_screenshot.call_count == 1
+        assert images[1].coordinates == (200, 600, 360, 680)
+        assert images[2]._coords is None
+
+    def test_empty_input(self):
+        """Test no screenshot is taken for an empty batch."""
+        with patch.object(Shadowstep.get_instance(), "get_screenshot") as get_screenshot:
+            assert ShadowstepImage.locate_all([]) == []
+        get_screenshot.assert_not_called()
+
+
+class TestShadowstepBatchSearch:
+    """Test Shadowstep.find_all_of and find_any."""
+
+    def test_find_all_of_mapping(self, screen, templates):
+        """Test results are keyed by the mapping keys."""
+        with patch_screenshot(screen):
+            found = Shadowstep.get_instance().find_all_of(templates, threshold=0.9)
+
+        assert set(found) == {"top", "bottom", "absent"}
+        assert found["top"].coordinates == (50, 100, 170, 160)
+        assert found["absent"] is None
+
+    def test_find_all_of_sequence(self, screen, templates):
+        """Test results of a sequence are keyed by position."""
+        with patch_screenshot(screen):
+            found = Shadowstep.get_instance().find_all_of([templates["absent"], templates["bottom"]], threshold=0.9)
+
+        assert found[0] is None
+        assert found[1].coordinates == (200, 600, 360, 680)
+
+    def test_find_any_returns_first_in_input_order(self, screen, templates):
+        """Test find_any prefers the earliest template that is on screen."""
+        with patch_screenshot(screen) as get_screenshot:
+            key, image = Shadowstep.get_instance().find_any(templates, threshold=0.9)
+
+        assert key == "top"
+        assert image.coordinates == (50, 100, 170, 160)
+        assert get_screenshot.call_count == 1
+
+    def test_find_any_loads_once_and_stops_at_first_hit(self, screen, templates):
+        """Test templates are built once for all polls and later ones are not matched after a hit."""
+        blank = cv2.imencode(".png", np.zeros_like(screen))[1].tobytes()
+        png = cv2.imencode(".png", screen)[1].tobytes()
+        order = [templates["absent"], templates["top"], templates["bottom"]]
+        with patch.object(Shadowstep.get_instance(), "get_screenshot", side_effect=[blank, blank, png]), \
+                patch("shadowstep.shadowstep.ShadowstepImage", wraps=ShadowstepImage) as wrapper, \
+                patch.object(ShadowstepImage, "locate_in", autospec=True, side_effect=ShadowstepImage.locate_in) as locate_in, \
+                patch("time.sleep"):
+            key, image = Shadowstep.get_instance().find_any(order, threshold=0.9, timeout=10)
+
+        assert (key, image.coordinates) == (1, (50, 100, 170, 160))
+        assert wrapper.call_count == 3
+        # two polls of all three templates, then absent and top
+        assert locate_in.call_count == 8
+
+    def test_find_any_times_out(self, screen, templates):
+        """Test find_any gives up with None after the timeout."""
+        with patch_screenshot(screen), patch("time.sleep"):
+            found = Shadowstep.get_instance().find_any([templates["absent"]], threshold=0.9, timeout=0)
+
+        assert found is None
@@ -0,0 +1,128 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Unit tests for the change detection gate of visual waits."""
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
+from shadowstep.image.change_gate import ChangeGate
+from shadowstep.image.image import ShadowstepImage
+
+
+# Height and width of the test screens
+SIZE = (600, 300)
+
+
+@pytest.fixture
+def image(make_screen, make_image):
+    """Image of the icon drawn at (100, 100)."""
+    return make_image(make_screen(*SIZE, icon_at=(100, 100))[90:150, 90:150].copy())
+
+
+class TestChangeGate:
+    """Test detection of changed screen rects."""
+
+    def test_first_frame_is_all_changed(self, make_screen):
+        """Test the first frame has nothing to compare with."""
+        assert ChangeGate().changed_rect(make_screen(*SIZE)) == (0, 0, 300, 600)
+
+    def test_identical_frame_is_unchanged(self, make_screen):
+        """Test an equal frame, even a different array, is reported unchanged."""
+        gate = ChangeGate()
+        gate.changed_rect(make_screen(*SIZE))
+        assert gate.changed_rect(make_screen(*SIZE)) is None
+
+    def test_changed_rect_bounds_the_change(self, make_screen):
+        """Test the rect covers the changed pixels and little else."""
+        gate = ChangeGate()
+        gate.changed_rect(make_screen(*SIZE))
+        x1, y1, x2, y2 = gate.changed_rect(make_screen(*SIZE, icon_at=(200, 400)))
+        assert x1 <= 200 and y1 <= 400 and x2 >= 240 and y2 >= 440
+        assert (x2 - x1) * (y2 - y1) < 300 * 600 / 10
+
+    def test_noise_below_tolerance_is_ignored(self, make_screen):
+        """Test compression-like noise does not count as a change."""
+        gate = ChangeGate()
+        screen = make_screen(*SIZE)
+        gate.changed_rect(screen)
+        noise = np.random.default_rng(1).integers(-3, 4, screen.shape)
+        assert gate.changed_rect(np.clip(screen + noise, 0, 255).astype(np.uint8)) is None
+
+    def test_slow_changes_add_up(self, make_screen):
+        """Test small steps are compared with the last changed frame, not the previous one."""
+        gate = ChangeGate()
+        screen = make_screen(*SIZE)
+        gate.changed_rect(screen)
+        results = [gate.changed_rect(np.clip(screen.astype(int) + step, 0, 255).astype(np.uint8)) for step in (2, 4, 6)]
+        assert results[0] is None
+        assert any(result is not None for result in results[1:])
+
+    def test_new_size_is_all_changed(self, make_screen):
+        """Test frames of another resolution are not compared cell by cell."""
+        gate = ChangeGate()
+        gate.changed_rect(make_screen(*SIZE))
+        assert gate.changed_rect(cv2.resize(make_screen(*SIZE), (150, 300))) == (0, 0, 150, 300)
+
+
+class TestLocateChanged:
+    """Test wait polls skip or narrow matching using the gate."""
+
+    def test_static_screen_is_matched_once(self, make_screen, image):
+        """Test repeated polls of an unchanged screen reuse the first result."""
+        gate = ChangeGate()
+        with patch.object(ShadowstepImage, "_match_with_prior", wraps=image._match_with_prior) as matching:
+            results = [image._locate_changed(make_screen(*SIZE), gate) for _ in range(5)]
+        assert results == [None] * 5
+        assert matching.call_count == 1
+        assert (gate.matched, gate.skipped) == (1, 4)
+
+    def test_appearing_image_is_searched_near_the_change(self, make_screen, image):
+        """Test an image that was absent is looked for only around the changed rect."""
+        gate = ChangeGate()
+        image._locate_changed(make_screen(*SIZE), gate)
+
+        shapes = []
+        original = ShadowstepImage._match_with_prior
+
+        def spy(self, full_image, template_image, *args):
+            shapes.append(full_image.shape)
+            return original(self, full_image, template_image, *args)
+
+        with patch.object(ShadowstepImage, "_match_with_prior", spy):
+            coords = image._locate_changed(make_screen(*SIZE, icon_at=(100, 400)), gate)
+        assert coords is not None
+        assert abs(coords[0] - 90) <= 3 and abs(coords[1] - 390) <= 3
+        assert shapes and all(shape[0] * shape[1] < 300 * 600 for shape in shapes)
+
+    def test_change_away_from_found_image_keeps_result(self, make_screen, image):
+        """Test a visible image is not matched again when only another part changed."""
+        gate = ChangeGate()
+        first = image._locate_changed(make_screen(*SIZE, icon_at=(100, 100)), gate)
+        assert first is not None
+
+        changed = make_screen(*SIZE, icon_at=(100, 100))
+        cv2.rectangle(changed, (200, 500), (280, 580), 255, -1)
+        with patch.object(ShadowstepImage, "_match_with_prior") as matching:
+            assert image._locate_changed(changed, gate) == first
+        matching.assert_not_called()
+
+    def test_change_over_found_image_matches_again(self, make_screen, image):
+        """Test the image is matched again when its own area changed."""
+        gate = ChangeGate()
+        assert image._locate_changed(make_screen(*SIZE, icon_at=(100, 100)), gate) is not None
+        assert image._locate_changed(make_screen(*SIZE), gate) is None
+
+    def test_wait_not_with_screenshots_uses_gate(self, image):
+        """Test wait_not polling screenshots passes one gate to every poll."""
+        image.timeout = 0.2
+        with patch.object(ShadowstepImage, "_get_image_coordinates", return_value=None) as probe, \
+                patch("shadowstep.image.image.WAIT_POLL_FREQUENCY", 0.01):
+            assert image.wait_not() is True
+        gate = probe.call_args.args[0]
+        assert isinstance(gate, ChangeGate)
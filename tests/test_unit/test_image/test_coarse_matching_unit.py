@@ -0,0 +1,104 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Unit tests for coarse-to-fine multi-scale matching."""
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
+from shadowstep.image.image import COARSE_FACTORS, MIN_COARSE_TEMPLATE_SIDE, ShadowstepImage
+
+
+class TestCoarseToFineMatching:
+    """Test multi_scale_matching on real OpenCV calls."""
+
+    def test_finds_template_at_native_scale(self, make_screen):
+        """Test an unscaled crop is located exactly."""
+        screen = make_screen()
+        template = screen[700:780, 200:360].copy()
+
+        confidence, location = ShadowstepImage("x").multi_scale_matching(screen, template)
+
+        assert confidence > 0.95
+        assert location == (200, 700)
+
+    def test_finds_template_rendered_at_other_scale(self, make_screen):
+        """Test a template drawn at 0.6x on screen is found within the scale grid's precision."""
+        screen = make_screen(seed=1)
+        template = cv2.resize(screen[300:360, 100:220], (200, 100))
+
+        confidence, (x, y) = ShadowstepImage("x").multi_scale_matching(screen, template)
+
+        assert confidence > 0.8
+        assert abs(x - 100) <= 5
+        assert abs(y - 300) <= 5
+
+    def test_box_of_template_rendered_at_other_scale(self, make_screen):
+        """Test the located box and center follow the size the template has on screen."""
+        screen = make_screen(seed=1)
+        template = cv2.resize(screen[300:360, 100:220], (200, 100))
+
+        x1, y1, x2, y2 = ShadowstepImage(template, threshold=0.8).locate_in(screen)
+
+        assert abs(x2 - x1 - 120) <= 8 and abs(y2 - y1 - 60) <= 4
+        assert abs((x1 + x2) // 2 - 160) <= 5 and abs((y1 + y2) // 2 - 330) <= 5
+
+    def test_full_resolution_search_is_windowed(self, make_screen):
+        """Test full-resolution matching only runs on small refinement windows."""
+        screen = make_screen(seed=2)
+        template = screen[500:600, 100:300].copy()
+        full_size_calls = []
+        original = cv2.matchTemplate
+
+        def match_template(image, templ, method):
+            if image.shape == screen.shape:
+                full_size_calls.append(templ.shape)
+            return original(image, templ, method)
+
+        with patch("cv2.matchTemplate", side_effect=match_template):
+            confidence, location = ShadowstepImage("x").multi_scale_matching(screen, template)
+
+        assert confidence > 0.95
+        assert location == (100, 500)
+        assert full_size_calls == []
+
+    def test_returns_best_scale(self, make_screen):
+        """Test _match_best_scale reports the winning scale."""
+        screen = make_screen(seed=3)
+        template = screen[200:300, 100:300].copy()
+
+        _, location, scale = ShadowstepImage("x")._match_best_scale(screen, template)
+
+        assert location == (100, 200)
+        assert scale == pytest.approx(1.0)
+
+    def test_small_screen_uses_full_resolution(self, make_screen):
+        """Test screens below the coarse threshold skip downsampling."""
+        screen = make_screen(height=200, width=200, seed=4)
+        template = screen[50:90, 60:100].copy()
+
+        with patch("cv2.resize", wraps=cv2.resize) as resize:
+            confidence, location = ShadowstepImage("x").multi_scale_matching(screen, template)
+
+        assert confidence > 0.95
+        assert location == (60, 50)
+        assert all(call.args[0] is not screen for call in resize.call_args_list)
+
+
+class TestCoarseFactor:
+    """Test selection of the downsampling level."""
+
+    def test_coarsest_factor_for_large_template(self):
+        """Test large templates are matched on the coarsest level."""
+        screen = np.zeros((2400, 1080), dtype=np.uint8)
+        assert ShadowstepImage._coarse_factor(400, screen) == COARSE_FACTORS[0]
+
+    def test_tiny_template_matched_at_full_resolution(self):
+        """Test templates that would vanish when downsampled are not downsampled."""
+        screen = np.zeros((2400, 1080), dtype=np.uint8)
+        assert ShadowstepImage._coarse_factor(MIN_COARSE_TEMPLATE_SIDE - 1, screen) == 1.0
@@ -0,0 +1,107 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Unit tests for perceptual screen fingerprints."""
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from shadowstep.image.fingerprint import (
+    FINGERPRINT_WORDS,
+    STATUS_BAR_MASK,
+    FingerprintIndex,
+    distance,
+    fingerprint,
+    get_fingerprint_masks,
+    set_fingerprint_masks,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_masks():
+    """Restore the default masks changed by a test."""
+    yield
+    set_fingerprint_masks((STATUS_BAR_MASK,))
+
+
+def make_screen(seed=0, clock="12:00"):
+    """720x1600 BGR screen with a status bar clock and list rows."""
+    rng = np.random.default_rng(seed)
+    screen = np.full((1600, 720, 3), 245, dtype=np.uint8)
+    cv2.putText(screen, clock, (20, 45), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 0), 3)
+    for top in range(120, 1600, 140):
+        width = int(rng.integers(200, 650))
+        cv2.rectangle(screen, (40, top), (40 + width, top + 60), tuple(int(v) for v in rng.integers(0, 150, 3)), -1)
+    return screen
+
+
+class TestFingerprint:
+    """Test hashing of screens."""
+
+    def test_same_screen_from_png_and_array(self):
+        """Test an encoded screenshot and its pixels give nearly the same fingerprint."""
+        screen = make_screen()
+        value = fingerprint(cv2.imencode(".png", screen)[1].tobytes())
+        assert value.dtype == np.uint64 and value.shape == (FINGERPRINT_WORDS,)
+        assert distance(value, fingerprint(screen)) <= 8
+
+    def test_status_bar_ignored(self):
+        """Test the clock changing does not change the fingerprint."""
+        assert distance(fingerprint(make_screen(clock="12:00")), fingerprint(make_screen(clock="18:47"))) == 0
+
+    def test_other_screen_is_far(self):
+        """Test different content differs in many bits."""
+        assert distance(fingerprint(make_screen(0)), fingerprint(make_screen(1))) > 40
+
+    def test_configured_and_pixel_masks(self):
+        """Test areas masked by default or per call are ignored."""
+        first, second = make_screen(0), make_screen(0)
+        cv2.rectangle(second, (0, 1400), (720, 1600), (0, 0, 255), -1)
+        assert distance(fingerprint(first), fingerprint(second)) > 0
+        assert distance(fingerprint(first, [(0, 1400, 720, 1600)]), fingerprint(second, [(0, 1400, 720, 1600)])) == 0
+        set_fingerprint_masks([STATUS_BAR_MASK, (0.0, 0.875, 1.0, 1.0)])
+        assert get_fingerprint_masks()[1] == (0.0, 0.875, 1.0, 1.0)
+        assert distance(fingerprint(first), fingerprint(second)) == 0
+
+
+class TestFingerprintIndex:
+    """Test nearest-neighbour lookup."""
+
+    def test_nearest_within_max_distance(self):
+        """Test the closest stored screen is returned only when close enough."""
+        index = FingerprintIndex(max_distance=10)
+        assert index.nearest(fingerprint(make_screen(0))) is None
+        index.add(fingerprint(make_screen(0)), "home")
+        index.add(fingerprint(make_screen(1)), "settings")
+        assert index.nearest(fingerprint(make_screen(1, clock="9:41"))) == ("settings", 0)
+        assert index.nearest(fingerprint(make_screen(2))) is None
+        assert len(index) == 2
+
+    def test_grows_and_clears(self):
+        """Test the index keeps every entry past its initial capacity."""
+        rng = np.random.default_rng(0)
+        rows = rng.integers(0, 2**63, (600, FINGERPRINT_WORDS), dtype=np.uint64)
+        index = FingerprintIndex()
+        for label, row in enumerate(rows):
+            index.add(row, label)
+        assert index.nearest(rows[450]) == (450, 0)
+        index.clear()
+        assert len(index) == 0 and index.nearest(rows[0]) is None
+
+    def test_lookup_is_submillisecond(self):
+        """Test a lookup over 5000 screens stays under a millisecond."""
+        rng = np.random.default_rng(0)
+        index = FingerprintIndex()
+        for label, row in enumerate(rng.integers(0, 2**63, (5000, FINGERPRINT_WORDS), dtype=np.uint64)):
+            index.add(row, label)
+        query = rng.integers(0, 2**63, FINGERPRINT_WORDS, dtype=np.uint64)
+        index.nearest(query)
+        started = time.perf_counter()
+        for _ in range(100):
+            index.nearest(query)
+        assert (time.perf_counter() - started) / 100 < 1e-3
@@ -0,0 +1,198 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Unit tests for the shared screenshot frame cache."""
+import base64
+from unittest.mock import Mock, patch
+
+import cv2
+import numpy as np
+import pytest
+
+from shadowstep.image.frame_cache import FrameCache, frame_cache
+from shadowstep.image.frame_source import ScreenshotFrameSource
+from shadowstep.image.image import ShadowstepImage
+from shadowstep.ui_automator.mobile_commands import MobileCommands
+
+
+@pytest.fixture
+def png():
+    """Small encoded screenshot."""
+    screen = np.random.default_rng(0).integers(0, 255, (60, 40, 3), dtype=np.uint8)
+    return cv2.imencode(".png", screen)[1].tobytes()
+
+
+class TestFrameCache:
+    """Test frame reuse rules."""
+
+    def test_reuses_frame_of_same_source_and_generation(self, png):
+        """Test consecutive captures share one frame."""
+        cache = FrameCache(ttl=10)
+        capture = Mock(return_value=png)
+        source = object()
+
+        first = cache.get(source, capture)
+        second = cache.get(source, capture)
+
+        assert first is second
+        assert capture.call_count == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_invalidate_forces_new_capture(self, png):
+        """Test a screen-changing action bumps the generation."""
+        cache = FrameCache(ttl=10)
+        capture = Mock(return_value=png)
+        source = object()
+
+        cache.get(source, capture)
+        cache.invalidate()
+        cache.get(source, capture)
+
+        assert capture.call_count == 2
+        assert cache.generation == 1
+
+    def test_other_source_or_expired_frame_is_not_reused(self, png):
+        """Test frames are bound to their driver and the TTL."""
+        capture = Mock(return_value=png)
+        cache = FrameCache(ttl=10)
+        cache.get(object(), capture)
+        cache.get(object(), capture)
+
+        expired = FrameCache(ttl=0)
+        source = object()
+        expired.get(source, capture)
+        with patch("shadowstep.image.frame_cache.time.monotonic", return_value=1e12):
+            expired.get(source, capture)
+
+        assert capture.call_count == 4
+
+    def test_latest_never_captures(self, png):
+        """Test the kept frame is returned only while it still shows the screen, after newer_than."""
+        cache = FrameCache(ttl=10)
+        source = object()
+        assert cache.latest(source) is None
+
+        frame = cache.capture(source, lambda: png)
+        assert cache.latest(source) is frame
+        assert cache.latest(source, newer_than=frame.captured_at - 1) is frame
+        assert cache.latest(source, newer_than=frame.captured_at) is None
+        assert cache.latest(object()) is None
+        cache.invalidate()
+        assert cache.latest(source) is None
+
+    def test_arrays_decoded_once_and_read_only(self, png):
+        """Test gray and BGR arrays are decoded lazily, once."""
+        frame = FrameCache(ttl=10).get(object(), lambda: png)
+
+        with patch("cv2.imdecode", wraps=cv2.imdecode) as imdecode:
+            gray = frame.gray
+            assert frame.bgr is frame.bgr
+            assert frame.gray is gray
+
+        assert imdecode.call_count == 1
+        assert gray.shape == (60, 40)
+        assert not gray.flags.writeable
+
+
+class TestShadowstepImageFrameSharing:
+    """Test image operations share captures."""
+
+    def make_image(self, png):
+        image = ShadowstepImage("x")
+        image.shadowstep = Mock()
+        image.shadowstep.driver.get_screenshot_as_base64.return_value = base64.b64encode(png).decode()
+        return image
+
+    def test_screenshots_are_fresh_and_kept(self, png):
+        """Test every screenshot is new, since direct driver actions do not invalidate frames."""
+        image = self.make_image(png)
+
+        image._get_screenshot_as_bytes()
+        image.shadowstep.driver.tap([(10, 10)])
+        second = image._get_screenshot_as_bytes()
+
+        assert image.shadowstep.driver.get_screenshot_as_base64.call_count == 2
+        assert frame_cache.find(second) is not None
+
+    def test_reuse_shares_capture_of_same_operation(self, png):
+        """Test a later step of one operation reuses the frame of an earlier one."""
+        image = self.make_image(png)
+
+        first = image._get_screenshot_as_bytes()
+        second = image._get_screenshot_as_bytes(reuse=True)
+
+        assert first is second
+        assert image.shadowstep.driver.get_screenshot_as_base64.call_count == 1
+
+    def test_probe_ignores_frames_from_before_it(self, png):
+        """Test a visual wait on screenshots does not match a frame captured before it started."""
+        image = self.make_image(png)
+        image.frame_source = ScreenshotFrameSource(image.shadowstep.driver)
+        image._get_screenshot_as_bytes()
+
+        probe, _ = image._visibility_probe()
+        with patch.object(image, "_locate_reduced", return_value=None):
+            probe()
+            probe()
+
+        assert image.shadowstep.driver.get_screenshot_as_base64.call_count == 2
+
+    def test_to_ndarray_uses_decoded_frame(self, png):
+        """Test decoding a cached screenshot reuses the frame arrays."""
+        image = self.make_image(png)
+        data = image._get_screenshot_as_bytes()
+
+        with patch("cv2.imdecode", wraps=cv2.imdecode) as imdecode:
+            gray = image.to_ndarray(data)
+            again = image.to_ndarray(data)
+            color = image.to_ndarray(data, grayscale=False)
+
+        assert imdecode.call_count == 1
+        assert np.array_equal(gray, again)
+        assert color.shape == (60, 40, 3)
+        assert color.flags.writeable
+
+    def test_tap_invalidates_frame(self, png):
+        """Test a tap makes the next screenshot fresh."""
+        image = self.make_image(png)
+        image._get_screenshot_as_bytes()
+
+        with patch.object(image, "ensure_visible"):
+            image._center = (10, 10)
+            image.tap()
+        image._get_screenshot_as_bytes(reuse=True)
+
+        assert image.shadowstep.driver.get_screenshot_as_base64.call_count == 2
+
+    def test_draw_rectangle_single_capture(self, png, tmp_path):
+        """Test draw_rectangle draws on the frame ensure_visible matched."""
+        image = self.make_image(png)
+        image._coords = (1, 1, 5, 5)
+
+        def ensure_visible():
+            image._get_screenshot_as_bytes()
+
+        with patch.object(image, "ensure_visible", side_effect=ensure_visible):
+            assert image.draw_rectangle(str(tmp_path / "debug.png")) is True
+
+        assert image.shadowstep.driver.get_screenshot_as_base64.call_count == 1
+
+
+class TestMobileCommandsInvalidation:
+    """Test mobile commands bump the screen generation."""
+
+    @patch("shadowstep.ui_automator.mobile_commands.WebDriverSingleton.get_driver")
+    def test_gesture_invalidates_read_does_not(self, mock_get_driver):
+        """Test only screen-changing commands invalidate the frame."""
+        # Call through the class: other tests replace methods on the singleton
+        commands = MobileCommands()
+        generation = frame_cache.generation
+
+        MobileCommands.get_device_time(commands, {})
+        assert frame_cache.generation == generation
+
+        MobileCommands.click_gesture(commands, {"x": 1, "y": 1})
+        assert frame_cache.generation == generation + 1
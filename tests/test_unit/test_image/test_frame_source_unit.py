@@ -0,0 +1,250 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Unit tests for frame sources, against a local MJPEG stand-in server."""
+import base64
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+import cv2
+import numpy as np
+import pytest
+
+from shadowstep.exceptions.shadowstep_exceptions import ShadowstepFrameSourceError, ShadowstepImageNotFoundError
+from shadowstep.image.frame_source import (
+    MjpegFrameSource,
+    ScreenshotFrameSource,
+    get_default_frame_source,
+    set_default_frame_source,
+)
+from shadowstep.image.image import ShadowstepImage
+
+BOUNDARY = "frame"
+
+
+class MjpegStandIn:
+    """MJPEG server streaming whichever screen is currently set."""
+
+    def __init__(self, screen, fps=50):
+        self.screen = screen
+        self.paused = False
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+                self.end_headers()
+                try:
+                    while not stand_in.stopped.is_set():
+                        if not stand_in.paused:
+                            jpeg = cv2.imencode(".jpg", stand_in.screen)[1].tobytes()
+                            self.wfile.write(
+                                f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                                f"Content-Length: {len(jpeg)}\r\n\r\n".encode() + jpeg + b"\r\n"
+                            )
+                            self.wfile.flush()
+                        time.sleep(1 / fps)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        self.stopped = threading.Event()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.stopped.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def plain(make_screen):
+    """200x400 color screen without the icon."""
+    return make_screen(400, 200, color=True)
+
+
+@pytest.fixture
+def shown(make_screen):
+    """The same screen with a 50x50 icon at (60, 150)."""
+    return make_screen(400, 200, icon_at=(60, 150), icon_size=50, color=True)
+
+
+@pytest.fixture
+def icon(shown):
+    """Template of the icon with some of the screen around it."""
+    return shown[140:210, 50:120].copy()
+
+
+@pytest.fixture
+def stand_in(plain):
+    server = MjpegStandIn(plain)
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def stream(stand_in):
+    with MjpegFrameSource(stand_in.url, connect_timeout=2) as source:
+        yield source
+
+
+class TestMjpegFrameSource:
+    """Test reading the latest frame of an MJPEG stream."""
+
+    def test_reads_decodable_frames(self, stream):
+        """Test frames are complete JPEG images of the screen."""
+        frame = stream.read(timeout=3)
+        assert frame.bgr.shape == (400, 200, 3)
+        assert stream.frames_received >= 1
+
+    def test_keeps_only_latest_frame(self, stand_in, stream, shown):
+        """Test a reader sees the current screen, not a backlog of old frames."""
+        stream.read(timeout=3)
+        stand_in.screen = shown
+        changed_at = time.monotonic()
+        frame = stream.read(newer_than=changed_at + 0.1, timeout=3)
+        assert frame.gray[160, 65] > 200
+
+    def test_newer_than_times_out_when_stream_stalls(self, stand_in, stream):
+        """Test waiting for a frame newer than the last one raises when none arrives."""
+        stream.read(timeout=3)
+        stand_in.paused = True
+        time.sleep(0.1)
+        with pytest.raises(ShadowstepFrameSourceError):
+            stream.read(newer_than=time.monotonic(), timeout=0.2)
+
+    def test_unreachable_stream_raises(self, stand_in):
+        """Test reading from a stream that never delivers raises."""
+        url = stand_in.url
+        stand_in.close()
+        with MjpegFrameSource(url, connect_timeout=0.2) as source:
+            with pytest.raises(ShadowstepFrameSourceError):
+                source.read(timeout=0.3)
+
+    def test_closed_source_raises_immediately(self, stand_in):
+        """Test reads after close do not wait for the timeout."""
+        source = MjpegFrameSource(stand_in.url, connect_timeout=2)
+        source.read(timeout=3)
+        source.close()
+        started = time.monotonic()
+        with pytest.raises(ShadowstepFrameSourceError):
+            source.read(newer_than=time.monotonic() + 10, timeout=5)
+        assert time.monotonic() - started < 1
+
+
+class TestScreenshotFrameSource:
+    """Test the screenshot-backed frame source."""
+
+    def test_newer_than_forces_fresh_capture(self, plain):
+        """Test a frame captured before newer_than is not reused."""
+        driver = Mock()
+        png = cv2.imencode(".png", plain)[1].tobytes()
+        driver.get_screenshot_as_base64.return_value = base64.b64encode(png).decode()
+        source = ScreenshotFrameSource(driver)
+
+        first = source.read()
+        assert source.read() is first
+        assert source.read(newer_than=time.monotonic()) is not first
+        assert driver.get_screenshot_as_base64.call_count == 2
+
+
+class TestWaitOnStream:
+    """Test wait and wait_not reading frames from the stream."""
+
+    def test_wait_sees_image_appear(self, stand_in, stream, make_image, icon, shown):
+        """Test wait returns once the image shows up on the stream."""
+        image = make_image(icon, frame_source=stream, timeout=3.0)
+        threading.Timer(0.3, lambda: setattr(stand_in, "screen", shown)).start()
+        with patch.object(ShadowstepImage, "ensure_visible") as ensure_visible, \
+                patch.object(ShadowstepImage, "_get_image_coordinates") as screenshot_probe:
+            assert image.wait() is True
+        ensure_visible.assert_called_once()
+        screenshot_probe.assert_not_called()
+
+    def test_wait_not_sees_image_disappear(self, stand_in, stream, make_image, icon, plain, shown):
+        """Test wait_not returns once the image leaves the stream."""
+        stand_in.screen = shown
+        image = make_image(icon, frame_source=stream, timeout=3.0)
+        threading.Timer(0.3, lambda: setattr(stand_in, "screen", plain)).start()
+        with patch.object(ShadowstepImage, "_get_image_coordinates") as screenshot_probe:
+            assert image.wait_not() is True
+        screenshot_probe.assert_not_called()
+
+    def test_wait_times_out(self, stream, make_image, icon):
+        """Test wait returns False when the image never appears."""
+        image = make_image(icon, frame_source=stream, timeout=0.5)
+        assert image.wait() is False
+
+    def test_same_frame_is_matched_once(self, stand_in, stream, make_image, icon):
+        """Test polls that see an unchanged frame do not match it again."""
+        stand_in.paused = True
+        image = make_image(icon, frame_source=stream, timeout=0.5)
+        with patch.object(ShadowstepImage, "_locate", return_value=None) as locate:
+            assert image.wait() is False
+        assert locate.call_count <= 2
+
+    def test_default_frame_source(self, stand_in, stream, icon, shown):
+        """Test images created without a source use the default one."""
+        set_default_frame_source(stream)
+        assert get_default_frame_source() is stream
+        stand_in.screen = shown
+        image = ShadowstepImage(icon, threshold=0.8, timeout=3)
+        image.shadowstep = Mock()
+        with patch.object(ShadowstepImage, "ensure_visible"):
+            assert image.wait() is True
+
+        set_default_frame_source(None)
+        assert ShadowstepImage(icon)._get_frame_source() is None
+
+    def test_stalled_stream_falls_back_to_screenshots(self, make_image, icon):
+        """Test a source that yields no frames is replaced by screenshot probes."""
+        source = Mock()
+        source.poll_interval = 0.05
+        source.read.side_effect = ShadowstepFrameSourceError(source="x", timeout=0)
+        image = make_image(icon, frame_source=source, timeout=1)
+        with patch.object(ShadowstepImage, "_get_image_coordinates", return_value=(1, 2, 3, 4)), \
+                patch.object(ShadowstepImage, "ensure_visible"):
+            assert image.wait() is True
+
+
+class TestScrollToOnStream:
+    """Test scroll_to checking streamed frames between swipes."""
+
+    def test_screenshot_only_once_image_is_on_stream(self, stand_in, stream, make_image, icon, plain, shown):
+        """Test the screenshot check runs only for the frame that shows the image."""
+        image = make_image(icon, frame_source=stream, timeout=3.0)
+        swipes = []
+
+        def swipe(*args):
+            swipes.append(args)
+            if len(swipes) == 1:
+                stand_in.screen = np.roll(plain, -80, axis=0)
+            if len(swipes) == 2:
+                stand_in.screen = shown
+
+        with patch.object(ShadowstepImage, "_perform_scroll", side_effect=swipe), \
+                patch.object(ShadowstepImage, "is_visible", return_value=True) as is_visible:
+            assert image.scroll_down(max_attempts=5, step_delay=0.2) is image
+        assert len(swipes) == 2
+        is_visible.assert_called_once()
+
+    def test_stops_when_stream_stops_moving(self, stand_in, stream, make_image, icon):
+        """Test a swipe that leaves the streamed screen unchanged ends the scroll loop."""
+        image = make_image(icon, frame_source=stream, timeout=3.0)
+        with patch.object(ShadowstepImage, "_perform_scroll") as perform_scroll, \
+                patch.object(ShadowstepImage, "is_visible") as is_visible, \
+                pytest.raises(ShadowstepImageNotFoundError):
+            image.scroll_down(max_attempts=5, step_delay=0.1)
+        perform_scroll.assert_called_once()
+        is_visible.assert_not_called()
@@ -603,7 +603,7 @@ class TestShadowstepImageIsContains:
     @patch.object(ShadowstepImage, "ensure_visible")
     @patch.object(ShadowstepImage, "_get_screenshot_as_bytes")
     @patch.object(ShadowstepImage, "to_ndarray")
-    @patch.object(ShadowstepImage, "multi_scale_matching")
+    @patch.object(ShadowstepImage, "_match_with_prior")
     def test_is_contains_true(
         self, mock_multi_scale, mock_to_ndarray, mock_screenshot, mock_ensure_visible
     ):
@@ -615,7 +615,7 @@ class TestShadowstepImageIsContains:
         full_array = np.zeros((300, 300), dtype=np.uint8)
         target_array = np.zeros((50, 50), dtype=np.uint8)
         mock_to_ndarray.side_effect = [full_array, target_array]
-        mock_multi_scale.return_value = (0.85, (10, 10))
+        mock_multi_scale.return_value = (0.85, (10, 10), 1.0)
 
         result = img.is_contains("button.png")
 
@@ -625,7 +625,7 @@ class TestShadowstepImageIsContains:
     @patch.object(ShadowstepImage, "ensure_visible")
     @patch.object(ShadowstepImage, "_get_screenshot_as_bytes")
     @patch.object(ShadowstepImage, "to_ndarray")
-    @patch.object(ShadowstepImage, "multi_scale_matching")
+    @patch.object(ShadowstepImage, "_match_with_prior")
     def test_is_contains_false(
         self, mock_multi_scale, mock_to_ndarray, mock_screenshot, mock_ensure_visible
     ):
@@ -637,7 +637,7 @@ class TestShadowstepImageIsContains:
         full_array = np.zeros((300, 300), dtype=np.uint8)
         target_array = np.zeros((50, 50), dtype=np.uint8)
         mock_to_ndarray.side_effect = [full_array, target_array]
-        mock_multi_scale.return_value = (0.5, (10, 10))
+        mock_multi_scale.return_value = (0.5, (10, 10), 1.0)
 
         result = img.is_contains("button.png")
 
@@ -916,6 +916,65 @@ class TestShadowstepImageFindAll:
         # Should have filtered duplicates
         assert len(matches) >= 1
 
+    @patch.object(ShadowstepImage, "_get_screenshot_as_bytes")
+    @patch.object(ShadowstepImage, "to_ndarray")
+    @patch.object(ShadowstepImage, "_multi_scale_matching_raw")
+    def test_find_all_suppresses_neighbours_best_first(self, mock_multi_scale_raw, mock_to_ndarray, mock_screenshot):
+        """Test close peaks collapse to the best one and results are score-sorted."""
+        img = ShadowstepImage("test.png", threshold=0.7)
+        mock_to_ndarray.side_effect = [np.zeros((300, 300), dtype=np.uint8), np.zeros((50, 50), dtype=np.uint8)]
+        result_array = np.zeros((251, 251), dtype=np.float32)
+        result_array[10, 10] = 0.85
+        result_array[12, 12] = 0.9
+        result_array[100, 150] = 0.95
+        mock_multi_scale_raw.return_value = result_array
+
+        matches = img.find_all(coord_threshold=5)
+
+        assert matches == [(150, 100, 200, 150), (12, 12, 62, 62)]
+
+    @patch.object(ShadowstepImage, "_get_screenshot_as_bytes")
+    @patch.object(ShadowstepImage, "to_ndarray")
+    @patch.object(ShadowstepImage, "_multi_scale_matching_raw")
+    def test_find_all_boxes_use_matched_scale(self, mock_multi_scale_raw, mock_to_ndarray, mock_screenshot):
+        """Test boxes take the size of the scaled template, not the original one."""
+        img = ShadowstepImage("test.png", threshold=0.7)
+        mock_to_ndarray.side_effect = [np.zeros((300, 300), dtype=np.uint8), np.zeros((50, 50), dtype=np.uint8)]
+        # Result of a 100x100 template (matched at 2x) on a 300x300 screen
+        result_array = np.zeros((201, 201), dtype=np.float32)
+        result_array[20, 30] = 0.9
+        mock_multi_scale_raw.return_value = result_array
+
+        assert img.find_all() == [(30, 20, 130, 120)]
+
+    @patch.object(ShadowstepImage, "_get_screenshot_as_bytes")
+    @patch.object(ShadowstepImage, "to_ndarray")
+    @patch.object(ShadowstepImage, "_multi_scale_matching_raw")
+    def test_find_all_max_results(self, mock_multi_scale_raw, mock_to_ndarray, mock_screenshot):
+        """Test max_results keeps only the best matches."""
+        img = ShadowstepImage("test.png", threshold=0.7)
+        mock_to_ndarray.side_effect = [np.zeros((300, 300), dtype=np.uint8), np.zeros((10, 10), dtype=np.uint8)]
+        result_array = np.zeros((291, 291), dtype=np.float32)
+        for index in range(10):
+            result_array[index * 25, 0] = 0.71 + index * 0.01
+        mock_multi_scale_raw.return_value = result_array
+
+        matches = img.find_all(max_results=3)
+
+        assert [y for _, y, _, _ in matches] == [225, 200, 175]
+
+    def test_find_all_dense_peaks(self):
+        """Test a textured screen with a low threshold is handled without pairwise filtering."""
+        tile = np.random.default_rng(0).integers(0, 255, (20, 20), dtype=np.uint8)
+        screen = np.tile(tile, (60, 30))
+        img = ShadowstepImage(tile, threshold=0.5)
+
+        with patch.object(img, "_get_screenshot_as_bytes", return_value=cv2.imencode(".png", screen)[1].tobytes()):
+            matches = img.find_all()
+
+        assert len(matches) == 59 * 29 + 59 + 29 + 1
+        assert all(x2 - x1 == 20 and y2 - y1 == 20 for x1, y1, x2, y2 in matches)
+
 
 class TestShadowstepImageDrawRectangle:
     """Test draw_rectangle method."""
@@ -1031,7 +1090,7 @@ class TestShadowstepImagePrivateMethods:
 
     @patch.object(ShadowstepImage, "_get_screenshot_as_bytes")
     @patch.object(ShadowstepImage, "to_ndarray")
-    @patch.object(ShadowstepImage, "multi_scale_matching")
+    @patch.object(ShadowstepImage, "_match_with_prior")
     def test_get_image_coordinates_success(self, mock_multi_scale, mock_to_ndarray, mock_screenshot):
         """Test _get_image_coordinates finds image."""
         img = ShadowstepImage("test.png", threshold=0.7)
@@ -1040,7 +1099,7 @@ class TestShadowstepImagePrivateMethods:
         full_array = np.zeros((300, 300), dtype=np.uint8)
         template_array = np.zeros((50, 50), dtype=np.uint8)
         mock_to_ndarray.side_effect = [full_array, template_array]
-        mock_multi_scale.return_value = (0.85, (100, 100))
+        mock_multi_scale.return_value = (0.85, (100, 100), 1.0)
 
         coords = img._get_image_coordinates()
 
@@ -1048,7 +1107,20 @@ class TestShadowstepImagePrivateMethods:
 
     @patch.object(ShadowstepImage, "_get_screenshot_as_bytes")
     @patch.object(ShadowstepImage, "to_ndarray")
-    @patch.object(ShadowstepImage, "multi_scale_matching")
+    @patch.object(ShadowstepImage, "_match_with_prior")
+    def test_get_image_coordinates_uses_matched_scale(self, mock_multi_scale, mock_to_ndarray, mock_screenshot):
+        """Test the box takes the size of the template at the scale it matched at."""
+        img = ShadowstepImage("test.png", threshold=0.7)
+
+        mock_screenshot.return_value = b"screenshot_data"
+        mock_to_ndarray.side_effect = [np.zeros((300, 300), dtype=np.uint8), np.zeros((50, 100), dtype=np.uint8)]
+        mock_multi_scale.return_value = (0.85, (100, 100), 0.6)
+
+        assert img._get_image_coordinates() == (100, 100, 160, 130)
+
+    @patch.object(ShadowstepImage, "_get_screenshot_as_bytes")
+    @patch.object(ShadowstepImage, "to_ndarray")
+    @patch.object(ShadowstepImage, "_match_with_prior")
     def test_get_image_coordinates_below_threshold(
         self, mock_multi_scale, mock_to_ndarray, mock_screenshot
     ):
@@ -1059,7 +1131,7 @@ class TestShadowstepImagePrivateMethods:
         full_array = np.zeros((300, 300), dtype=np.uint8)
         template_array = np.zeros((50, 50), dtype=np.uint8)
         mock_to_ndarray.side_effect = [full_array, template_array]
-        mock_multi_scale.return_value = (0.5, (100, 100))
+        mock_multi_scale.return_value = (0.5, (100, 100), 1.0)
 
         coords = img._get_image_coordinates()
 
@@ -0,0 +1,117 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Unit tests for the match result cache."""
+import base64
+from unittest.mock import patch
+
+import cv2
+import pytest
+
+from shadowstep.image.frame_cache import frame_cache
+from shadowstep.image.image import ShadowstepImage
+from shadowstep.image.match_cache import MatchCache, match_cache
+from shadowstep.image.text_region import TextRegion
+
+
+# Height and width of the test screens
+SIZE = (600, 300)
+
+
+@pytest.fixture
+def screen(make_screen):
+    """Color screen with an icon at (100, 200)."""
+    return make_screen(*SIZE, icon_at=(100, 200), color=True)
+
+
+@pytest.fixture
+def icon(screen):
+    """Grayscale template of the icon."""
+    return cv2.cvtColor(screen[190:250, 90:150], cv2.COLOR_BGR2GRAY)
+
+
+@pytest.fixture
+def image(make_image, icon, screen):
+    """Image of the icon, served the screen as screenshot."""
+    return make_image(icon, screen)
+
+
+class TestMatchCache:
+    """Test result storage and statistics."""
+
+    def test_hit_after_put_and_stats(self):
+        """Test stored results, including not found, are returned and counted."""
+        cache = MatchCache()
+        assert cache.get("frame", "a") == (False, None)
+        cache.put("frame", "a", (1, 2, 3, 4))
+        cache.put("frame", "b", None)
+        assert cache.get("frame", "a") == (True, (1, 2, 3, 4))
+        assert cache.get("frame", "b") == (True, None)
+        assert cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3, "entries": 2}
+
+    def test_other_frame_drops_results(self):
+        """Test results of an older frame are forgotten."""
+        cache = MatchCache()
+        cache.put("old", "a", (1, 2, 3, 4))
+        assert cache.get("new", "a") == (False, None)
+        assert len(cache) == 0
+
+    def test_bounded_lru(self):
+        """Test the least recently used result is evicted."""
+        cache = MatchCache(max_entries=2)
+        cache.put("frame", "a", None)
+        cache.put("frame", "b", None)
+        cache.get("frame", "a")
+        cache.put("frame", "c", None)
+        assert cache.get("frame", "b") == (False, None)
+        assert cache.get("frame", "a")[0]
+
+    def test_disabled(self):
+        """Test zero entries keeps nothing."""
+        cache = MatchCache(max_entries=0)
+        cache.put("frame", "a", None)
+        assert len(cache) == 0
+
+
+class TestShadowstepImageMatchCache:
+    """Test repeated checks of one frame reuse results."""
+
+    def test_repeated_checks_match_once(self, image, make_image, icon, screen):
+        """Test is_visible, coordinates and center on one frame run matching once."""
+        with patch.object(ShadowstepImage, "_locate", wraps=image._locate) as locate:
+            assert image.is_visible()
+            image._coords = None
+            assert image.coordinates == (90, 190, 150, 250)
+            assert make_image(icon, screen).is_visible()
+        assert locate.call_count == 1
+        assert match_cache.hits == 2
+
+    def test_changed_frame_or_parameters_rematch(self, image, make_screen):
+        """Test another frame, threshold or region is matched again."""
+        with patch.object(ShadowstepImage, "_locate", wraps=image._locate) as locate:
+            image.is_visible()
+            image.threshold = 0.9
+            image.is_visible()
+            image.region = (0, 0, 300, 300)
+            image.is_visible()
+            frame_cache.invalidate()
+            moved = cv2.imencode(".png", make_screen(*SIZE, icon_at=(150, 400), color=True))[1].tobytes()
+            image.shadowstep.driver.get_screenshot_as_base64.return_value = base64.b64encode(moved).decode()
+            assert image._get_image_coordinates() == (140, 390, 200, 450)
+        assert locate.call_count == 4
+        assert match_cache.hits == 0
+
+    def test_identical_recapture_hits(self, image):
+        """Test a new capture of unchanged pixels reuses the result."""
+        image.is_visible()
+        frame_cache.invalidate()
+        image.is_visible()
+        assert image.shadowstep.driver.get_screenshot_as_base64.call_count == 2
+        assert match_cache.hits == 1
+
+    def test_text_region_not_cached(self):
+        """Test OCR results bypass the match cache."""
+        assert TextRegion("Go")._match_cache_key(1) is None
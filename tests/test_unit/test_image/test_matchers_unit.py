@@ -0,0 +1,137 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Unit tests for pluggable matching engines."""
+from unittest.mock import Mock, patch
+
+import cv2
+import numpy as np
+import pytest
+
+from shadowstep.exceptions.shadowstep_exceptions import ShadowstepUnsupportedMatcherError
+from shadowstep.image.image import ShadowstepImage
+from shadowstep.image.matchers import FeatureMatcher, ImageMatcher
+
+
+def make_template():
+    """Textured 90x240 badge with text and shapes."""
+    template = np.full((90, 240), 250, dtype=np.uint8)
+    cv2.rectangle(template, (4, 4), (236, 86), 30, 3)
+    cv2.putText(template, "Settings", (60, 58), cv2.FONT_HERSHEY_SIMPLEX, 1.1, 20, 2)
+    cv2.circle(template, (30, 45), 16, 60, -1)
+    cv2.line(template, (18, 45), (42, 45), 250, 3)
+    return template
+
+
+def make_screen(template=None, angle=0.0, scale=1.0, at=(300, 900)):
+    """400x... phone-like screen with text bars, optionally showing a rotated/scaled template."""
+    rng = np.random.default_rng(0)
+    screen = np.full((1600, 720), 240, dtype=np.uint8)
+    for top in range(100, 1500, 150):
+        x = 40
+        while x < 600:
+            word = int(rng.integers(30, 120))
+            cv2.rectangle(screen, (x, top), (x + word, top + 20), int(rng.integers(40, 140)), -1)
+            x += word + 20
+    if template is None:
+        return screen, None
+    height, width = template.shape
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, scale)
+    cos, sin = abs(matrix[0, 0]), abs(matrix[0, 1])
+    new_width, new_height = int(height * sin + width * cos), int(height * cos + width * sin)
+    matrix[0, 2] += new_width / 2 - width / 2
+    matrix[1, 2] += new_height / 2 - height / 2
+    placed = cv2.warpAffine(template, matrix, (new_width, new_height), borderValue=240)
+    x, y = at
+    screen[y:y + new_height, x:x + new_width] = placed
+    return screen, (x, y, x + new_width, y + new_height)
+
+
+def close(box, expected, tolerance=8):
+    return all(abs(a - b) <= tolerance for a, b in zip(box, expected))
+
+
+class TestFeatureMatcher:
+    """Test keypoint matching with a homography."""
+
+    @pytest.mark.parametrize(("angle", "scale"), [(0.0, 1.0), (25.0, 1.0), (0.0, 1.6), (-40.0, 0.8)])
+    def test_finds_rotated_and_scaled_template(self, angle, scale):
+        """Test the box of a transformed template is found."""
+        template = make_template()
+        screen, expected = make_screen(template, angle, scale, at=(150, 700))
+        found = FeatureMatcher("orb").match(screen, template)
+        assert found is not None
+        score, box = found
+        assert score > 0.5
+        assert close(box, expected)
+
+    def test_partly_covered_template(self):
+        """Test a template with a third of it covered is still found."""
+        template = make_template()
+        screen, expected = make_screen(template)
+        screen[expected[1]:expected[3], expected[2] - 80:expected[2]] = 240
+        found = FeatureMatcher("orb").match(screen, template)
+        assert found is not None and close(found[1], expected)
+
+    def test_absent_template(self):
+        """Test a screen without the template gives no match."""
+        screen, _ = make_screen()
+        assert FeatureMatcher("orb").match(screen, make_template()) is None
+
+    def test_template_and_screen_features_cached(self):
+        """Test template keypoints are detected once per key and screen keypoints once per screen."""
+        matcher = FeatureMatcher("orb")
+        template = make_template()
+        screen, _ = make_screen(template)
+        other, _ = make_screen(template, at=(100, 300))
+        with patch.object(FeatureMatcher, "_detect", wraps=matcher._detect) as detect:
+            matcher.match(screen, template, template_key="badge")
+            matcher.match(screen, template, template_key="badge")
+            matcher.match(other, template, template_key="badge")
+        assert detect.call_count == 3  # template once, each screen once
+
+    def test_unknown_detector(self):
+        """Test detectors outside the supported set are rejected."""
+        with pytest.raises(ShadowstepUnsupportedMatcherError, match="Available: orb"):
+            FeatureMatcher("surf")
+
+    def test_missing_detector(self):
+        """Test detectors missing from the OpenCV build are rejected."""
+        with patch.object(cv2, "AKAZE_create", None, create=True):
+            with pytest.raises(ShadowstepUnsupportedMatcherError):
+                FeatureMatcher("akaze")
+
+
+class TestShadowstepImageMatcher:
+    """Test ShadowstepImage delegating to a matcher."""
+
+    def make_image(self, matcher, threshold=0.5, region=None):
+        image = ShadowstepImage(make_template(), threshold=threshold, region=region, matcher=matcher)
+        image.shadowstep = Mock()
+        image.shadowstep.driver.capabilities = {}
+        return image
+
+    def test_feature_matcher_finds_rotated_icon(self):
+        """Test a rotated icon the template engine cannot match is located."""
+        template = make_template()
+        screen, expected = make_screen(template, angle=30.0)
+        assert ShadowstepImage(template, threshold=0.8).locate_in(screen) is None
+        coords = self.make_image(FeatureMatcher("orb")).locate_in(screen)
+        assert coords is not None and close(coords, expected)
+
+    def test_region_offset_and_threshold(self):
+        """Test matcher boxes are offset by the region and compared with the threshold."""
+        matcher = Mock(spec=ImageMatcher)
+        matcher.name = "stub"
+        matcher.match.return_value = (0.9, (10, 20, 30, 40))
+        screen, _ = make_screen()
+
+        image = self.make_image(matcher, region=(100, 200, 600, 800))
+        assert image.locate_in(screen, widen=False) == (110, 220, 130, 240)
+        assert matcher.match.call_args.args[0].shape == (600, 500)
+        assert matcher.match.call_args.kwargs["template_key"] == image._template_key
+
+        assert self.make_image(matcher, threshold=0.95).locate_in(screen) is None
@@ -0,0 +1,77 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Unit tests for parallel template matching."""
+import cv2
+import numpy as np
+import pytest
+
+from shadowstep.image.image import ShadowstepImage
+from shadowstep.image.matching_pool import get_matching_pool, get_matching_workers, set_matching_workers
+
+
+class TestMatchingPoolConfiguration:
+    """Test enabling and disabling the pool."""
+
+    def test_disabled_by_default(self):
+        """Test no pool exists until workers are configured."""
+        assert get_matching_pool() is None
+        assert get_matching_workers() == 0
+
+    def test_enable_and_disable(self):
+        """Test the pool follows the configured worker count."""
+        set_matching_workers(4)
+        assert get_matching_pool() is not None
+        assert get_matching_workers() == 4
+
+        set_matching_workers(1)
+        assert get_matching_pool() is None
+
+    def test_none_uses_cpu_count(self, monkeypatch):
+        """Test None sizes the pool by CPU count."""
+        monkeypatch.setattr("os.cpu_count", lambda: 3)
+        set_matching_workers(None)
+        assert get_matching_workers() == 3
+
+
+class TestParallelMatching:
+    """Test parallel matching returns the sequential result."""
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_scales_in_parallel_match_sequential(self, seed, make_screen):
+        """Test the reduction over parallel scales is deterministic."""
+        screen = make_screen(seed=seed)
+        template = cv2.resize(screen[300:380, 100:260], (120, 60))
+        image = ShadowstepImage("x")
+
+        sequential = image._match_best_scale(screen, template)
+        set_matching_workers(4)
+        parallel = image._match_best_scale(screen, template)
+
+        assert parallel == sequential
+
+    def test_tiled_result_equals_untiled(self, make_screen):
+        """Test row tiles stack into the full result matrix."""
+        screen = make_screen(height=2400, width=1080)
+        template = screen[1500:1600, 300:500].copy()
+        untiled = ShadowstepImage._match_template(screen, template, tiled=True)
+
+        set_matching_workers(4)
+        tiled = ShadowstepImage._match_template(screen, template, tiled=True)
+
+        assert tiled.shape == untiled.shape
+        assert np.allclose(tiled, untiled, atol=1e-4)
+        assert cv2.minMaxLoc(tiled)[3] == cv2.minMaxLoc(untiled)[3] == (300, 1500)
+
+    def test_small_image_is_not_tiled(self, make_screen):
+        """Test images with few result rows run as one matchTemplate call."""
+        screen = make_screen(height=200, width=200)
+        template = screen[50:90, 60:100].copy()
+        set_matching_workers(4)
+
+        result = ShadowstepImage._match_template(screen, template, tiled=True)
+
+        assert result.shape == (161, 161)
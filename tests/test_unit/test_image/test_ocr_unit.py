@@ -0,0 +1,177 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Unit tests for OCR text search, with Tesseract replaced by canned word data."""
+from unittest.mock import Mock, patch
+
+import cv2
+import numpy as np
+import pytest
+
+from shadowstep.image.image import ShadowstepImage
+from shadowstep.image.ocr import TextBox, find_phrase, ocr_cache, preprocess, read_words
+from shadowstep.image.text_region import TextRegion
+
+# Words as Tesseract reports them on the half-size screen: text, conf, left, top, width, height, line
+WORDS = [
+    ("Welcome", 96, 20, 20, 80, 15, (1, 1, 1)),
+    ("", -1, 0, 0, 200, 400, (1, 1, 1)),
+    ("Continue", 91, 50, 300, 60, 12, (2, 1, 1)),
+    ("with", 88, 114, 300, 25, 12, (2, 1, 1)),
+    ("Google.", 90, 143, 300, 45, 12, (2, 1, 1)),
+    ("continue", 40, 50, 350, 60, 12, (3, 1, 1)),
+]
+
+
+def tesseract_data(words):
+    """Build the dict returned by pytesseract.image_to_data."""
+    data = {key: [] for key in ("text", "conf", "left", "top", "width", "height", "block_num", "par_num", "line_num")}
+    for text, conf, left, top, width, height, (block, par, line) in words:
+        for key, value in zip(data, (text, conf, left, top, width, height, block, par, line)):
+            data[key].append(value)
+    return data
+
+
+@pytest.fixture
+def tesseract():
+    with patch("shadowstep.image.ocr.pytesseract.image_to_data", return_value=tesseract_data(WORDS)) as image_to_data:
+        yield image_to_data
+
+
+@pytest.fixture
+def screen():
+    """Light 400x800 screen."""
+    return np.full((800, 400), 230, dtype=np.uint8)
+
+
+@pytest.fixture
+def screenshot(screen):
+    png = cv2.imencode(".png", screen)[1].tobytes()
+    with patch.object(ShadowstepImage, "_get_screenshot_as_bytes", return_value=png):
+        yield
+
+
+def make_region(text, **kwargs):
+    region = TextRegion(text, **kwargs)
+    region.shadowstep = Mock()
+    return region
+
+
+class TestReadWords:
+    """Test recognition, coordinate mapping and caching."""
+
+    def test_boxes_are_mapped_to_screen_pixels(self, tesseract, screen):
+        """Test boxes found on the downscaled copy are scaled back."""
+        words = read_words(screen, scale=0.5)
+        assert [word.text for word in words] == ["Welcome", "Continue", "with", "Google.", "continue"]
+        assert words[1] == TextBox("Continue", 0.91, (100, 600, 220, 624), (2, 1, 1))
+        assert tesseract.call_args.args[0].shape == (400, 200)
+
+    def test_same_pixels_are_recognized_once(self, tesseract, screen):
+        """Test a second lookup on identical pixels uses the cache."""
+        read_words(screen)
+        read_words(screen.copy())
+        assert tesseract.call_count == 1
+        assert (ocr_cache.hits, ocr_cache.misses) == (1, 1)
+
+    def test_changed_pixels_language_or_scale_miss(self, tesseract, screen):
+        """Test the cache key covers content, language and scale."""
+        read_words(screen)
+        changed = screen.copy()
+        changed[0, 0] = 0
+        read_words(changed)
+        read_words(screen, lang="rus")
+        read_words(screen, scale=1.0)
+        assert tesseract.call_count == 4
+
+    def test_cache_is_bounded(self, tesseract, screen):
+        """Test least recently used screens are evicted."""
+        ocr_cache.max_entries = 2
+        try:
+            for level in range(3):
+                read_words(np.full((10, 10), level, dtype=np.uint8))
+            assert len(ocr_cache) == 2
+        finally:
+            ocr_cache.max_entries = 32
+
+    def test_preprocess_inverts_dark_screens(self):
+        """Test light text on a dark background is turned dark on light."""
+        dark = np.full((100, 60), 20, dtype=np.uint8)
+        processed = preprocess(dark, scale=0.5)
+        assert processed.shape == (50, 30)
+        assert processed.mean() > 200
+
+
+class TestFindPhrase:
+    """Test phrase matching over recognized words."""
+
+    @pytest.fixture
+    def words(self, tesseract, screen):
+        return read_words(screen, scale=0.5)
+
+    def test_single_word_ignores_case_and_punctuation(self, words):
+        """Test single words match case-insensitively, top to bottom."""
+        assert find_phrase(words, "CONTINUE") == [(100, 600, 220, 624), (100, 700, 220, 724)]
+        assert find_phrase(words, "google") == [(286, 600, 376, 624)]
+
+    def test_phrase_spans_consecutive_words(self, words):
+        """Test a multi-word phrase returns the union of its word boxes."""
+        assert find_phrase(words, "continue with google") == [(100, 600, 376, 624)]
+        assert find_phrase(words, "welcome continue") == []
+
+    def test_exact_and_confidence(self, words):
+        """Test exact comparison and the confidence floor."""
+        assert find_phrase(words, "Google", exact=True) == []
+        assert find_phrase(words, "Google.", exact=True) == [(286, 600, 376, 624)]
+        assert find_phrase(words, "continue", min_confidence=0.5) == [(100, 600, 220, 624)]
+
+
+class TestTextRegion:
+    """Test text regions behave like images."""
+
+    def test_coordinates_and_center(self, tesseract, screenshot):
+        """Test the first occurrence becomes the tappable box."""
+        region = make_region("Continue with")
+        assert region.coordinates == (100, 600, 278, 624)
+        assert region.center == (189, 612)
+
+    def test_tap_uses_center(self, tesseract, screenshot):
+        """Test tap() taps the text like an image."""
+        region = make_region("Welcome")
+        region.tap()
+        region.shadowstep.driver.tap.assert_called_once_with(positions=[(120, 55)], duration=None)
+
+    def test_region_crop_is_offset(self, screenshot):
+        """Test boxes found in a region are returned in screen pixels."""
+        with patch("shadowstep.image.ocr.pytesseract.image_to_data", return_value=tesseract_data(WORDS[:1])) as ocr:
+            region = make_region("welcome", region=(0, 400, 400, 800))
+            assert region.find_all() == [(40, 440, 200, 470)]
+        assert ocr.call_args.args[0].shape == (200, 200)
+
+    def test_not_found(self, tesseract, screenshot):
+        """Test missing text is not visible."""
+        assert make_region("Cancel").is_visible() is False
+
+    def test_several_lookups_run_ocr_once(self, tesseract, screenshot):
+        """Test lookups of different phrases on one screen share the recognized words."""
+        assert make_region("Welcome").is_visible()
+        assert make_region("Google").is_visible()
+        assert ShadowstepImage.find_text("continue") == [(100, 600, 220, 624)]
+        assert tesseract.call_count == 1
+
+    def test_find_text_confidence(self, tesseract, screenshot):
+        """Test find_text passes the confidence threshold."""
+        assert ShadowstepImage.find_text("continue", threshold=0.3) == [(100, 600, 220, 624), (100, 700, 220, 724)]
+        assert ShadowstepImage.find_text("continue", threshold=0.95) == []
+
+    def test_get_text_region(self):
+        """Test the facade returns a configured TextRegion."""
+        from shadowstep.shadowstep import Shadowstep
+
+        app = Shadowstep.__new__(Shadowstep)
+        region = Shadowstep.get_text_region(app, "Continue", region=(0.0, 0.5, 1.0, 1.0), lang="eng+deu")
+        assert isinstance(region, TextRegion)
+        assert (region.text, region.lang, region.region) == ("Continue", "eng+deu", (0.0, 0.5, 1.0, 1.0))
@@ -0,0 +1,114 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Unit tests for reduced-resolution matching."""
+from unittest.mock import Mock, patch
+
+import cv2
+import pytest
+
+from shadowstep.image.frame_cache import FrameCache
+from shadowstep.image.reduced_decode import decode_reduced_gray, get_match_reduction, set_match_reduction
+from shadowstep.image.text_region import TextRegion
+
+
+@pytest.fixture
+def screen(make_screen):
+    """720x1600 color screen with a 120x120 icon at (400, 1200)."""
+    return make_screen(1600, 720, icon_at=(400, 1200), icon_size=120, color=True)
+
+
+@pytest.fixture
+def png(screen):
+    """Screen encoded as the device sends it."""
+    return cv2.imencode(".png", screen)[1].tobytes()
+
+
+@pytest.fixture
+def icon(screen):
+    """Grayscale template of the icon."""
+    return cv2.cvtColor(screen[1200:1320, 400:520], cv2.COLOR_BGR2GRAY)
+
+
+def close(box, expected, tolerance=8):
+    return all(abs(a - b) <= tolerance for a, b in zip(box, expected))
+
+
+class TestReducedDecode:
+    """Test reduced grayscale decoding."""
+
+    @pytest.mark.parametrize("factor", [1, 2, 4, 8])
+    def test_decoded_size(self, factor, png):
+        """Test both sides are divided by the factor."""
+        assert decode_reduced_gray(png, factor).shape == (1600 // factor, 720 // factor)
+
+    def test_invalid_factor(self):
+        """Test only the reductions imdecode supports are accepted."""
+        with pytest.raises(ValueError, match="got 3"):
+            set_match_reduction(3)
+        assert get_match_reduction() == 1
+
+    def test_frame_decodes_each_factor_once(self, png):
+        """Test a frame keeps its reduced images."""
+        frame = FrameCache(ttl=10).get(object(), lambda: png)
+        with patch("cv2.imdecode", wraps=cv2.imdecode) as imdecode:
+            half = frame.reduced_gray(2)
+            assert frame.reduced_gray(2) is half
+            frame.reduced_gray(4)
+        assert imdecode.call_count == 2
+        assert not half.flags.writeable
+        assert frame.reduced_gray(1) is frame.gray
+
+
+class TestReducedMatching:
+    """Test visibility checks at reduced resolution."""
+
+    @pytest.mark.parametrize("factor", [2, 4])
+    def test_coordinates_in_device_pixels(self, factor, make_image, icon, screen):
+        """Test the icon is found on the reduced screen and reported at full size."""
+        set_match_reduction(factor)
+        with patch("cv2.imdecode", wraps=cv2.imdecode) as imdecode:
+            coords = make_image(icon, screen)._get_image_coordinates()
+        assert coords is not None and close(coords, (400, 1200, 520, 1320))
+        assert [call.args[1] for call in imdecode.call_args_list] == [cv2.IMREAD_REDUCED_GRAYSCALE_2 if factor == 2 else cv2.IMREAD_REDUCED_GRAYSCALE_4]
+
+    def test_region_scaled_to_reduced_screen(self, caplog, make_image, icon, screen):
+        """Test a pixel region is searched in reduced screen pixels."""
+        set_match_reduction(2)
+        with caplog.at_level("INFO"):
+            coords = make_image(icon, screen, region=(0, 0, 720, 800))._get_image_coordinates()
+        assert "region (0, 0, 360, 400)" in caplog.text
+        assert coords is not None and close(coords, (400, 1200, 520, 1320))
+
+    def test_fraction_and_element_regions(self, make_image, icon, screen):
+        """Test fractional regions are kept and element bounds are scaled."""
+        image = make_image(icon, screen, region=(0.0, 0.5, 1.0, 1.0))
+        assert image._reduced_region(2) == (0.0, 0.5, 1.0, 1.0)
+        element = Mock(spec=["get_coordinates"])
+        element.get_coordinates.return_value = (100, 200, 300, 400)
+        with patch("shadowstep.image.image.Element", type(element)):
+            image.region = element
+            assert image._reduced_region(4) == (25, 50, 75, 100)
+
+    def test_reduced_view_is_reused(self, make_image, icon, screen):
+        """Test the shrunk template is built once per factor."""
+        image = make_image(icon, screen)
+        view = image._reduced_view(2)
+        assert image._reduced_view(2) is view
+        assert view._image.shape == (60, 60)
+        assert view._template_key != image._template_key
+
+    def test_default_matches_full_resolution(self, make_image, icon, screen):
+        """Test without a reduction the full-size gray frame is searched."""
+        with patch("cv2.imdecode", wraps=cv2.imdecode) as imdecode:
+            coords = make_image(icon, screen)._get_image_coordinates()
+        assert coords == (400, 1200, 520, 1320)
+        assert imdecode.call_args.args[1] == cv2.IMREAD_COLOR
+
+    def test_text_regions_ignore_reduction(self):
+        """Test OCR keeps reading full-resolution screens."""
+        set_match_reduction(4)
+        assert TextRegion("Go")._match_reduction() == 1
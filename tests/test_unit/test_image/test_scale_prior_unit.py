@@ -0,0 +1,94 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Unit tests for the learned per-device template scale."""
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
+from shadowstep.image.image import ShadowstepImage
+from shadowstep.image.scale_prior import ScalePrior, scale_prior
+
+
+class TestScalePrior:
+    """Test storage and persistence of learned scales."""
+
+    def test_record_get_forget(self):
+        """Test scales are kept per device and template."""
+        prior = ScalePrior()
+        prior.record("phone", "icon", 0.5)
+
+        assert prior.get("phone", "icon") == 0.5
+        assert prior.get("tablet", "icon") is None
+
+        prior.forget("phone", "icon")
+        assert prior.get("phone", "icon") is None
+
+    def test_save_and_load(self, tmp_path):
+        """Test scales survive a save/load round trip."""
+        path = tmp_path / "scales.json"
+        prior = ScalePrior()
+        prior.record("phone", "icon", 1.5)
+        prior.save(path)
+
+        loaded = ScalePrior()
+        loaded.load(path)
+
+        assert loaded.get("phone", "icon") == 1.5
+        assert len(loaded) == 1
+
+
+class TestShadowstepImageScalePrior:
+    """Test multi_scale_matching uses and updates the learned scale."""
+
+    def test_second_search_is_single_match(self, make_screen):
+        """Test the remembered scale turns the next search into one matchTemplate call."""
+        screen = make_screen()
+        template = screen[700:780, 200:360].copy()
+        image = ShadowstepImage("x")
+
+        image.multi_scale_matching(screen, template, template_key="icon")
+        with patch("cv2.matchTemplate", wraps=cv2.matchTemplate) as match_template:
+            confidence, location = image.multi_scale_matching(screen, template, template_key="icon")
+
+        assert match_template.call_count == 1
+        assert confidence > 0.95
+        assert location == (200, 700)
+        assert scale_prior.hits == 1
+
+    def test_miss_widens_search_and_relearns(self, make_screen):
+        """Test a stale scale falls back to the full search and is replaced."""
+        screen = make_screen(seed=1)
+        template = screen[200:300, 100:300].copy()
+        image = ShadowstepImage("x")
+        device = image._device_key(screen)
+        scale_prior.record(device, "icon", 2.0)
+
+        confidence, location = image.multi_scale_matching(screen, template, template_key="icon")
+
+        assert confidence > 0.95
+        assert location == (100, 200)
+        assert scale_prior.get(device, "icon") == pytest.approx(1.0)
+        assert scale_prior.misses == 1
+
+    def test_without_template_key_nothing_is_learned(self, make_screen):
+        """Test anonymous templates do not populate the prior."""
+        screen = make_screen(seed=2)
+        template = screen[200:300, 100:300].copy()
+
+        ShadowstepImage("x").multi_scale_matching(screen, template)
+
+        assert len(scale_prior) == 0
+
+    def test_device_key_uses_capabilities_and_resolution(self):
+        """Test devices are told apart by udid and screen size."""
+        image = ShadowstepImage("x")
+        screen = np.zeros((2400, 1080), dtype=np.uint8)
+
+        with patch.object(image.shadowstep, "capabilities", {"appium:udid": "emulator-5554"}):
+            assert image._device_key(screen) == "emulator-5554@1080x2400"
@@ -0,0 +1,194 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Unit tests for scroll offset tracking and scroll-to-image on revealed bands."""
+import base64
+from unittest.mock import Mock, patch
+
+import cv2
+import numpy as np
+import pytest
+
+from shadowstep.exceptions.shadowstep_exceptions import ShadowstepImageNotFoundError
+from shadowstep.image.image import ShadowstepImage
+from shadowstep.image.scroll_tracker import ScrollTracker
+
+WINDOW = (360, 640)
+ICON_AT = (150, 1500)
+
+
+def make_document(height=2400):
+    """Tall 360 px wide grayscale page of textured list rows with an icon at ICON_AT."""
+    noise = np.random.default_rng(0).integers(0, 120, (height // 20, 18), dtype=np.uint8)
+    page = cv2.resize(noise, (WINDOW[0], height), interpolation=cv2.INTER_CUBIC)
+    for top in range(0, height, 90):
+        page[top:top + 4] = 200
+    x, y = ICON_AT
+    cv2.rectangle(page, (x, y), (x + 40, y + 40), 255, -1)
+    cv2.circle(page, (x + 20, y + 20), 10, 0, -1)
+    return page
+
+
+DOCUMENT = make_document()
+ICON = DOCUMENT[ICON_AT[1] - 10:ICON_AT[1] + 50, ICON_AT[0] - 10:ICON_AT[0] + 50].copy()
+
+
+def window_at(offset, document=DOCUMENT, horizontal=False):
+    """Screen showing the document scrolled by offset, under a status bar with a clock.
+
+    A horizontal screen shows the document turned on its side, scrolled along x.
+    """
+    screen = document[offset:offset + WINDOW[1]].copy()
+    if horizontal:
+        screen = np.ascontiguousarray(screen.T)
+    screen[:24] = 30
+    cv2.putText(screen, str(offset), (10, 18), cv2.FONT_HERSHEY_SIMPLEX, 0.5, 255, 1)
+    return screen
+
+
+class ScrollingDriver:
+    """Driver stand-in whose content follows the finger by step pixels, within the document.
+
+    A horizontal driver shows the document turned on its side, scrolling along x.
+    """
+
+    capabilities = {}
+
+    def __init__(self, document=DOCUMENT, step=250, horizontal=False, offset=0):
+        self.document = document
+        self.step = step
+        self.horizontal = horizontal
+        self.offset = offset
+        width, height = WINDOW[::-1] if horizontal else WINDOW
+        self.get_window_size = Mock(return_value={"width": width, "height": height})
+
+    def get_screenshot_as_base64(self):
+        png = cv2.imencode(".png", window_at(self.offset, self.document, self.horizontal))[1].tobytes()
+        return base64.b64encode(png).decode()
+
+    def swipe(self, start_x, start_y, end_x, end_y, duration=None):
+        # moving the finger toward the start of the axis reveals the rest of the document
+        backwards = end_x < start_x if self.horizontal else end_y < start_y
+        offset = self.offset + (self.step if backwards else -self.step)
+        self.offset = max(0, min(len(self.document) - WINDOW[1], offset))
+
+
+class TestScrollTracker:
+    """Test measuring how far the content moved between frames."""
+
+    def test_offset_and_revealed_band(self):
+        """Test a downward scroll reveals a band at the bottom, widened by the margin."""
+        tracker = ScrollTracker("down")
+        assert tracker.step(window_at(0), 50) == (True, None)
+        moved, band = tracker.step(window_at(200), 50)
+        assert moved
+        assert abs(tracker.offset + 200) <= 4
+        x1, y1, x2, y2 = band
+        assert (x1, x2, y2) == (0, WINDOW[0], WINDOW[1])
+        assert abs(y1 - (WINDOW[1] - 200 - 50)) <= 24
+
+    def test_unchanged_content_is_end(self):
+        """Test a frame differing only in the status bar means the content did not move."""
+        tracker = ScrollTracker("down")
+        tracker.step(window_at(300), 50)
+        screen = window_at(300)
+        cv2.putText(screen, "9:41", (200, 18), cv2.FONT_HERSHEY_SIMPLEX, 0.5, 255, 1)
+        assert tracker.step(screen, 50) == (False, None)
+        assert tracker.offset == 0
+
+    def test_movement_against_direction_searches_everything(self):
+        """Test an offset opposite to the swipe is not trusted."""
+        tracker = ScrollTracker("up")
+        tracker.step(window_at(0), 50)
+        assert tracker.step(window_at(200), 50) == (True, None)
+        assert tracker.offset is None
+
+    def test_scroll_left_reveals_right_edge(self):
+        """Test a scroll left moves the content left and reveals a band at the right edge."""
+        tracker = ScrollTracker("left", masks=())
+        tracker.step(window_at(0, horizontal=True), 40)
+        moved, band = tracker.step(window_at(150, horizontal=True), 40)
+        assert moved
+        assert abs(tracker.offset + 150) <= 4
+        assert (band[1], band[2], band[3]) == (0, WINDOW[1], WINDOW[0])
+        assert band[0] >= WINDOW[1] - 150 - 40 - 24
+
+    def test_scroll_right_reveals_left_edge(self):
+        """Test a scroll right moves the content right and reveals a band at the left edge."""
+        tracker = ScrollTracker("right", masks=())
+        tracker.step(window_at(150, horizontal=True), 40)
+        moved, band = tracker.step(window_at(0, horizontal=True), 40)
+        assert moved
+        assert abs(tracker.offset - 150) <= 4
+        assert (band[0], band[1], band[3]) == (0, 0, WINDOW[0])
+        assert band[2] <= 150 + 40 + 24
+
+    def test_horizontal_movement_against_direction_searches_everything(self):
+        """Test content moving left is not trusted while scrolling right."""
+        tracker = ScrollTracker("right", masks=())
+        tracker.step(window_at(0, horizontal=True), 40)
+        assert tracker.step(window_at(150, horizontal=True), 40) == (True, None)
+        assert tracker.offset is None
+
+
+class TestScrollToImage:
+    """Test scroll_down matching only what each swipe revealed."""
+
+    def test_found_in_revealed_band(self, make_image):
+        """Test the image is found with screenshot coordinates after matching only new bands."""
+        driver = ScrollingDriver()
+        image = make_image(ICON, driver=driver)
+        searched = []
+        locate_in_rect = ShadowstepImage._locate_in_rect
+
+        def spy(self, crop, origin, device_key):
+            searched.append(crop.shape[0])
+            return locate_in_rect(self, crop, origin, device_key)
+
+        with patch.object(ShadowstepImage, "_locate_in_rect", spy), patch("time.sleep"):
+            assert image.scroll_down(max_attempts=10) is image
+
+        offset = driver.offset
+        assert offset == 1000
+        x1, y1, _, _ = image.coordinates
+        assert (x1, y1) == (ICON_AT[0] - 10, ICON_AT[1] - 10 - offset)
+        # First frame whole, then the 250 px each swipe revealed plus twice the template side
+        assert searched[0] == WINDOW[1]
+        assert all(height <= 250 + 2 * ICON.shape[0] + 16 for height in searched[1:])
+        driver.get_window_size.assert_called_once()
+
+    @pytest.mark.parametrize(
+        ("direction", "start", "end"),
+        [("left", 0, 1000), ("right", len(DOCUMENT) - WINDOW[1], 1260)],
+    )
+    def test_horizontal_scroll_matches_revealed_bands(self, make_image, direction, start, end):
+        """Test scroll_left and scroll_right measure the offset and match only the new columns."""
+        driver = ScrollingDriver(horizontal=True, offset=start)
+        image = make_image(np.ascontiguousarray(ICON.T), driver=driver)
+        searched = []
+        locate_in_rect = ShadowstepImage._locate_in_rect
+
+        def spy(self, crop, origin, device_key):
+            searched.append(crop.shape[1])
+            return locate_in_rect(self, crop, origin, device_key)
+
+        with patch.object(ShadowstepImage, "_locate_in_rect", spy), patch("time.sleep"):
+            assert getattr(image, f"scroll_{direction}")(max_attempts=10) is image
+
+        assert driver.offset == end
+        x1, y1, _, _ = image.coordinates
+        assert (x1, y1) == (ICON_AT[1] - 10 - end, ICON_AT[0] - 10)
+        assert searched[0] == WINDOW[1]
+        assert len(searched) > 1
+        assert all(width <= 250 + 2 * ICON.shape[0] + 16 for width in searched[1:])
+
+    def test_stops_at_end_of_content(self, make_image):
+        """Test the loop stops once a swipe leaves the screen unchanged."""
+        driver = ScrollingDriver(document=make_document(1000), step=300)
+        image = make_image(ICON, driver=driver)
+        with patch("time.sleep"), pytest.raises(ShadowstepImageNotFoundError, match="3 scroll attempts"):
+            image.scroll_down(max_attempts=10)
+        assert driver.offset == 360
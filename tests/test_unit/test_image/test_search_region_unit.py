@@ -0,0 +1,109 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Unit tests for region-of-interest image search."""
+from unittest.mock import Mock, patch
+
+import cv2
+import numpy as np
+import pytest
+
+from shadowstep.element.element import Element
+from shadowstep.image.image import ShadowstepImage
+
+
+@pytest.fixture
+def screen():
+    """Smooth random 400x800 screen."""
+    noise = np.random.default_rng(0).integers(0, 255, (100, 50), dtype=np.uint8)
+    return cv2.resize(noise, (400, 800), interpolation=cv2.INTER_CUBIC)
+
+
+def searched_shapes(image, screen):
+    """Locate image on screen and return the shapes template matching was given."""
+    shapes = []
+    original = ShadowstepImage._match_with_prior
+
+    def spy(self, full_image, template_image, *args):
+        shapes.append(full_image.shape)
+        return original(self, full_image, template_image, *args)
+
+    with patch.object(ShadowstepImage, "_match_with_prior", spy):
+        coords = image.locate_in(screen)
+    return coords, shapes
+
+
+class TestResolveRegion:
+    """Test conversion of regions into pixel rects."""
+
+    def test_pixel_rect_is_clipped(self, screen):
+        """Test pixel rects are clipped to the screen."""
+        image = ShadowstepImage("x", region=(-10, 100, 500, 300))
+        assert image._resolve_region(screen) == (0, 100, 400, 300)
+
+    def test_fraction_rect(self, screen):
+        """Test float rects are fractions of the screen size."""
+        image = ShadowstepImage("x", region=(0.0, 0.5, 1.0, 1.0))
+        assert image._resolve_region(screen) == (0, 400, 400, 800)
+
+    def test_element_bounds(self, screen):
+        """Test elements contribute their bounds."""
+        element = Mock(spec=Element)
+        element.get_coordinates.return_value = (10, 20, 110, 220)
+        image = ShadowstepImage("x", region=element)
+        assert image._resolve_region(screen) == (10, 20, 110, 220)
+
+    def test_last_location_with_margin(self, screen):
+        """Test "last" expands the last found box by a margin."""
+        image = ShadowstepImage("x", region="last")
+        assert image._resolve_region(screen) is None
+
+        image._coords = (100, 100, 150, 150)
+        assert image._resolve_region(screen) == (52, 52, 198, 198)
+
+    def test_empty_region_searches_whole_screen(self, screen):
+        """Test regions outside the screen are ignored."""
+        image = ShadowstepImage("x", region=(500, 900, 600, 1000))
+        assert image._resolve_region(screen) is None
+
+
+class TestRegionSearch:
+    """Test matching within a region."""
+
+    def test_found_in_region_without_full_search(self, screen):
+        """Test only the crop is matched when the image is in the region."""
+        image = ShadowstepImage(screen[500:560, 100:220].copy(), threshold=0.9, region=(0, 400, 400, 800))
+
+        coords, shapes = searched_shapes(image, screen)
+
+        assert coords == (100, 500, 220, 560)
+        assert shapes == [(400, 400)]
+
+    def test_widens_on_miss(self, screen):
+        """Test the whole screen is searched when the region misses."""
+        image = ShadowstepImage(screen[100:160, 100:220].copy(), threshold=0.9, region=(0.0, 0.5, 1.0, 1.0))
+
+        coords, shapes = searched_shapes(image, screen)
+
+        assert coords == (100, 100, 220, 160)
+        assert shapes == [(400, 400), (800, 400)]
+
+    def test_no_widening_when_disabled(self, screen):
+        """Test widen=False keeps the search inside the region."""
+        image = ShadowstepImage(screen[100:160, 100:220].copy(), threshold=0.9, region=(0, 400, 400, 800))
+
+        assert image.locate_in(screen, widen=False) is None
+
+    def test_is_contains_searches_container_bounds(self, screen):
+        """Test is_contains only matches the target inside the container."""
+        container = ShadowstepImage(screen[400:700, 0:400].copy(), threshold=0.9)
+        inside = screen[500:560, 100:220].copy()
+        outside = screen[100:160, 100:220].copy()
+        png = cv2.imencode(".png", screen)[1].tobytes()
+
+        with patch.object(ShadowstepImage, "_get_screenshot_as_bytes", return_value=png):
+            assert container.is_contains(inside) is True
+            assert container.is_contains(outside) is False
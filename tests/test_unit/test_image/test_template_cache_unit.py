@@ -0,0 +1,116 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Unit tests for the process-wide template cache."""
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+
+from shadowstep.image.image import ShadowstepImage
+from shadowstep.image.template_cache import TemplateCache
+
+
+class TestTemplateCacheKey:
+    """Test content hashing of templates."""
+
+    def test_same_content_same_key_across_formats(self, tmp_path):
+        """Test that a file and its bytes hash to the same key."""
+        data = cv2.imencode(".png", np.full((10, 10), 200, dtype=np.uint8))[1].tobytes()
+        path = tmp_path / "icon.png"
+        path.write_bytes(data)
+
+        assert TemplateCache.key_for(str(path)) == TemplateCache.key_for(data)
+
+    def test_array_key_depends_on_content(self):
+        """Test that arrays with different pixels get different keys."""
+        first = np.zeros((5, 5), dtype=np.uint8)
+        second = first.copy()
+        second[0, 0] = 1
+
+        assert TemplateCache.key_for(first) == TemplateCache.key_for(first.copy())
+        assert TemplateCache.key_for(first) != TemplateCache.key_for(second)
+
+    def test_missing_file_has_no_key(self):
+        """Test that unreadable paths bypass the cache."""
+        assert TemplateCache.key_for("/nonexistent/icon.png") is None
+
+
+class TestTemplateCacheStorage:
+    """Test LRU storage and resized copies."""
+
+    def test_get_put_and_stats(self):
+        """Test hits and misses are counted."""
+        cache = TemplateCache()
+        assert cache.get("a") is None
+        cache.put("a", np.zeros((4, 4), dtype=np.uint8))
+
+        assert cache.get("a") is not None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_cached_template_is_read_only_copy(self):
+        """Test the cache does not alias the caller's array."""
+        cache = TemplateCache()
+        source = np.zeros((4, 4), dtype=np.uint8)
+        entry = cache.put("a", source)
+        source[0, 0] = 255
+
+        assert entry.gray[0, 0] == 0
+        assert not entry.gray.flags.writeable
+
+    def test_lru_eviction_by_bytes(self):
+        """Test the least recently used template is evicted first."""
+        cache = TemplateCache(max_bytes=250)
+        cache.put("a", np.zeros((10, 10), dtype=np.uint8))
+        cache.put("b", np.zeros((10, 10), dtype=np.uint8))
+        cache.get("a")
+        cache.put("c", np.zeros((10, 10), dtype=np.uint8))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.size == 200
+
+    def test_resized_is_computed_once(self):
+        """Test resized copies are reused from the entry."""
+        cache = TemplateCache()
+        entry = cache.put("a", np.zeros((10, 10), dtype=np.uint8))
+
+        with patch("cv2.resize", wraps=cv2.resize) as resize:
+            first = cache.resized("a", entry.gray, (5, 5))
+            second = cache.resized("a", entry.gray, (5, 5))
+
+        assert resize.call_count == 1
+        assert first is second
+        assert cache.size == 100 + 25
+
+
+class TestShadowstepImageTemplateCache:
+    """Test ShadowstepImage decodes templates through the cache."""
+
+    def test_template_decoded_once_across_polls(self, tmp_path):
+        """Test repeated matching decodes the template only once."""
+        screen = np.random.default_rng(0).integers(0, 255, (200, 200), dtype=np.uint8)
+        template = screen[50:90, 60:100].copy()
+        path = tmp_path / "icon.png"
+        cv2.imwrite(str(path), template)
+
+        img = ShadowstepImage(str(path), threshold=0.9)
+        original = img.to_ndarray
+        template_decodes = []
+
+        def to_ndarray(image, grayscale=True):
+            if isinstance(image, str):
+                template_decodes.append(image)
+            return original(image, grayscale=grayscale)
+
+        with patch.object(img, "_get_screenshot_as_bytes", return_value=cv2.imencode(".png", screen)[1].tobytes()), \
+                patch.object(img, "to_ndarray", side_effect=to_ndarray):
+            first = img._get_image_coordinates()
+            second = img._get_image_coordinates()
+
+        assert first == second == (60, 50, 100, 90)
+        assert template_decodes == [str(path)]
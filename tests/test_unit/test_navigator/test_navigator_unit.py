@@ -10,11 +10,16 @@ This module contains comprehensive tests for the PageNavigator and PageGraph cla
 covering dom functionality, pathfinding algorithms, and error handling.
 """
 
+import sys
+import types
 from collections.abc import Callable
+from pathlib import Path
 from unittest.mock import Mock, patch
 
 import networkx as nx
+import numpy as np
 import pytest
+from lxml import etree
 from selenium.common import WebDriverException
 
 from shadowstep.exceptions.shadowstep_exceptions import (
@@ -26,7 +31,17 @@ from shadowstep.exceptions.shadowstep_exceptions import (
     ShadowstepPathMustContainAtLeastTwoPagesError,
     ShadowstepNavigationFailedError,
 )
-from shadowstep.navigator.navigator import DEFAULT_NAVIGATION_TIMEOUT, PageGraph, PageNavigator
+from shadowstep.image.fingerprint import FingerprintIndex
+from shadowstep.image.frame_cache import frame_cache
+from shadowstep.navigator.navigator import (
+    ARRIVAL_POLL_INITIAL,
+    ARRIVAL_POLL_MAX,
+    DEFAULT_NAVIGATION_TIMEOUT,
+    PageGraph,
+    PageNavigator,
+)
+from shadowstep.navigator.page_graph import DEFAULT_EDGE_COST, EdgeStats
+from shadowstep.page_base import PageBaseShadowstep
 
 
 class MockPage:
@@ -556,3 +571,525 @@ class TestPageNavigator:
             result = graph.find_shortest_path(page1, page2)
         
         assert result is None  # noqa: S101
+
+
+class TestLazyEdgeRegistration:
+    """Test cases for static and deferred edge registration."""
+
+    @pytest.fixture
+    def navigator(self) -> PageNavigator:
+        """Create a PageNavigator instance with mock Shadowstep."""
+        return PageNavigator(Mock())
+
+    @staticmethod
+    def _page_classes(created: list[str]) -> types.ModuleType:
+        """Build a module with one static-edge page and one legacy page."""
+
+        class PageStatic(PageBaseShadowstep):
+            edge_targets = ("PageLegacy",)
+
+            def __init__(self) -> None:
+                created.append("PageStatic")
+
+            @property
+            def edges(self) -> dict[str, Callable[[], None]]:
+                return {"PageLegacy": lambda: None}
+
+        class PageLegacy(PageBaseShadowstep):
+            def __init__(self) -> None:
+                created.append("PageLegacy")
+
+            @property
+            def edges(self) -> dict[str, Callable[[], None]]:
+                return {"PageStatic": lambda: None}
+
+        module = types.ModuleType("pages_fake")
+        module.PageStatic = PageStatic
+        module.PageLegacy = PageLegacy
+        return module
+
+    @pytest.mark.unit
+    def test_register_does_not_instantiate_pages(self, navigator: PageNavigator) -> None:
+        """Test that registering pages from a module runs no page constructors."""
+        created: list[str] = []
+        module = self._page_classes(created)
+
+        with patch.object(PageBaseShadowstep, "_instances", {}), \
+                patch.dict(PageNavigator.pages, clear=True):
+            navigator._register_pages_from_module(module)
+            assert created == []  # noqa: S101
+            assert navigator.graph_manager.nx_graph.has_edge("PageStatic", "PageLegacy")  # noqa: S101
+
+            result = navigator.find_path("PageLegacy", "PageStatic")
+
+        assert result == ["PageLegacy", "PageStatic"]  # noqa: S101
+        assert created == ["PageLegacy"]  # noqa: S101
+
+    @pytest.mark.unit
+    def test_lazy_loader_error_leaves_page_without_edges(self) -> None:
+        """Test that a failing edge loader does not break graph lookups."""
+        graph = PageGraph()
+        graph.add_lazy_page("page1", Mock(side_effect=RuntimeError("boom")))
+
+        assert graph.get_edges("page1") == []  # noqa: S101
+        assert graph.nx_graph.has_node("page1")  # noqa: S101
+
+    @pytest.mark.unit
+    def test_auto_discover_reuses_graph_across_navigators(self) -> None:
+        """Test that page discovery runs once and its graph is shared."""
+        with patch.object(PageNavigator, "_discovered_graph", None), \
+                patch.object(sys, "path", []):
+            first = PageNavigator(Mock())
+            first.auto_discover_pages()
+            second = PageNavigator(Mock())
+            second.auto_discover_pages()
+
+        assert second.graph_manager is first.graph_manager  # noqa: S101
+
+
+class TestPathCache:
+    """Test cases for cached path lookups and tour planning."""
+
+    @pytest.fixture
+    def navigator(self) -> PageNavigator:
+        """Create a PageNavigator with a small graph: a -> b -> c, a -> d."""
+        navigator = PageNavigator(Mock())
+        navigator.add_page("a", {"b": None, "d": None})
+        navigator.add_page("b", {"c": None})
+        navigator.add_page("c", {"a": None})
+        navigator.add_page("d", {})
+        return navigator
+
+    @pytest.mark.unit
+    def test_find_shortest_path_reuses_source_tree(self, navigator: PageNavigator) -> None:
+        """Test that repeated lookups from one source run a single search."""
+        graph = navigator.graph_manager
+        with patch(
+            "networkx.dijkstra_predecessor_and_distance",
+            wraps=nx.dijkstra_predecessor_and_distance,
+        ) as search:
+            assert graph.find_shortest_path("a", "c") == ["a", "b", "c"]  # noqa: S101
+            assert graph.find_shortest_path("a", "d") == ["a", "d"]  # noqa: S101
+            assert graph.has_path("a", "c") is True  # noqa: S101
+
+        assert search.call_count == 1  # noqa: S101
+
+    @pytest.mark.unit
+    def test_add_page_invalidates_cache(self, navigator: PageNavigator) -> None:
+        """Test that adding a page drops cached paths."""
+        graph = navigator.graph_manager
+        assert graph.find_shortest_path("d", "c") is None  # noqa: S101
+
+        graph.add_page("d", {"c": None})
+
+        assert graph.find_shortest_path("d", "c") == ["d", "c"]  # noqa: S101
+
+    @pytest.mark.unit
+    def test_find_shortest_path_miss_logs_no_traceback(
+        self, navigator: PageNavigator, caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """Test that a missing path is not reported as an error."""
+        with caplog.at_level("DEBUG", logger="shadowstep.navigator.page_graph"):
+            result = navigator.graph_manager.find_shortest_path("d", "unknown")
+
+        assert result is None  # noqa: S101
+        assert all(record.exc_info is None for record in caplog.records)  # noqa: S101
+
+    @pytest.mark.unit
+    def test_plan_tour_visits_all_targets(self, navigator: PageNavigator) -> None:
+        """Test that the tour goes nearest-first and skips targets passed on the way."""
+        assert navigator.plan_tour("b", ["a", "c"]) == ["b", "c", "a"]  # noqa: S101
+        assert navigator.plan_tour("a", ["c", "b", "d"]) == ["a", "b", "c", "a", "d"]  # noqa: S101
+
+    @pytest.mark.unit
+    def test_plan_tour_unreachable_target(self, navigator: PageNavigator) -> None:
+        """Test that an unreachable target makes the tour impossible."""
+        assert navigator.plan_tour("d", ["a"]) is None  # noqa: S101
+
+    @pytest.mark.unit
+    def test_navigate_many_performs_tour(self, navigator: PageNavigator) -> None:
+        """Test that navigate_many performs the planned tour in one pass."""
+        with patch.object(navigator, "perform_navigation") as mock_perform:
+            result = navigator.navigate_many("a", ["c", "b"], timeout=3)
+
+        assert result is True  # noqa: S101
+        mock_perform.assert_called_once_with(["a", "b", "c"], 3)
+
+    @pytest.mark.unit
+    def test_navigate_many_no_tour(self, navigator: PageNavigator) -> None:
+        """Test that navigate_many fails when a target is unreachable."""
+        with patch.object(navigator, "perform_navigation") as mock_perform:
+            result = navigator.navigate_many("d", ["a"])
+
+        assert result is False  # noqa: S101
+        mock_perform.assert_not_called()
+
+
+class TestWeightedNavigation:
+    """Test cases for cost-weighted path selection."""
+
+    @pytest.fixture
+    def graph(self) -> PageGraph:
+        """Create a graph with a short path a -> c and a long path a -> b -> c."""
+        graph = PageGraph()
+        graph.add_page("a", {"b": None, "c": None})
+        graph.add_page("b", {"c": None})
+        graph.add_page("c", {})
+        return graph
+
+    @pytest.mark.unit
+    def test_unmeasured_edges_use_default_cost(self, graph: PageGraph) -> None:
+        """Test that without measurements the fewest hops win."""
+        assert graph.edge_cost("a", "c") == DEFAULT_EDGE_COST  # noqa: S101
+        assert graph.find_shortest_path("a", "c") == ["a", "c"]  # noqa: S101
+
+    @pytest.mark.unit
+    def test_slow_edge_is_avoided(self, graph: PageGraph) -> None:
+        """Test that a measured slow edge reroutes through faster hops."""
+        graph.find_shortest_path("a", "c")
+        graph.record_transition("a", "c", 5.0, success=True)
+        graph.record_transition("a", "b", 0.2, success=True)
+        graph.record_transition("b", "c", 0.2, success=True)
+
+        assert graph.find_shortest_path("a", "c") == ["a", "b", "c"]  # noqa: S101
+
+    @pytest.mark.unit
+    def test_small_cost_change_keeps_cached_paths(self, graph: PageGraph) -> None:
+        """Test that a hop costing about the applied weight does not drop cached paths."""
+        graph.find_shortest_path("a", "c")
+        graph.record_transition("a", "c", 1.1, success=True)
+
+        assert "a" in graph._path_cache  # noqa: S101, SLF001
+        assert graph.nx_graph["a"]["c"]["weight"] == DEFAULT_EDGE_COST  # noqa: S101
+
+        graph.record_transition("a", "c", 3.0, success=True)
+
+        assert graph._path_cache == {}  # noqa: S101, SLF001
+        assert graph.nx_graph["a"]["c"]["weight"] == graph.edge_cost("a", "c")  # noqa: S101
+
+    @pytest.mark.unit
+    def test_failures_raise_expected_cost(self) -> None:
+        """Test that failed attempts make an edge more expensive."""
+        stats = EdgeStats(attempts=3, failures=2, total_seconds=3.0)
+
+        assert stats.mean_seconds == 1.0  # noqa: S101
+        assert stats.failure_rate == 0.5  # noqa: S101
+        assert stats.expected_cost == 2.0  # noqa: S101
+
+    @pytest.mark.unit
+    def test_save_and_load_stats(self, graph: PageGraph, tmp_path: Path) -> None:
+        """Test that measured stats survive a round trip through disk."""
+        graph.record_transition("a", "c", 5.0, success=False)
+        path = tmp_path / "stats.json"
+        graph.save_stats(path)
+
+        restored = PageGraph()
+        restored.load_stats(path)
+        restored.add_page("a", {"c": None})
+
+        assert restored.edge_stats[("a", "c")] == EdgeStats(1, 1, 5.0)  # noqa: S101
+        assert restored.nx_graph["a"]["c"]["weight"] == graph.edge_cost("a", "c")  # noqa: S101
+
+    @pytest.mark.unit
+    def test_perform_navigation_records_transitions(self) -> None:
+        """Test that every hop is timed and recorded into the graph."""
+        navigator = PageNavigator(Mock())
+        page1 = MockPageBase("page1")
+        page2 = MockPageBase("page2")
+        page2.is_current_page = Mock(return_value=False)
+        page1.edges = {"page2": Mock()}
+        navigator.shadowstep.resolve_page = Mock(side_effect=lambda name: page1 if name == "page1" else page2)
+
+        with pytest.raises(ShadowstepNavigationFailedError):
+            navigator.perform_navigation(["page1", "page2"], timeout=0)
+        page2.is_current_page = Mock(return_value=True)
+        navigator.perform_navigation(["page1", "page2"], timeout=1)
+
+        stats = navigator.graph_manager.edge_stats[("page1", "page2")]
+        assert stats.attempts == 2  # noqa: S101
+        assert stats.failures == 1  # noqa: S101
+
+
+HIERARCHY = """<?xml version='1.0' encoding='UTF-8'?>
+<hierarchy rotation="0">
+  <node class="android.widget.FrameLayout" content-desc="Settings home">
+    <node class="android.widget.TextView" text="Settings" resource-id="com.android.settings:id/homepage_title"/>
+    <node class="android.widget.TextView" text="Network &amp; internet"/>
+  </node>
+</hierarchy>
+"""
+
+
+class PageHome(MockPageBase):
+    """Page whose signature is fully present in HIERARCHY."""
+
+    signature = (
+        {"resource-id": "com.android.settings:id/homepage_title"},
+        {"text": "Network & internet"},
+    )
+
+
+class PagePartial(MockPageBase):
+    """Page whose signature is half present in HIERARCHY."""
+
+    signature = (
+        {"text": "Settings"},
+        ("xpath", "//*[@text='About phone']"),
+    )
+
+
+class PageAbsent(MockPageBase):
+    """Page whose signature is missing from HIERARCHY."""
+
+    signature = ({"text": "Battery"},)
+
+
+class PageTuples(MockPageBase):
+    """Page whose signature uses driver strategies, all present in HIERARCHY."""
+
+    signature = (
+        ("id", "com.android.settings:id/homepage_title"),
+        ("id", "homepage_title"),
+        ("accessibility id", "Settings home"),
+        ("class name", "android.widget.TextView"),
+    )
+
+
+class PageUnmatchable(MockPageBase):
+    """Page whose signature cannot be matched against a page source."""
+
+    signature = (("-android uiautomator", 'new UiSelector().text("Settings")'),)
+
+
+class TestIdentifyCurrentPage:
+    """Test cases for single-snapshot page identification."""
+
+    @pytest.fixture
+    def navigator(self) -> PageNavigator:
+        """Create a PageNavigator whose driver returns HIERARCHY."""
+        shadowstep = Mock()
+        shadowstep.driver.page_source = HIERARCHY
+        return PageNavigator(shadowstep)
+
+    @pytest.mark.unit
+    def test_identify_ranks_candidates(self, navigator: PageNavigator) -> None:
+        """Test that pages are ranked by matched share of their signature."""
+        pages = {
+            "PagePartial": PagePartial,
+            "PageHome": PageHome,
+            "PageAbsent": PageAbsent,
+            "PageNoSignature": MockPageBase,
+        }
+        with patch.dict(PageNavigator.pages, pages, clear=True):
+            result = navigator.identify_current_page()
+
+        assert result == [("PageHome", 1.0), ("PagePartial", 0.5)]  # noqa: S101
+
+    @pytest.mark.unit
+    def test_identify_tuple_signatures(self, navigator: PageNavigator) -> None:
+        """Test that id, accessibility id and class name tuples match their node attributes."""
+        pages = {"PageTuples": PageTuples, "PageUnmatchable": PageUnmatchable}
+        with patch.dict(PageNavigator.pages, pages, clear=True):
+            result = navigator.identify_current_page()
+
+        assert result == [("PageTuples", 1.0)]  # noqa: S101
+        assert navigator._signature_xpaths[PageUnmatchable] is None  # noqa: S101
+
+    @pytest.mark.unit
+    def test_signature_xpath_error_is_no_match(self, navigator: PageNavigator) -> None:
+        """Test that an XPath failing on evaluation counts as unmatched instead of raising."""
+        root = navigator._parse_hierarchy(HIERARCHY)
+        xpaths = [etree.XPath("//*[no-such-function()]"), etree.XPath("//*[@text='Settings']")]
+
+        assert navigator._signature_score(xpaths, root) == 0.5  # noqa: S101
+
+    @pytest.mark.unit
+    def test_identify_compiles_signatures_once(self, navigator: PageNavigator) -> None:
+        """Test that signature locators are converted to XPath only once."""
+        with patch.dict(PageNavigator.pages, {"PageHome": PageHome}, clear=True), \
+                patch.object(navigator._converter, "to_xpath", wraps=navigator._converter.to_xpath) as to_xpath:
+            navigator.identify_current_page()
+            navigator.identify_current_page()
+
+        assert to_xpath.call_count == len(PageHome.signature)  # noqa: S101
+
+    @pytest.mark.unit
+    def test_perform_navigation_confirms_arrival_by_signature(self, navigator: PageNavigator) -> None:
+        """Test that arrival is confirmed from the snapshot, not is_current_page."""
+        page1 = MockPageBase("page1")
+        page2 = PageHome("page2")
+        page2.is_current_page = Mock(return_value=False)
+        page1.edges = {"page2": Mock()}
+        navigator.shadowstep.resolve_page = Mock(side_effect=lambda name: page1 if name == "page1" else page2)
+
+        navigator.perform_navigation(["page1", "page2"], timeout=1)
+
+        page2.is_current_page.assert_not_called()
+
+    @pytest.mark.unit
+    def test_perform_navigation_partial_signature_is_not_arrival(self, navigator: PageNavigator) -> None:
+        """Test that a partially matched signature does not count as arrival."""
+        page1 = MockPageBase("page1")
+        page2 = PagePartial("page2")
+        page1.edges = {"page2": Mock()}
+        navigator.shadowstep.resolve_page = Mock(side_effect=lambda name: page1 if name == "page1" else page2)
+
+        with pytest.raises(ShadowstepNavigationFailedError):
+            navigator.perform_navigation(["page1", "page2"], timeout=0)
+
+
+    @pytest.fixture
+    def kept_frame(self, navigator: PageNavigator):
+        """Keep a screenshot of the navigator's driver in the frame cache."""
+        frame_cache.clear()
+        frame_cache.capture(navigator.shadowstep.driver, lambda: b"screen")
+        yield
+        frame_cache.clear()
+
+    @pytest.mark.unit
+    def test_fingerprint_guess_skips_full_scan(self, navigator: PageNavigator, kept_frame: None) -> None:
+        """Test a remembered screen is verified alone, then guessed without the hierarchy."""
+        navigator.fingerprints = FingerprintIndex()
+        pages = {"PagePartial": PagePartial, "PageHome": PageHome}
+        with patch.dict(PageNavigator.pages, pages, clear=True), \
+                patch("shadowstep.navigator.navigator.fingerprint", return_value=np.zeros(4, dtype=np.uint64)):
+            assert navigator.identify_current_page() == [("PageHome", 1.0), ("PagePartial", 0.5)]  # noqa: S101
+            assert len(navigator.fingerprints) == 1  # noqa: S101
+            with patch.object(navigator, "_signature_score", wraps=navigator._signature_score) as score:
+                assert navigator.identify_current_page() == [("PageHome", 1.0)]  # noqa: S101
+            assert score.call_count == 1  # noqa: S101
+            navigator.shadowstep.get_screenshot.assert_not_called()
+            assert navigator.guess_current_page() == "PageHome"  # noqa: S101
+        assert len(navigator.fingerprints) == 1  # noqa: S101
+
+    @pytest.mark.unit
+    def test_identify_takes_no_screenshot(self, navigator: PageNavigator) -> None:
+        """Test identification without a kept screenshot scans the hierarchy and captures nothing."""
+        frame_cache.clear()
+        navigator.fingerprints = FingerprintIndex()
+        with patch.dict(PageNavigator.pages, {"PageHome": PageHome}, clear=True), \
+                patch("shadowstep.navigator.navigator.fingerprint") as fingerprint:
+            assert navigator.identify_current_page() == [("PageHome", 1.0)]  # noqa: S101
+        fingerprint.assert_not_called()
+        navigator.shadowstep.get_screenshot.assert_not_called()
+        assert len(navigator.fingerprints) == 0  # noqa: S101
+
+    @pytest.mark.unit
+    def test_fingerprints_disabled_by_default(self, navigator: PageNavigator) -> None:
+        """Test no screenshot is taken unless fingerprints are enabled."""
+        with patch.dict(PageNavigator.pages, {"PageHome": PageHome}, clear=True):
+            navigator.identify_current_page()
+            assert navigator.guess_current_page() is None  # noqa: S101
+        navigator.shadowstep.get_screenshot.assert_not_called()
+
+    @pytest.mark.unit
+    def test_perform_navigation_remembers_arrival_screen(self, navigator: PageNavigator) -> None:
+        """Test a screenshot taken after the transition is stored under the reached page."""
+        frame_cache.clear()
+        navigator.fingerprints = FingerprintIndex()
+        page1 = MockPageBase("page1")
+        page2 = MockPageBase("page2")
+        page1.edges = {"page2": Mock()}
+        # the arrival check of the next page happens to take a screenshot
+        page2.is_current_page = Mock(
+            side_effect=lambda: frame_cache.capture(navigator.shadowstep.driver, lambda: b"screen") is not None,
+        )
+        navigator.shadowstep.resolve_page = Mock(side_effect=lambda name: page1 if name == "page1" else page2)
+
+        with patch("shadowstep.navigator.navigator.fingerprint", return_value=np.ones(4, dtype=np.uint64)):
+            navigator.perform_navigation(["page1", "page2"], timeout=1)
+
+        assert navigator.fingerprints.nearest(np.ones(4, dtype=np.uint64)) == ("page2", 0)  # noqa: S101
+        navigator.shadowstep.get_screenshot.assert_not_called()
+        frame_cache.clear()
+
+    @pytest.mark.unit
+    def test_perform_navigation_ignores_screen_from_before_hop(self, navigator: PageNavigator) -> None:
+        """Test a screenshot of the previous page is not stored under the reached page."""
+        frame_cache.clear()
+        navigator.fingerprints = FingerprintIndex()
+        frame_cache.capture(navigator.shadowstep.driver, lambda: b"previous page")
+        page1 = MockPageBase("page1")
+        page2 = PageHome("page2")
+        page1.edges = {"page2": Mock()}
+        navigator.shadowstep.resolve_page = Mock(side_effect=lambda name: page1 if name == "page1" else page2)
+
+        with patch("shadowstep.navigator.navigator.fingerprint", return_value=np.ones(4, dtype=np.uint64)):
+            navigator.perform_navigation(["page1", "page2"], timeout=1)
+
+        assert len(navigator.fingerprints) == 0  # noqa: S101
+        navigator.shadowstep.get_screenshot.assert_not_called()
+        frame_cache.clear()
+
+
+class TestAdaptiveArrivalWait:
+    """Test cases for the adaptive arrival wait."""
+
+    @pytest.fixture
+    def navigator(self) -> PageNavigator:
+        """Create a PageNavigator with a mock driver."""
+        return PageNavigator(Mock())
+
+    @pytest.mark.unit
+    def test_poll_interval_grows_to_cap(self, navigator: PageNavigator) -> None:
+        """Test that the poll interval starts short and grows up to the cap."""
+        page = MockPageBase("page")
+        page.is_current_page = Mock(return_value=False)
+        sources = iter(f"<hierarchy n='{n}'/>" for n in range(100))
+        type(navigator.shadowstep.driver).page_source = property(lambda _: next(sources))
+        clock = iter(float(n) for n in range(100))
+
+        with patch("shadowstep.navigator.navigator.time.sleep") as sleep, \
+                patch("shadowstep.navigator.navigator.time.monotonic", side_effect=lambda: next(clock)):
+            result = navigator._wait_for_page(page, timeout=10)
+
+        intervals = [call.args[0] for call in sleep.call_args_list]
+        assert result is False  # noqa: S101
+        assert intervals[0] == ARRIVAL_POLL_INITIAL  # noqa: S101
+        assert intervals == sorted(intervals)  # noqa: S101
+        assert max(intervals) == ARRIVAL_POLL_MAX  # noqa: S101
+
+    @pytest.mark.unit
+    def test_unchanged_hierarchy_skips_page_check(self, navigator: PageNavigator) -> None:
+        """Test that the signature is matched again only when the hierarchy changes."""
+        page = PageHome("page")
+        sources = iter(["<a/>", "<a/>", "<a/>", HIERARCHY])
+        type(navigator.shadowstep.driver).page_source = property(lambda _: next(sources))
+
+        with patch("shadowstep.navigator.navigator.time.sleep"), \
+                patch.object(navigator, "_signature_score", wraps=navigator._signature_score) as score:
+            result = navigator._wait_for_page(page, timeout=10)
+
+        assert result is True  # noqa: S101
+        assert score.call_count == 2  # noqa: S101
+
+    @pytest.mark.unit
+    def test_returns_on_first_match_without_sleeping(self, navigator: PageNavigator) -> None:
+        """Test that an already arrived page returns without any delay."""
+        page = MockPageBase("page")
+
+        with patch("shadowstep.navigator.navigator.time.sleep") as sleep:
+            result = navigator._wait_for_page(page, timeout=10)
+
+        assert result is True  # noqa: S101
+        sleep.assert_not_called()
+
+    @pytest.mark.unit
+    def test_page_without_signature_skips_hierarchy(self, navigator: PageNavigator) -> None:
+        """Test that a page without a signature is checked without fetching the hierarchy."""
+        page = MockPageBase("page")
+        page_source = Mock(side_effect=WebDriverException("gone"))
+        type(navigator.shadowstep.driver).page_source = property(page_source)
+
+        assert navigator._wait_for_page(page, timeout=0) is True  # noqa: S101
+        page_source.assert_not_called()
+
+    @pytest.mark.unit
+    def test_snapshot_failure_keeps_polling(self, navigator: PageNavigator) -> None:
+        """Test that a failed hierarchy fetch is a miss, not an error."""
+        page = PageHome("page")
+        type(navigator.shadowstep.driver).page_source = property(
+            Mock(side_effect=WebDriverException("gone")),
+        )
+
+        assert navigator._wait_for_page(page, timeout=0) is False  # noqa: S101
@@ -11,6 +11,7 @@ import tempfile
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+import numpy as np
 import pytest
 
 from shadowstep.exceptions.shadowstep_exceptions import (
@@ -242,7 +243,10 @@ class TestPage:
         base.terminal.get_screen_resolution.return_value = (1080, 1920)
         base.terminal.adb_shell = Mock()
         base.driver = Mock()
-        base.driver.page_source = "<hierarchy><node class='test' /></hierarchy>"
+        # every scroll brings new rows into the hierarchy
+        type(base.driver).page_source = property(
+            Mock(side_effect=[f"<hierarchy><node index='{i}' /></hierarchy>" for i in range(4)])
+        )
         base.swipe = Mock()
 
         translator = Mock()
@@ -284,6 +288,57 @@ class TestPage:
         # Should call scroll_down 3 times (2 True + 1 False)
         assert mock_recycler.scroll_down.call_count == 3  # noqa: S101
 
+    def make_scrolling_explorer(self, sources):
+        """Explorer over a recycler that can always scroll, with the given page sources in turn."""
+        base = Mock()
+        base.terminal.get_screen_resolution.return_value = (1080, 1920)
+        type(base.driver).page_source = property(Mock(side_effect=sources))
+        explorer = PageObjectRecyclerExplorer(base, Mock())
+        explorer.parser.parse = Mock(return_value=Mock())
+        explorer.generator.generate = Mock(return_value=(Path("test_page.py"), "TestPage"))
+        explorer.merger.merge = Mock(return_value=True)
+        recycler = Mock()
+        recycler.scroll_down = Mock(return_value=True)
+        explorer._load_class_from_file = Mock(return_value=Mock(return_value=Mock(recycler=recycler)))
+        return explorer, recycler
+
+    def run_explore(self, explorer):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            current_dir = os.getcwd()
+            os.chdir(temp_dir)
+            try:
+                explorer.explore(temp_dir, timeout=10)
+            finally:
+                os.chdir(current_dir)
+
+    @pytest.mark.unit
+    def test_explore_stops_when_source_repeats(self):
+        """Test scrolling stops without screenshots once the page source stops changing."""
+        explorer, recycler = self.make_scrolling_explorer(["<a/>", "<b/>", "<b/>", "<end/>"])
+
+        self.run_explore(explorer)
+
+        assert recycler.scroll_down.call_count == 2  # noqa: S101
+        # original, first scroll position, final screen after scrolling back
+        assert explorer.generator.generate.call_count == 3  # noqa: S101
+        explorer.base.get_screenshot.assert_not_called()
+
+    @pytest.mark.unit
+    def test_explore_compares_screens_with_previous_position_only(self):
+        """Test alike rows seen earlier do not stop exploring, a screen that did not move does."""
+        explorer, recycler = self.make_scrolling_explorer(["<a/>", "<b/>", "<c/>", "<d/>", "<end/>"])
+        explorer.compare_screens = True
+        row, other = np.zeros(4, dtype=np.uint64), np.full(4, 2**40 - 1, dtype=np.uint64)
+        # start, a new position, the first position's look again, then no movement
+        prints = [row, other, row, row]
+
+        with patch("shadowstep.page_object.page_object_recycler_explorer.fingerprint", side_effect=prints):
+            self.run_explore(explorer)
+
+        assert recycler.scroll_down.call_count == 3  # noqa: S101
+        # original, two scroll positions, final screen after scrolling back
+        assert explorer.generator.generate.call_count == 4  # noqa: S101
+
     @pytest.mark.unit
     def test_load_class_from_file_invalid_spec(self):
         """Test _load_class_from_file method with invalid spec."""
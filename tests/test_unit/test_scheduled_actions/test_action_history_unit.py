@@ -0,0 +1,59 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Unit tests for parsing scheduled action histories."""
+from shadowstep.scheduled_actions.action_history import ActionHistory, StepException, StepResult
+
+RESPONSE = {
+    "repeats": 3,
+    "stepResults": [
+        [
+            {"name": "allow", "type": "gesture", "timestamp": 3000, "passed": False, "result": None,
+             "exception": {"name": "NoSuchElementException", "message": "not found", "stacktrace": "at ..."}},
+        ],
+        [{"name": "allow", "type": "gesture", "timestamp": 2000, "passed": True, "result": True, "exception": None}],
+        [{"name": "allow", "type": "gesture", "timestamp": 1000, "passed": True, "result": True, "exception": None}],
+    ],
+}
+
+
+class TestActionHistory:
+    """Test the wrapper over mobile: getActionHistory."""
+
+    def test_parses_runs(self):
+        """Test runs and step records are parsed, newest first."""
+        history = ActionHistory(RESPONSE, "permissions")
+        assert history.repeats == 3 and len(history) == 3
+        assert (history.passed, history.failed) == (2, 1)
+        last = history.last()
+        assert last == [StepResult(
+            name="allow",
+            step_type="gesture",
+            timestamp=3000,
+            passed=False,
+            exception=StepException("NoSuchElementException", "not found", "at ..."),
+        )]
+        assert [step.timestamp for step in history.results("allow")] == [3000, 2000, 1000]
+        assert "passed=2" in repr(history)
+
+    def test_runs_since(self):
+        """Test only runs newer than a timestamp are returned."""
+        history = ActionHistory(RESPONSE)
+        assert [run[0].timestamp for run in history.since(1000)] == [3000, 2000]
+        assert history.since(3000) == []
+
+    def test_runs_sorted_newest_first(self):
+        """Test a history listed oldest first is kept newest first."""
+        history = ActionHistory({**RESPONSE, "stepResults": list(reversed(RESPONSE["stepResults"]))})
+        assert history.last()[0].timestamp == 3000
+        assert [step.timestamp for step in history.results("allow")] == [3000, 2000, 1000]
+        assert [run[0].timestamp for run in history.since(1000)] == [3000, 2000]
+
+    def test_empty_response(self):
+        """Test an action that has not run yet."""
+        history = ActionHistory(None)
+        assert history.repeats == 0 and history.last() is None and list(history) == []
+        assert history.results("allow") == []
@@ -0,0 +1,51 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Unit tests for scheduled action step builders."""
+from unittest.mock import Mock
+
+import pytest
+
+from shadowstep.element.element import Element
+from shadowstep.scheduled_actions.action_step import ActionStep
+
+
+class TestActionStep:
+    """Test steps are built in the format of mobile: scheduleAction."""
+
+    def test_click_with_tuple_locator(self):
+        """Test a tuple locator keeps its strategy."""
+        step = ActionStep.gesture_click("allow", ("id", "com.android:id/button1"))
+        assert step.to_dict() == {
+            "type": "gesture",
+            "name": "allow",
+            "payload": {"subtype": "click", "locator": {"strategy": "id", "selector": "com.android:id/button1"}},
+        }
+
+    def test_long_click_with_dict_locator(self):
+        """Test a dict locator is sent as XPath."""
+        step = ActionStep.gesture_long_click("hold", {"text": "Allow"})
+        assert step.payload == {"subtype": "longClick", "locator": {"strategy": "xpath", "selector": "//*[@text='Allow']"}}
+
+    def test_click_with_element(self):
+        """Test an element is located by its locator."""
+        element = Mock(spec=Element)
+        element.locator = ("accessibility id", "Close")
+        step = ActionStep.gesture_click("close", element)
+        assert step.payload["locator"] == {"strategy": "accessibility id", "selector": "Close"}
+
+    def test_double_click_source_and_screenshot(self):
+        """Test the steps without locators."""
+        assert ActionStep.gesture_double_click("dbl", "el-1", 10, 20).payload == {
+            "subtype": "doubleClick", "elementId": "el-1", "x": 10, "y": 20,
+        }
+        assert ActionStep.source("xml").to_dict() == {"type": "source", "name": "xml", "payload": {"subtype": "xml"}}
+        assert ActionStep.screenshot("png").to_dict() == {"type": "screenshot", "name": "png", "payload": {"subtype": "png"}}
+
+    def test_empty_name(self):
+        """Test a step needs a name for its history records."""
+        with pytest.raises(ValueError, match="must not be empty"):
+            ActionStep.source("")
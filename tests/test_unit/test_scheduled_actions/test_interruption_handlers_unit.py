@@ -0,0 +1,122 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Unit tests for interruption handlers running as scheduled actions."""
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from shadowstep.scheduled_actions.action_history import ActionHistory
+from shadowstep.scheduled_actions.interruption_handlers import (
+    HANDLER_ACTION_PREFIX,
+    HandlerEvent,
+    InterruptionHandlers,
+)
+
+ALLOW = HANDLER_ACTION_PREFIX + "allow"
+
+
+def run(timestamp, passed):
+    return [{"name": "allow", "type": "gesture", "timestamp": timestamp, "passed": passed}]
+
+
+class FakeSession:
+    """Shadowstep stand-in keeping scheduled actions and the runs the server made."""
+
+    def __init__(self):
+        self.scheduled = {}
+        self.runs = {}
+        self.schedule_action = Mock(side_effect=self._schedule)
+        self.unschedule_action = Mock(side_effect=self._unschedule)
+
+    def _schedule(self, name, steps, **kwargs):
+        self.scheduled[name] = (steps, kwargs)
+        self.runs.setdefault(name, [])
+
+    def _unschedule(self, name):
+        self.scheduled.pop(name)
+        return self.get_action_history(name)
+
+    def get_action_history(self, name):
+        runs = self.runs[name]
+        return ActionHistory({"repeats": len(runs), "stepResults": list(reversed(runs))}, name)
+
+
+@pytest.fixture
+def session():
+    return FakeSession()
+
+
+class TestInterruptionHandlers:
+    """Test installing handlers and reporting what fired."""
+
+    def test_install_schedules_each_handler(self, session):
+        """Test every handler becomes a repeating click action."""
+        handlers = InterruptionHandlers(session, interval_ms=300, report_interval=None)
+        handlers.register("allow", {"text": "Allow"}).register("later", ("id", "android:id/button2"), "long_click")
+        assert len(handlers) == 2 and "allow" in handlers
+        handlers.install()
+        steps, kwargs = session.scheduled[ALLOW]
+        assert steps[0].payload == {"subtype": "click", "locator": {"strategy": "xpath", "selector": "//*[@text='Allow']"}}
+        assert kwargs["interval_ms"] == 300 and kwargs["times"] > 1000
+        assert session.scheduled[HANDLER_ACTION_PREFIX + "later"][0][0].payload["subtype"] == "longClick"
+        handlers.uninstall()
+        assert session.scheduled == {}
+
+    def test_poll_reports_only_new_passed_runs(self, session):
+        """Test failed runs (nothing to dismiss) are not events and runs are reported once."""
+        handlers = InterruptionHandlers(session, report_interval=None)
+        fired = []
+        handlers.on_fired = fired.append
+        handlers.register("allow", {"text": "Allow"}).install()
+        session.runs[ALLOW] += [run(1000, False), run(1500, True), run(2000, False)]
+        assert handlers.poll() == [HandlerEvent("allow", 1500)]
+        assert handlers.poll() == []
+        session.runs[ALLOW] += [run(2500, True)]
+        assert handlers.uninstall() == [HandlerEvent("allow", 1500), HandlerEvent("allow", 2500)]
+        assert fired == handlers.events
+
+    def test_poll_orders_runs_by_timestamp(self, session):
+        """Test runs are reported once and in time order whatever order the history lists them in."""
+        handlers = InterruptionHandlers(session, report_interval=None)
+        handlers.register("allow", {"text": "Allow"}).install()
+        session.get_action_history = lambda name: ActionHistory(
+            {"repeats": len(session.runs[name]), "stepResults": list(session.runs[name])}, name,
+        )
+        session.runs[ALLOW] += [run(1000, True), run(1500, False), run(2000, True)]
+        assert handlers.poll() == [HandlerEvent("allow", 1000), HandlerEvent("allow", 2000)]
+        assert handlers.poll() == []
+        session.runs[ALLOW] += [run(2500, True)]
+        assert handlers.poll() == [HandlerEvent("allow", 2500)]
+
+    def test_register_while_installed(self, session):
+        """Test a handler added or removed while installed is scheduled or unscheduled at once."""
+        handlers = InterruptionHandlers(session, report_interval=None).install()
+        assert handlers.installed
+        handlers.register("allow", {"text": "Allow"})
+        assert ALLOW in session.scheduled
+        handlers.unregister("allow")
+        assert ALLOW not in session.scheduled and "allow" not in handlers
+
+    def test_background_reporting(self, session):
+        """Test histories are pulled periodically on a background thread."""
+        handlers = InterruptionHandlers(session, report_interval=0.01)
+        handlers.register("allow", {"text": "Allow"})
+        with handlers:
+            session.runs[ALLOW] += [run(1000, True)]
+            deadline = time.monotonic() + 2
+            while not handlers.events and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert handlers.events == [HandlerEvent("allow", 1000)]
+        assert not handlers.installed
+
+    def test_history_errors_do_not_stop_reporting(self, session):
+        """Test a failed pull is skipped."""
+        handlers = InterruptionHandlers(session, report_interval=None)
+        handlers.register("allow", {"text": "Allow"}).install()
+        session.get_action_history = Mock(side_effect=RuntimeError("session gone"))
+        assert handlers.poll() == []
@@ -0,0 +1,80 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Unit tests for scheduling actions and the scheduled action context manager."""
+from unittest.mock import Mock
+
+import pytest
+
+from shadowstep.exceptions.shadowstep_exceptions import ShadowstepException
+from shadowstep.scheduled_actions.action_history import ActionHistory
+from shadowstep.scheduled_actions.action_step import ActionStep
+from shadowstep.scheduled_actions.scheduled_actions import ScheduledAction, action_params
+
+STEP = ActionStep.source("xml")
+
+
+class TestActionParams:
+    """Test the arguments of mobile: scheduleAction."""
+
+    def test_optional_limits_left_out(self):
+        """Test maxPass and maxFail are sent only when set."""
+        assert action_params("snapshots", [STEP]) == {
+            "name": "snapshots",
+            "steps": [STEP.to_dict()],
+            "intervalMs": 1000,
+            "times": 1,
+            "maxHistoryItems": 20,
+        }
+        assert action_params("snapshots", [STEP], max_pass=1)["maxPass"] == 1
+
+    @pytest.mark.parametrize(
+        ("kwargs", "message"),
+        [
+            ({"name": ""}, "name must not be empty"),
+            ({"steps": []}, "has no steps"),
+            ({"interval_ms": -1}, "non-negative"),
+            ({"times": 0}, "times must be positive"),
+            ({"max_fail": 0}, "max_fail must be positive"),
+        ],
+    )
+    def test_invalid_arguments(self, kwargs, message):
+        """Test invalid arguments fail before reaching the server."""
+        arguments = {"name": "snapshots", "steps": [STEP], **kwargs}
+        with pytest.raises(ValueError, match=message):
+            action_params(**arguments)
+
+
+class TestScheduledAction:
+    """Test scheduling for the duration of a with block."""
+
+    def make_session(self):
+        session = Mock()
+        session.get_action_history.return_value = ActionHistory({"repeats": 1}, "snapshots")
+        session.unschedule_action.return_value = ActionHistory({"repeats": 2}, "snapshots")
+        return session
+
+    def test_scheduled_inside_block(self):
+        """Test the action is scheduled on enter and its final history kept on exit."""
+        session = self.make_session()
+        with ScheduledAction(session, "snapshots", [STEP], interval_ms=200, times=50) as action:
+            session.schedule_action.assert_called_once_with(
+                "snapshots", [STEP], interval_ms=200, times=50, max_pass=None, max_fail=None, max_history_items=20,
+            )
+            assert action.history().repeats == 1
+        session.unschedule_action.assert_called_once_with("snapshots")
+        assert action.final_history.repeats == 2
+        assert action.history() is action.final_history
+        assert action.stop() is action.final_history
+        session.unschedule_action.assert_called_once()
+
+    def test_error_in_block_not_hidden(self):
+        """Test a failing unschedule does not replace the error raised in the block."""
+        session = self.make_session()
+        session.unschedule_action.side_effect = ShadowstepException("session gone")
+        with pytest.raises(AssertionError, match="step failed"):
+            with ScheduledAction(session, "snapshots", [STEP]):
+                raise AssertionError("step failed")
@@ -0,0 +1,102 @@
+# SPDX-FileCopyrightText: 2023 Molokov Klim
+#
+# SPDX-License-Identifier: MIT
+
+# ruff: noqa
+# pyright: ignore
+"""Unit tests for the server-side source and screenshot timeline."""
+import base64
+import json
+from unittest.mock import Mock
+
+import cv2
+import numpy as np
+import pytest
+
+from shadowstep.scheduled_actions.action_history import ActionHistory
+from shadowstep.scheduled_actions.timeline import TIMELINE_ACTION, TimelineRecorder, write_timeline
+
+SOURCE_A = '<hierarchy>\n  <node text="Login"/>\n  <node text="Password"/>\n</hierarchy>\n'
+SOURCE_B = '<hierarchy>\n  <node text="Login"/>\n  <node text="Wrong password"/>\n</hierarchy>\n'
+
+
+def make_png(seed):
+    """Encoded 360x640 screen with list rows that depend on seed."""
+    rng = np.random.default_rng(seed)
+    screen = np.full((640, 360, 3), 240, dtype=np.uint8)
+    for top in range(60, 640, 80):
+        cv2.rectangle(screen, (20, top), (20 + int(rng.integers(100, 320)), top + 40), (60, 60, 60), -1)
+    return base64.b64encode(cv2.imencode(".png", screen)[1].tobytes()).decode()
+
+
+def make_history(runs, newest_first=True):
+    """History of the timeline action from (timestamp, source, screenshot) runs, oldest first.
+
+    The server response lists them newest first unless newest_first is False.
+    """
+    step_results = [
+        [
+            {"name": "source", "type": "source", "timestamp": timestamp, "passed": source is not None, "result": source,
+             "exception": None if source is not None else {"name": "E", "message": "no window", "stacktrace": ""}},
+            {"name": "screenshot", "type": "screenshot", "timestamp": timestamp + 5, "passed": True, "result": frame},
+        ]
+        for timestamp, source, frame in runs
+    ]
+    if newest_first:
+        step_results.reverse()
+    return ActionHistory({"repeats": len(runs), "stepResults": step_results}, TIMELINE_ACTION)
+
+
+class TestWriteTimeline:
+    """Test deduplication of hierarchies and frames."""
+
+    @pytest.mark.parametrize("newest_first", [True, False])
+    def test_only_changes_written(self, tmp_path, newest_first):
+        """Test unchanged runs are dropped, changed hierarchies become diffs and equal frames are skipped.
+
+        Runs are written in time order whatever order the server lists them in.
+        """
+        first, second = make_png(0), make_png(1)
+        history = make_history([
+            (1000, SOURCE_A, first),
+            (2000, SOURCE_A, first),
+            (3000, SOURCE_B, first),
+            (4000, None, second),
+        ], newest_first)
+
+        manifest = json.loads(write_timeline(history, tmp_path / "out").read_text(encoding="utf-8"))
+
+        assert manifest["runs"] == 4 and manifest["action"] == TIMELINE_ACTION
+        assert manifest["entries"] == [
+            {"timestamp": 1000, "source": "0000.xml", "frame": "0000.png"},
+            {"timestamp": 3000, "source_diff": "0002.diff"},
+            {"timestamp": 4000, "frame": "0003.png", "errors": ["source: no window"]},
+        ]
+        assert (tmp_path / "out" / "0000.xml").read_text(encoding="utf-8") == SOURCE_A
+        diff = (tmp_path / "out" / "0002.diff").read_text(encoding="utf-8")
+        assert '-  <node text="Password"/>' in diff and '+  <node text="Wrong password"/>' in diff
+        assert (tmp_path / "out" / "0003.png").read_bytes() == base64.b64decode(second)
+        assert sorted(path.name for path in (tmp_path / "out").iterdir()) == [
+            "0000.png", "0000.xml", "0002.diff", "0003.png", "timeline.json",
+        ]
+
+
+class TestTimelineRecorder:
+    """Test recording through a scheduled action."""
+
+    def test_records_and_writes_on_exit(self, tmp_path):
+        """Test the capture steps are scheduled and the timeline is written once on exit."""
+        session = Mock()
+        session.unschedule_action.return_value = make_history([(1000, SOURCE_A, make_png(0))])
+
+        with TimelineRecorder(session, tmp_path, interval_ms=250, max_items=40) as recorder:
+            name, steps = session.schedule_action.call_args[0]
+            assert name == TIMELINE_ACTION
+            assert [step.to_dict()["type"] for step in steps] == ["source", "screenshot"]
+            assert session.schedule_action.call_args[1]["interval_ms"] == 250
+            assert session.schedule_action.call_args[1]["max_history_items"] == 40
+
+        assert recorder.manifest == tmp_path / "timeline.json"
+        assert (tmp_path / "0000.xml").exists()
+        recorder.stop()
+        session.unschedule_action.assert_called_once_with(TIMELINE_ACTION)
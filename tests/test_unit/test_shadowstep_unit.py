@@ -178,28 +178,65 @@ class TestShadowstepUnit:
             assert result == [mock_image]
 
     @pytest.mark.unit
-    def test_schedule_action_not_implemented(self):
-        """Test schedule_action method raises NotImplementedError."""
+    def test_schedule_action_sends_steps(self):
+        """Test schedule_action sends the steps and limits to mobile: scheduleAction."""
+        from shadowstep.scheduled_actions.action_step import ActionStep
+
+        with patch.object(shadowstep, "driver", Mock()), \
+                patch.object(shadowstep.mobile_commands, "schedule_action") as mock_schedule:
+            result = shadowstep.schedule_action("popups", [ActionStep.source("xml")], interval_ms=500, times=10, max_fail=3)
+
+        assert result is shadowstep
+        mock_schedule.assert_called_once_with({
+            "name": "popups",
+            "steps": [{"type": "source", "name": "xml", "payload": {"subtype": "xml"}}],
+            "intervalMs": 500,
+            "times": 10,
+            "maxHistoryItems": 20,
+            "maxFail": 3,
+        })
+
+    @pytest.mark.unit
+    def test_schedule_action_without_steps(self):
+        """Test schedule_action rejects an empty step list."""
         shadowstep = self._create_test_shadowstep()
 
-        with pytest.raises(NotImplementedError):
+        with pytest.raises(ValueError, match="has no steps"):
             shadowstep.schedule_action("test", [])
 
     @pytest.mark.unit
-    def test_get_action_history_not_implemented(self):
-        """Test get_action_history method raises NotImplementedError."""
-        shadowstep = self._create_test_shadowstep()
+    def test_get_action_history(self):
+        """Test get_action_history wraps the server response."""
+        response = {"repeats": 2, "stepResults": [[{"name": "xml", "type": "source", "timestamp": 2, "passed": True}]]}
+
+        with patch.object(shadowstep, "driver", Mock()), \
+                patch.object(shadowstep.mobile_commands, "get_action_history", return_value=response) as mock_history:
+            history = shadowstep.get_action_history("test")
 
-        with pytest.raises(NotImplementedError):
-            shadowstep.get_action_history("test")
+        mock_history.assert_called_once_with({"name": "test"})
+        assert history.name == "test" and history.repeats == 2 and history.passed == 1
 
     @pytest.mark.unit
-    def test_unschedule_action_not_implemented(self):
-        """Test unschedule_action method raises NotImplementedError."""
-        shadowstep = self._create_test_shadowstep()
+    def test_unschedule_action(self):
+        """Test unschedule_action returns the final history."""
+        with patch.object(shadowstep, "driver", Mock()), \
+                patch.object(shadowstep.mobile_commands, "unschedule_action", return_value={"repeats": 0}) as mock_unschedule:
+            history = shadowstep.unschedule_action("test")
+
+        mock_unschedule.assert_called_once_with({"name": "test"})
+        assert history.repeats == 0 and len(history) == 0
+
+    @pytest.mark.unit
+    def test_record_timeline_starts_recording(self, tmp_path):
+        """Test record_timeline schedules the capture action right away."""
+        with patch.object(shadowstep, "driver", Mock()), \
+                patch.object(shadowstep.mobile_commands, "schedule_action") as mock_schedule:
+            recorder = shadowstep.record_timeline(interval_ms=500, max_items=30, directory=tmp_path)
 
-        with pytest.raises(NotImplementedError):
-            shadowstep.unschedule_action("test")
+        assert recorder.scheduled and recorder.directory == tmp_path
+        params = mock_schedule.call_args[0][0]
+        assert params["intervalMs"] == 500 and params["maxHistoryItems"] == 30
+        assert [step["type"] for step in params["steps"]] == ["source", "screenshot"]
 
     @pytest.mark.unit
     def test_start_logcat_with_filters(self):